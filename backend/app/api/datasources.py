@@ -14,6 +14,7 @@ from app.core.database import get_db
 from app.core.config import settings
 from app.models import DataSource, User
 from app.services.encryption import encryption_service
+from app.services.result_cache import search_result_cache
 from app.connectors import (
     BaseOAuthConnector,
     SalesforceConnector,
@@ -297,6 +298,9 @@ async def disconnect_data_source(
     await db.delete(source)
     await db.commit()
 
+    # Documents of the source are gone (cascade)
+    await search_result_cache.invalidate_org(source.org_id)
+
     return {"message": "Data source disconnected successfully"}
 
 
@@ -0,0 +1,118 @@
+"""
+Embedding Migration API Endpoints - Re-embed an organization with a new model
+"""
+from typing import Optional
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.models import User, EmbeddingMigration
+from app.api.dependencies import get_current_user, require_admin
+from app.services.embedding_migration import embedding_migration_service
+
+router = APIRouter()
+
+
+# Request/Response Models
+class StartMigrationRequest(BaseModel):
+    """Start migration request"""
+    target_model: str = Field(..., description="Embedding model to migrate to")
+
+
+class MigrationResponse(BaseModel):
+    """Embedding migration status"""
+    id: str
+    org_id: str
+    status: str
+    source_model: str
+    target_model: str
+    namespace: str
+    documents_total: int
+    documents_done: int
+    chunks_embedded: int
+    dual_reads: int
+    dual_read_overlap: Optional[float] = None
+    error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+
+async def _get_migration(db: AsyncSession, migration_id: UUID, org_id: UUID) -> EmbeddingMigration:
+    """Load a migration of the user's organization or raise 404"""
+    migration = await db.get(EmbeddingMigration, migration_id)
+    if migration is None or migration.org_id != org_id:
+        raise HTTPException(status_code=404, detail="Embedding migration not found")
+    return migration
+
+
+# Endpoints
+@router.post("", response_model=MigrationResponse)
+async def start_migration(
+    request: StartMigrationRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_admin),
+):
+    """
+    Start migrating the organization to a new embedding model
+
+    Documents are re-embedded in the background into a separate namespace
+    while search keeps using the current model. Once the backfill is done,
+    searches are compared against the new model and the organization is
+    switched over (automatically or via the switch endpoint).
+    """
+    try:
+        return MigrationResponse(**await embedding_migration_service.start_migration(
+            db=db,
+            org_id=current_user.org_id,
+            target_model=request.target_model,
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("", response_model=Optional[MigrationResponse])
+async def get_migration_status(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get the latest embedding migration of the organization
+    """
+    migration = await embedding_migration_service.get_status(db, current_user.org_id)
+    return MigrationResponse(**migration) if migration else None
+
+
+@router.post("/{migration_id}/switch", response_model=MigrationResponse)
+async def switch_migration(
+    migration_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_admin),
+):
+    """
+    Switch search to the new model without waiting for the dual-read thresholds
+    """
+    await _get_migration(db, migration_id, current_user.org_id)
+    try:
+        return MigrationResponse(**await embedding_migration_service.switch_over(migration_id))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/{migration_id}/cancel", response_model=MigrationResponse)
+async def cancel_migration(
+    migration_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_admin),
+):
+    """
+    Cancel a running migration and delete its vectors
+    """
+    await _get_migration(db, migration_id, current_user.org_id)
+    try:
+        return MigrationResponse(**await embedding_migration_service.cancel_migration(migration_id))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -10,6 +10,7 @@ from app.api.datasources import router as datasources_router
 from app.api.search import router as search_router
 from app.api.chat import router as chat_router
 from app.api.analytics import router as analytics_router
+from app.api.embedding_migrations import router as embedding_migrations_router
 
 # Create main API router
 api_router = APIRouter()
@@ -21,5 +22,6 @@ api_router.include_router(datasources_router, prefix="/datasources", tags=["Data
 api_router.include_router(search_router, prefix="/search", tags=["Search"])
 api_router.include_router(chat_router, prefix="/chat", tags=["Chat"])
 api_router.include_router(analytics_router, prefix="/analytics", tags=["Analytics"])
+api_router.include_router(embedding_migrations_router, prefix="/embeddings/migrations", tags=["Embeddings"])
 
 print(f"API Router initialized with {len(api_router.routes)} routes")
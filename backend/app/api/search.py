@@ -1,7 +1,7 @@
 """
 Search API Endpoints
 """
-from typing import List, Optional
+from typing import List, Literal, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -23,6 +23,24 @@ class SearchRequest(BaseModel):
     limit: int = Field(10, ge=1, le=100, description="Maximum number of results")
     source_types: Optional[List[str]] = Field(None, description="Filter by source types")
     min_score: float = Field(0.7, ge=0.0, le=1.0, description="Minimum similarity score")
+    projection: Literal["preview", "full"] = Field(
+        "preview",
+        description="'full' also returns the full document content",
+    )
+    highlight: bool = Field(False, description="Return query term spans in matched chunks")
+    mode: Optional[Literal["hybrid", "vector", "lexical"]] = Field(
+        None,
+        description="Retrieval mode (default: hybrid vector + keyword search)",
+    )
+
+
+class MatchedChunk(BaseModel):
+    """Chunk of a document that matched the query"""
+    chunk_index: int
+    content: str
+    position: Optional[dict] = None  # e.g. {"page": 3} or {"sheet": "Q1", "row_start": 2, "row_end": 51}
+    score: float
+    highlights: Optional[List[List[int]]] = None
 
 
 class SearchResultItem(BaseModel):
@@ -30,6 +48,8 @@ class SearchResultItem(BaseModel):
     document_id: str
     title: str
     content_preview: str
+    matched_chunks: List[MatchedChunk] = []
+    content: Optional[str] = None
     source_type: str
     url: Optional[str]
     score: float
@@ -45,6 +65,18 @@ class SearchResponse(BaseModel):
     total_results: int
     search_time_seconds: float
     filters: dict
+    projection: str
+    mode: str
+    keyword_fast_path: bool = False
+
+
+class DocumentContentResponse(BaseModel):
+    """Full document content"""
+    document_id: str
+    title: str
+    content: str
+    source_type: str
+    url: Optional[str]
 
 
 class SearchWithSummaryResponse(SearchResponse):
@@ -80,6 +112,9 @@ async def search_documents(
             limit=request.limit,
             source_types=request.source_types,
             min_score=request.min_score,
+            projection=request.projection,
+            highlight=request.highlight,
+            mode=request.mode,
         )
 
         return SearchResponse(**results)
@@ -152,6 +187,30 @@ async def get_search_suggestions(
         )
 
 
+@router.get("/documents/{document_id}/content", response_model=DocumentContentResponse)
+async def get_document_content(
+    document_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get the full content of a document
+
+    Search results only carry previews and matched chunks; clients fetch the
+    full document body here when it is actually opened.
+    """
+    document = await search_service.get_document_content(
+        db=db,
+        org_id=current_user.org_id,
+        document_id=document_id,
+    )
+
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    return DocumentContentResponse(**document)
+
+
 @router.get("/documents/{document_id}/related", response_model=RelatedDocumentsResponse)
 async def get_related_documents(
     document_id: UUID,
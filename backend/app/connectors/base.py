@@ -3,7 +3,7 @@ Base OAuth Connector
 Abstract base class for all OAuth-based data source connectors
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, Any, Tuple
+from typing import Dict, Optional, Any, Tuple, AsyncIterator
 from datetime import datetime, timedelta
 import httpx
 import secrets
@@ -21,8 +21,12 @@ class BaseOAuthConnector(ABC):
     - refresh_access_token(): Refreshes expired access token
     - test_connection(): Tests if credentials work
     - get_user_info(): Gets user info from the connected account
+    - fetch_documents(): Lazily yields pages of documents changed since a cursor
     """
 
+    # Bytes read from the response per write when downloading files
+    DOWNLOAD_BLOCK_SIZE = 1024 * 1024
+
     def __init__(
         self,
         client_id: str,
@@ -139,6 +143,102 @@ class BaseOAuthConnector(ABC):
         """
         pass
 
+    @abstractmethod
+    def fetch_documents(
+        self,
+        access_token: str,
+        since_cursor: Optional[Any] = None,
+        config: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Fetch documents changed since the cursor, one page at a time
+
+        Implemented as an async generator so a whole workspace is never held
+        in memory. Each yielded page contains a resume cursor that is safe to
+        persist once this page and every earlier page have been stored.
+
+        Args:
+            access_token: Valid access token
+            since_cursor: Cursor persisted by the previous sync (None for a full sync)
+            config: Data source configuration (e.g. Salesforce instance_url)
+
+        Yields:
+            Dictionary containing:
+                - documents: List of document dicts with id, title, content or
+                  file_url, url, content_type, mime_type, metadata, created_at,
+                  updated_at, and deleted (True if removed at the source)
+                - cursor: JSON-serializable resume cursor, or None if this page
+                  is not a safe checkpoint
+        """
+        pass
+
+    async def download_file(
+        self,
+        access_token: str,
+        file_url: str,
+        destination: Any,
+        max_bytes: Optional[int] = None,
+    ) -> int:
+        """
+        Stream a document's file_url into a writable file object
+
+        The response body is written block by block as it arrives, so the
+        whole file is never held in memory by the connector.
+
+        Args:
+            access_token: Valid access token
+            file_url: Download URL from fetch_documents
+            destination: Object with write(bytes), e.g. a SpooledFile
+            max_bytes: Abort downloads larger than this
+
+        Returns:
+            Number of bytes downloaded
+
+        Raises:
+            ValueError: If the file is larger than max_bytes
+            httpx.HTTPStatusError: If the download request fails
+        """
+        size = 0
+        async with self.http_client.stream(
+            "GET",
+            file_url,
+            headers={"Authorization": f"Bearer {access_token}"},
+        ) as response:
+            response.raise_for_status()
+
+            content_length = response.headers.get("Content-Length")
+            if max_bytes is not None and content_length and int(content_length) > max_bytes:
+                raise ValueError(f"File size exceeds maximum of {max_bytes} bytes")
+
+            async for block in response.aiter_bytes(self.DOWNLOAD_BLOCK_SIZE):
+                size += len(block)
+                if max_bytes is not None and size > max_bytes:
+                    raise ValueError(f"File size exceeds maximum of {max_bytes} bytes")
+                destination.write(block)
+
+        return size
+
+    @staticmethod
+    def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+        """
+        Parse an ISO 8601 timestamp returned by a provider API
+
+        Args:
+            value: Timestamp string (e.g. '2024-01-15T10:30:00.000Z')
+
+        Returns:
+            Timezone-aware datetime, or None if value is empty
+        """
+        if not value:
+            return None
+
+        # Salesforce uses '+0000' offsets, everyone else uses 'Z'
+        value = value.replace("Z", "+00:00")
+        if value[-5] in "+-" and value[-3] != ":":
+            value = f"{value[:-2]}:{value[-2:]}"
+
+        return datetime.fromisoformat(value)
+
     def calculate_token_expiry(self, expires_in: int) -> datetime:
         """
         Calculate token expiration timestamp
@@ -2,7 +2,8 @@
 Slack OAuth Connector
 Implements OAuth 2.0 for Slack Workspace Apps
 """
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, AsyncIterator, List
+from datetime import datetime, timezone
 from urllib.parse import urlencode
 import httpx
 
@@ -22,8 +23,16 @@ class SlackConnector(BaseOAuthConnector):
     - files:read: View files shared in channels
     - search:read: Search workspace content
     - users:read: View people in workspace
+
+    Document sync indexes public channel messages. The sync cursor maps each
+    channel ID to the newest message ts already synced, which is passed as
+    `oldest` on the next sync.
     """
 
+    API_URL = "https://slack.com/api"
+
+    HISTORY_PAGE_SIZE = 200
+
     @property
     def provider_name(self) -> str:
         return "slack"
@@ -227,3 +236,136 @@ class SlackConnector(BaseOAuthConnector):
             return data.get("ok", False)
         except Exception:
             return False
+
+    async def fetch_documents(
+        self,
+        access_token: str,
+        since_cursor: Optional[Dict[str, str]] = None,
+        config: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Fetch channel messages posted since the cursor
+
+        Args:
+            access_token: Valid bot access token
+            since_cursor: Dict of channel ID -> newest synced message ts
+            config: Not used
+
+        Yields:
+            Pages of message documents; the cursor advances after each channel
+        """
+        headers = {"Authorization": f"Bearer {access_token}"}
+        cursor = dict(since_cursor or {})
+
+        for channel in await self._list_channels(headers):
+            channel_id = channel["id"]
+            oldest = cursor.get(channel_id)
+            newest = oldest
+
+            # History pages run newest to oldest, so the channel is only a
+            # safe checkpoint once all of its pages have been yielded
+            page_cursor = None
+            while True:
+                params = {"channel": channel_id, "limit": self.HISTORY_PAGE_SIZE}
+                if oldest:
+                    params["oldest"] = oldest
+                if page_cursor:
+                    params["cursor"] = page_cursor
+
+                data = await self._api_get(headers, "conversations.history", params)
+                messages = data.get("messages", [])
+
+                for message in messages:
+                    if newest is None or float(message["ts"]) > float(newest):
+                        newest = message["ts"]
+
+                yield {
+                    "documents": self._messages_to_documents(channel, messages),
+                    "cursor": None,
+                }
+
+                page_cursor = data.get("response_metadata", {}).get("next_cursor")
+                if not data.get("has_more") or not page_cursor:
+                    break
+
+            if newest:
+                cursor[channel_id] = newest
+
+            yield {"documents": [], "cursor": dict(cursor)}
+
+    async def _list_channels(self, headers: Dict[str, str]) -> List[Dict[str, Any]]:
+        """List public channels the bot can read"""
+        channels = []
+        page_cursor = None
+
+        while True:
+            params = {"types": "public_channel", "exclude_archived": "true", "limit": 200}
+            if page_cursor:
+                params["cursor"] = page_cursor
+
+            data = await self._api_get(headers, "conversations.list", params)
+            channels.extend(data.get("channels", []))
+
+            page_cursor = data.get("response_metadata", {}).get("next_cursor")
+            if not page_cursor:
+                return channels
+
+    async def _api_get(
+        self,
+        headers: Dict[str, str],
+        method: str,
+        params: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Call a Slack Web API method"""
+        try:
+            response = await self.http_client.get(
+                f"{self.API_URL}/{method}",
+                headers=headers,
+                params=params,
+            )
+            response.raise_for_status()
+
+            data = response.json()
+
+            if not data.get("ok"):
+                raise Exception(f"Slack API error: {data.get('error', 'Unknown error')}")
+
+            return data
+
+        except httpx.HTTPStatusError as e:
+            raise Exception(f"Slack API error: {str(e)}")
+
+    def _messages_to_documents(
+        self,
+        channel: Dict[str, Any],
+        messages: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Convert Slack messages to document dicts"""
+        documents = []
+
+        for message in messages:
+            text = message.get("text", "").strip()
+            if not text or message.get("subtype") in ("channel_join", "channel_leave"):
+                continue
+
+            ts = message["ts"]
+            edited_ts = message.get("edited", {}).get("ts", ts)
+
+            documents.append({
+                "id": f"{channel['id']}:{ts}",
+                "title": f"#{channel.get('name', channel['id'])}: {text[:80]}",
+                "content": text,
+                "url": f"https://slack.com/archives/{channel['id']}/p{ts.replace('.', '')}",
+                "content_type": "message",
+                "mime_type": "text/plain",
+                "metadata": {
+                    "channel_id": channel["id"],
+                    "channel_name": channel.get("name"),
+                    "user": message.get("user"),
+                    "thread_ts": message.get("thread_ts"),
+                },
+                "created_at": datetime.fromtimestamp(float(ts), tz=timezone.utc),
+                "updated_at": datetime.fromtimestamp(float(edited_ts), tz=timezone.utc),
+            })
+
+        return documents
@@ -1,7 +1,8 @@
 """
 Application Configuration
 """
-from typing import List
+import os
+from typing import List, Dict
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -55,6 +56,29 @@ class Settings(BaseSettings):
     PINECONE_API_KEY: str
     PINECONE_ENVIRONMENT: str = "us-west1-gcp"
     PINECONE_INDEX_NAME: str = "unifydata-embeddings"
+    PINECONE_UPSERT_BATCH_SIZE: int = 100  # Vectors per upsert request
+    PINECONE_MAX_REQUEST_BYTES: int = 2 * 1024 * 1024  # Pinecone request size limit
+    PINECONE_MAX_CONCURRENCY: int = 8  # Worker threads for blocking client calls
+    PINECONE_QUERY_CONCURRENCY: int = 16  # Separate worker threads for queries
+    PINECONE_MAX_RETRIES: int = 3
+    PINECONE_RETRY_BASE_DELAY: float = 0.5  # Seconds, doubled per attempt (full jitter)
+
+    # Vector store backend: "pinecone" (hosted), "local" (in-process NumPy/mmap)
+    # or "pgvector" (embeddings in document_chunks, searched with an HNSW index)
+    VECTOR_STORE_BACKEND: str = "pinecone"
+    LOCAL_VECTOR_STORE_PATH: str = "./data/vectors"
+    LOCAL_VECTOR_STORE_HNSW: bool = True  # Used when hnswlib is installed
+    LOCAL_VECTOR_STORE_HNSW_MIN_SIZE: int = 20000  # Brute force below this many vectors
+    LOCAL_VECTOR_STORE_HNSW_EF: int = 100
+    # First-stage codes for brute-force search: "none", "int8" or "binary"
+    # (candidates are re-scored with the float32 vectors)
+    LOCAL_VECTOR_STORE_QUANTIZATION: str = "none"
+    # Coarse-to-fine: first pass on this many leading dimensions (0 = full vectors)
+    LOCAL_VECTOR_STORE_COARSE_DIMENSIONS: int = 0
+    PGVECTOR_DIMENSIONS: int = 1536  # Must match EMBEDDING_MODEL's output dimensions (checked at startup)
+    PGVECTOR_HNSW_M: int = 16
+    PGVECTOR_HNSW_EF_CONSTRUCTION: int = 64
+    PGVECTOR_HNSW_EF_SEARCH: int = 100  # Raised to top_k for larger queries
 
     # OpenAI
     OPENAI_API_KEY: str
@@ -87,8 +111,78 @@ class Settings(BaseSettings):
     CELERY_BROKER_URL: str = "redis://localhost:6379/1"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/2"
 
+    # Sync pipeline (workers per stage, bounded queues between stages)
+    SYNC_QUEUE_SIZE: int = 100
+    SYNC_PARSE_CONCURRENCY: int = 4
+    SYNC_CHUNK_CONCURRENCY: int = 1
+    SYNC_EMBED_CONCURRENCY: int = 64  # Workers only wait on the shared embedding batcher
+    SYNC_UPSERT_CONCURRENCY: int = 4
+    SYNC_LOOKUP_BATCH_SIZE: int = 100  # External IDs resolved per query
+    SYNC_WRITE_BATCH_SIZE: int = 50  # Documents written per statement batch
+    SYNC_MAX_ITEM_ATTEMPTS: int = 3  # Syncs a failing document blocks the cursor before it is skipped
+
+    # Document parsing (worker processes, off the event loop)
+    PARSER_PROCESSES: int = max(1, (os.cpu_count() or 2) - 1)  # 0 = parse in a thread
+    PARSER_TIMEOUT_SECONDS: float = 120
+    PARSER_MEMORY_LIMIT_MB: int = 2048  # Address space limit per worker (0 = none)
+    PARSER_MAX_TASKS_PER_CHILD: int = 200  # Workers are recycled after this many files
+    PARSER_MAX_FILE_SIZE_MB: int = 250  # Larger files are not downloaded or parsed
+    FILE_SPOOL_MAX_MEMORY_MB: int = 8  # Larger downloads are spooled to a temp file
+    FILE_SPOOL_DIR: str | None = None  # Temp directory for spooled downloads (default: system temp)
+    PARSE_CACHE_ENABLED: bool = True  # Reuse parse results of files whose revision is unchanged
+    PARSE_CACHE_MAX_MB: int = 64  # Larger (compressed) parse results are not cached
+
+    # Chunking (token counts of the embedding model's tokenizer)
+    CHUNK_MAX_TOKENS: int = 256
+    CHUNK_OVERLAP_TOKENS: int = 48
+
+    # Embedding model (see EmbeddingsService.MODELS)
+    EMBEDDING_MODEL: str = "openai-ada-002"
+    # Reduced output dimensions per model, e.g. {"openai-3-large": 1024}
+    # (text-embedding-3 models only; the vector index is sized to match)
+    EMBEDDING_DIMENSIONS: Dict[str, int] = {}
+
+    # Embedding migrations (background re-embedding into a shadow namespace)
+    EMBEDDING_MIGRATION_BATCH_SIZE: int = 50  # Documents per backfill batch
+    EMBEDDING_MIGRATION_MAX_CHUNKS_PER_SECOND: float = 100  # Backfill throttle (0 = unthrottled)
+    EMBEDDING_MIGRATION_DUAL_READ_SAMPLE_RATE: float = 1.0  # Share of searches compared
+    EMBEDDING_MIGRATION_AUTO_SWITCH: bool = True
+    EMBEDDING_MIGRATION_MIN_DUAL_READS: int = 50  # Compared searches before auto switch
+    EMBEDDING_MIGRATION_MIN_OVERLAP: float = 0.6  # Mean result overlap required to auto switch
+    EMBEDDING_MIGRATION_CLEANUP_DELAY_SECONDS: int = 300  # Old vectors kept after the switch
+    EMBEDDING_ORG_CACHE_TTL_SECONDS: int = 30  # Per-org model / namespace lookups
+
+    # Embedding batcher (sync-wide request coalescing)
+    EMBEDDING_BATCH_MAX_WAIT_MS: int = 50
+    EMBEDDING_BATCH_CONCURRENCY: int = 4
+
+    # Embedding cache (local LRU tier + optional Redis tier on REDIS_URL)
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # 256 MB
+    EMBEDDING_CACHE_REDIS_ENABLED: bool = False
+    EMBEDDING_CACHE_TTL_SECONDS: int = 30 * 24 * 3600  # 30 days
+
+    # Query embedding cache (search and chat questions)
+    QUERY_EMBEDDING_CACHE_SIZE: int = 10000  # Entries
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS: int = 3600
+
+    # Search retrieval (hybrid = vector + Postgres full-text, fused with RRF)
+    SEARCH_DEFAULT_MODE: str = "hybrid"  # hybrid, vector, lexical
+    SEARCH_RRF_K: int = 60
+
+    # Search result cache (per org, invalidated by syncs that change documents)
+    SEARCH_RESULT_CACHE_ENABLED: bool = True
+    SEARCH_RESULT_CACHE_ENTRIES_PER_ORG: int = 256
+    SEARCH_RESULT_CACHE_MAX_ORGS: int = 1000
+    SEARCH_RESULT_CACHE_TTL_SECONDS: int = 600
+    SEARCH_RESULT_CACHE_SIMILARITY: float = 0.98  # Cosine threshold for near-duplicate queries (vector results only)
+    SEARCH_RESULT_CACHE_REDIS_ENABLED: bool = True  # Share invalidations across processes (off: stale up to the TTL)
+
     # Monitoring
     SENTRY_DSN: str | None = None
+    # Bearer token for GET /metrics (unset: the endpoint is disabled). Metrics
+    # span all orgs, so keep the token out of the frontend
+    METRICS_TOKEN: str | None = None
 
     # OAuth - Salesforce
     SALESFORCE_CLIENT_ID: str | None = None
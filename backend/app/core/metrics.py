@@ -0,0 +1,146 @@
+"""
+In-process Metrics
+Latency histograms for hot paths, exposed on the /metrics endpoint
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+
+# Bucket upper bounds in seconds (1ms .. ~65s, doubling)
+DEFAULT_LATENCY_BUCKETS = [0.001 * 2 ** i for i in range(17)]
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram
+
+    Observations are counted into cumulative-style buckets (like Prometheus
+    histograms), so memory stays constant and percentiles such as p99 are
+    estimated by interpolating inside the bucket that contains them.
+    """
+
+    def __init__(self, name: str, buckets: Optional[List[float]] = None):
+        """
+        Initialize histogram
+
+        Args:
+            name: Metric name
+            buckets: Sorted bucket upper bounds in seconds
+        """
+        self.name = name
+        self.buckets = list(buckets or DEFAULT_LATENCY_BUCKETS)
+        self._counts = [0] * (len(self.buckets) + 1)  # Last bucket is +Inf
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        """Record one observation"""
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += seconds
+            self._max = max(self._max, seconds)
+
+    @contextmanager
+    def time(self):
+        """Context manager recording the duration of its block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate a percentile
+
+        Args:
+            q: Percentile as a fraction (e.g. 0.99)
+
+        Returns:
+            Estimated latency in seconds (0.0 without observations)
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            maximum = self._max
+
+        if not total:
+            return 0.0
+
+        rank = q * total
+        cumulative = 0
+        for i, count in enumerate(counts):
+            if count and cumulative + count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else maximum
+                estimate = lower + (upper - lower) * (rank - cumulative) / count
+                return min(estimate, maximum)
+            cumulative += count
+
+        return maximum
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get summary and bucket counts"""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            total_sum = self._sum
+            maximum = self._max
+
+        return {
+            "count": total,
+            "sum": total_sum,
+            "mean": total_sum / total if total else 0.0,
+            "max": maximum,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "buckets": {
+                **{f"{bound:g}": count for bound, count in zip(self.buckets, counts)},
+                "+Inf": counts[-1],
+            },
+        }
+
+
+class MetricsRegistry:
+    """Registry of named histograms and counters"""
+
+    def __init__(self):
+        """Initialize registry"""
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        """Get or create a latency histogram"""
+        with self._lock:
+            if name not in self._histograms:
+                self._histograms[name] = LatencyHistogram(name)
+            return self._histograms[name]
+
+    def increment(self, name: str, value: int = 1):
+        """Increment a counter"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get all metrics"""
+        with self._lock:
+            histograms = dict(self._histograms)
+            counters = dict(self._counters)
+
+        return {
+            "histograms": {name: histogram.snapshot() for name, histogram in histograms.items()},
+            "counters": counters,
+        }
+
+
+# Create singleton instance
+metrics = MetricsRegistry()
@@ -0,0 +1,102 @@
+"""
+Schema Upgrades
+Brings tables created by earlier versions up to the current models
+"""
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn
+
+from app.core.database import Base
+from app.models import Document
+
+logger = logging.getLogger(__name__)
+
+
+def upgrade_schema(connection: Connection):
+    """
+    Apply the schema changes Base.metadata.create_all does not make
+
+    create_all only creates missing tables. For tables that already exist
+    this adds missing columns (including generated columns such as
+    document_chunks.search_vector), the unique constraint the sync's
+    upserts rely on, and missing indexes (GIN, HNSW). Every step is
+    idempotent, so it runs on every startup right after create_all.
+
+    Run with AsyncConnection.run_sync inside the startup transaction.
+
+    Args:
+        connection: Synchronous connection
+    """
+    _add_missing_columns(connection)
+    _add_document_unique_constraint(connection)
+    _create_missing_indexes(connection)
+
+
+def _add_missing_columns(connection: Connection):
+    """ALTER TABLE ... ADD COLUMN for model columns missing in the database"""
+    inspector = inspect(connection)
+
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+
+            if not column.nullable and column.server_default is None and column.computed is None:
+                logger.error(
+                    f"Cannot add required column {table.name}.{column.name} "
+                    f"without a server default; add it manually"
+                )
+                continue
+
+            ddl = CreateColumn(column).compile(dialect=connection.dialect)
+            logger.info(f"Adding column {table.name}.{column.name}")
+            connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+
+
+def _add_document_unique_constraint(connection: Connection):
+    """Remove duplicate documents, then add the (data_source_id, external_id) constraint"""
+    name = "uq_documents_source_external_id"
+    exists = connection.execute(
+        text("SELECT 1 FROM pg_constraint WHERE conname = :name"),
+        {"name": name},
+    ).first()
+    if exists:
+        return
+
+    # Keep the most recently updated row of each source document (its
+    # chunks are deleted with the others by ON DELETE CASCADE; vectors of
+    # those chunks are no longer referenced and are dropped from results)
+    result = connection.execute(text(
+        f"""
+        DELETE FROM {Document.__tablename__} AS d
+        USING {Document.__tablename__} AS newer
+        WHERE d.data_source_id = newer.data_source_id
+          AND d.external_id = newer.external_id
+          AND (newer.updated_at, newer.id) > (d.updated_at, d.id)
+        """
+    ))
+    if result.rowcount:
+        logger.warning(f"Removed {result.rowcount} duplicate documents before adding {name}")
+
+    connection.execute(text(
+        f"ALTER TABLE {Document.__tablename__} "
+        f"ADD CONSTRAINT {name} UNIQUE (data_source_id, external_id)"
+    ))
+
+
+def _create_missing_indexes(connection: Connection):
+    """Create model indexes missing on existing tables"""
+    inspector = inspect(connection)
+
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                logger.info(f"Creating index {index.name} (may take a while on large tables)")
+                index.create(connection)
@@ -1,14 +1,20 @@
 """
 UnifyData.AI - FastAPI Application Entry Point
 """
+import hmac
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
+from sqlalchemy import text
 
 from app.core.config import settings
 from app.core.database import engine, Base
+from app.core.metrics import metrics
+from app.db.upgrade import upgrade_schema
+from app.services.embedding_migration import embedding_migration_service
+from app.services.parser_pool import parser_pool
 
 # Import all models to register them with Base.metadata
 import app.models  # noqa - Import to register models with Base.metadata
@@ -18,12 +24,14 @@ from fastapi import APIRouter
 from app.api.endpoints.auth import router as auth_router
 from app.api.endpoints.onboarding import router as onboarding_router
 from app.api.datasources import router as datasources_router
+from app.api.embedding_migrations import router as embedding_migrations_router
 
 # Create API router
 api_router = APIRouter()
 api_router.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 api_router.include_router(onboarding_router, prefix="/onboarding", tags=["Onboarding"])
 api_router.include_router(datasources_router, prefix="/datasources", tags=["Data Sources"])
+api_router.include_router(embedding_migrations_router, prefix="/embeddings/migrations", tags=["Embeddings"])
 
 
 @asynccontextmanager
@@ -32,11 +40,24 @@ async def lifespan(app: FastAPI):
     # Startup
     print("Starting UnifyData.AI API...")
 
+    if settings.VECTOR_STORE_BACKEND == "pgvector":
+        # The embedding column is sized by PGVECTOR_DIMENSIONS
+        from app.services.pgvector_store import pgvector_store
+        pgvector_store.validate_dimensions()
+
     # Create database tables
     async with engine.begin() as conn:
+        if settings.VECTOR_STORE_BACKEND == "pgvector":
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
         await conn.run_sync(Base.metadata.create_all)
+        # create_all does not alter existing tables
+        await conn.run_sync(upgrade_schema)
 
     print("Database tables created/verified")
+
+    # Restart embedding migrations interrupted by the last shutdown
+    await embedding_migration_service.resume_migrations()
+
     print(f"Environment: {settings.ENVIRONMENT}")
     print(f"Debug mode: {settings.DEBUG}")
 
@@ -44,6 +65,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     print("Shutting down UnifyData.AI API...")
+    parser_pool.shutdown()
 
 
 # Create FastAPI application
@@ -107,6 +129,28 @@ async def health_check():
     }
 
 
+@app.get("/metrics")
+async def get_metrics(authorization: str | None = Header(None)):
+    """
+    Latency histograms (with p50/p95/p99) and counters
+
+    Served on the public app, so it requires METRICS_TOKEN as a bearer token
+    and is not found at all when no token is configured.
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    expected = f"Bearer {settings.METRICS_TOKEN}"
+    if not authorization or not hmac.compare_digest(authorization.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return metrics.snapshot()
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler"""
@@ -5,6 +5,8 @@ from app.models.user import User
 from app.models.organization import Organization
 from app.models.data_source import DataSource, SyncLog
 from app.models.document import Document, DocumentChunk
+from app.models.embedding_migration import EmbeddingMigration
+from app.models.parse_cache import ParseCache
 from app.models.conversation import Conversation, Message, UsageLog
 
 __all__ = [
@@ -14,6 +16,8 @@ __all__ = [
     "SyncLog",
     "Document",
     "DocumentChunk",
+    "EmbeddingMigration",
+    "ParseCache",
     "Conversation",
     "Message",
     "UsageLog",
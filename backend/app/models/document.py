@@ -2,18 +2,34 @@
 Document Model for storing parsed content
 """
 from datetime import datetime
-from sqlalchemy import String, DateTime, ForeignKey, Text, Integer, JSON, BigInteger, text
+from sqlalchemy import (
+    String, DateTime, ForeignKey, Text, Integer, JSON, BigInteger, UniqueConstraint, Index,
+    Computed, text
+)
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from pgvector.sqlalchemy import Vector
 import uuid
 
+from app.core.config import settings
 from app.core.database import Base
 
 
+# Postgres text search configuration of the chunk search vectors
+TEXT_SEARCH_CONFIG = "english"
+
+# Chunk embeddings live in Postgres (requires the vector extension)
+PGVECTOR_ENABLED = settings.VECTOR_STORE_BACKEND == "pgvector"
+
+
 class Document(Base):
     """Document model for storing parsed content from data sources"""
 
     __tablename__ = "documents"
+    __table_args__ = (
+        # One row per source document; used by the sync's bulk upserts
+        UniqueConstraint("data_source_id", "external_id", name="uq_documents_source_external_id"),
+    )
 
     # Primary key
     id: Mapped[uuid.UUID] = mapped_column(
@@ -88,6 +104,10 @@ class Document(Base):
         comment="Model used for embeddings (e.g., text-embedding-ada-002)"
     )
     embedding_created_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    shadow_embedding_model: Mapped[str | None] = mapped_column(
+        String(100),
+        comment="Model key whose vectors a running embedding migration has written (reset on change)"
+    )
 
     # Source-specific metadata
     source_metadata: Mapped[dict | None] = mapped_column(
@@ -140,6 +160,20 @@ class DocumentChunk(Base):
     """Document chunks for better vector search (split large documents)"""
 
     __tablename__ = "document_chunks"
+    __table_args__ = (
+        Index("ix_document_chunks_search_vector", "search_vector", postgresql_using="gin"),
+    ) + ((
+        Index(
+            "ix_document_chunks_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={
+                "m": settings.PGVECTOR_HNSW_M,
+                "ef_construction": settings.PGVECTOR_HNSW_EF_CONSTRUCTION,
+            },
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    ) if PGVECTOR_ENABLED else ())
 
     # Primary key
     id: Mapped[uuid.UUID] = mapped_column(
@@ -165,12 +199,31 @@ class DocumentChunk(Base):
     )
     content: Mapped[str] = mapped_column(Text, nullable=False)
     char_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    content_hash: Mapped[str | None] = mapped_column(
+        String(64),
+        comment="SHA-256 of the chunk content (identifies the chunk across edits)"
+    )
+    position: Mapped[dict | None] = mapped_column(
+        JSON,
+        comment="Location in the source file (page, slide, sheet, rows, section, message)"
+    )
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(f"to_tsvector('{TEXT_SEARCH_CONFIG}'::regconfig, content)", persisted=True),
+        comment="Full-text search vector of the content (lexical search)"
+    )
 
     # Vector embedding
     vector_id: Mapped[str | None] = mapped_column(
         String(500),
+        index=True,
         comment="ID of the vector in Pinecone"
     )
+    if PGVECTOR_ENABLED:
+        embedding: Mapped[list | None] = mapped_column(
+            Vector(settings.PGVECTOR_DIMENSIONS),
+            comment="Chunk embedding (pgvector backend)"
+        )
     embedding_status: Mapped[str] = mapped_column(
         String(50),
         nullable=False,
@@ -0,0 +1,96 @@
+"""
+Embedding Migration Model
+"""
+from datetime import datetime
+from sqlalchemy import String, DateTime, ForeignKey, Text, Integer, Float, text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+from app.core.database import Base
+
+
+class EmbeddingMigration(Base):
+    """Re-embedding of an organization's documents with a new embedding model"""
+
+    __tablename__ = "embedding_migrations"
+
+    # Primary key
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        server_default=text("gen_random_uuid()")
+    )
+
+    # Organization relationship
+    org_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+
+    # Models and target namespace
+    source_model: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+        comment="Model the organization searches with while migrating"
+    )
+    target_model: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+        comment="Model being migrated to (EmbeddingsService.MODELS name)"
+    )
+    target_model_key: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+        comment="Target model plus reduced dimensions (Document.shadow_embedding_model)"
+    )
+    namespace: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+        comment="Shadow vector store namespace receiving the new vectors"
+    )
+
+    # Status
+    status: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False,
+        default="backfilling",
+        server_default="backfilling",
+        comment="backfilling, dual_read, completed, cancelled, failed"
+    )
+    error: Mapped[str | None] = mapped_column(Text)
+
+    # Progress
+    documents_total: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    documents_done: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    chunks_embedded: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+    # Dual-read comparison (sum of per-query result overlap)
+    dual_reads: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    dual_read_overlap: Mapped[float] = mapped_column(Float, default=0.0, server_default="0")
+
+    # Timestamps
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=datetime.utcnow,
+        server_default=text("now()")
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=datetime.utcnow,
+        server_default=text("now()"),
+        onupdate=datetime.utcnow
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<EmbeddingMigration(id={self.id}, org_id={self.org_id}, "
+            f"target={self.target_model_key}, status={self.status})>"
+        )
@@ -71,6 +71,16 @@ class Organization(Base):
         server_default="0"
     )
 
+    # Vector embeddings (changed by embedding migrations)
+    embedding_model: Mapped[str | None] = mapped_column(
+        String(100),
+        comment="Embedding model of the org's vectors (default: EMBEDDING_MODEL)"
+    )
+    vector_namespace: Mapped[str | None] = mapped_column(
+        String(255),
+        comment="Vector store namespace of the org (default: org ID)"
+    )
+
     # Settings
     settings: Mapped[dict | None] = mapped_column(Text)  # JSON stored as text
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, server_default="true")
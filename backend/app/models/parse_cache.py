@@ -0,0 +1,79 @@
+"""
+Parse Cache Model
+"""
+from datetime import datetime
+from sqlalchemy import String, DateTime, ForeignKey, Integer, LargeBinary, UniqueConstraint, text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+from app.core.database import Base
+
+
+class ParseCache(Base):
+    """Parsed and chunked content of a source file at a given revision"""
+
+    __tablename__ = "parse_cache"
+    __table_args__ = (
+        # Only the latest parsed revision of each file is kept
+        UniqueConstraint("data_source_id", "external_id", name="uq_parse_cache_source_external_id"),
+    )
+
+    # Primary key
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        server_default=text("gen_random_uuid()")
+    )
+
+    # Source file
+    data_source_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("data_sources.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    external_id: Mapped[str] = mapped_column(
+        String(500),
+        nullable=False,
+        comment="External ID from the source (Document.external_id)"
+    )
+    revision: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+        comment="Content hash or provider revision of the file (e.g. Drive md5Checksum)"
+    )
+    parse_key: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        comment="Hash of the chunking settings and tokenizer model the chunks were made with"
+    )
+
+    # zlib-compressed JSON of the parse result (content, metadata, chunks)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="Uncompressed size of data"
+    )
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=datetime.utcnow,
+        server_default=text("now()")
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=datetime.utcnow,
+        server_default=text("now()"),
+        onupdate=datetime.utcnow
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ParseCache(data_source_id={self.data_source_id}, "
+            f"external_id={self.external_id}, revision={self.revision})>"
+        )
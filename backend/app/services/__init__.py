@@ -5,6 +5,7 @@ from app.services.encryption import encryption_service
 from app.services.document_parser import document_parser_service
 from app.services.embeddings import embeddings_service
 from app.services.pinecone_service import pinecone_service
+from app.services.vector_store import vector_store
 from app.services.data_sync import data_sync_service
 from app.services.search import search_service
 from app.services.ai_service import ai_service
@@ -16,6 +17,7 @@ __all__ = [
     "document_parser_service",
     "embeddings_service",
     "pinecone_service",
+    "vector_store",
     "data_sync_service",
     "search_service",
     "ai_service",
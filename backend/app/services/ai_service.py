@@ -223,7 +223,7 @@ Current date: {current_date}
         Build system prompt with context from documents
 
         Args:
-            context_documents: List of relevant documents
+            context_documents: List of relevant documents (search results)
 
         Returns:
             System prompt with context
@@ -240,9 +240,18 @@ Current date: {current_date}
             for i, doc in enumerate(context_documents, 1):
                 source_type = doc.get("source_type", "unknown")
                 title = doc.get("title", "Untitled")
-                content = doc.get("content", "")
                 url = doc.get("url", "")
 
+                # Use the matched chunks rather than the whole document
+                matched_chunks = doc.get("matched_chunks")
+                if matched_chunks:
+                    content = "\n\n[...]\n\n".join(
+                        chunk["content"]
+                        for chunk in sorted(matched_chunks, key=lambda chunk: chunk["chunk_index"])
+                    )
+                else:
+                    content = doc.get("content") or doc.get("content_preview", "")
+
                 prompt += f"### Document {i}: {title}\n"
                 prompt += f"**Source:** {source_type.replace('_', ' ').title()}\n"
                 if url:
@@ -0,0 +1,248 @@
+"""
+Chunker Service
+Streaming, token-aware splitting of document text into chunks
+"""
+import hashlib
+import logging
+import re
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+from app.core.config import settings
+from app.services.embeddings import embeddings_service
+
+logger = logging.getLogger(__name__)
+
+
+class ChunkerService:
+    """
+    Split text into overlapping chunks sized in embedding-model tokens
+
+    Text is scanned once as a lazy stream of sentence-like segments, each
+    tokenized once with the embedding model's cached tokenizer, and chunks
+    are yielded as soon as they are complete.
+
+    Chunk boundaries are content-defined:
+    - a markdown heading starts a new chunk (without overlap) unless the
+      current chunk is still small
+    - a paragraph break ends a chunk once it is at least half full
+    - otherwise a chunk ends after an "anchor" sentence (chosen by hashing
+      the sentence) once it is at least half full
+    Boundaries therefore depend on nearby text only, so an edit changes the
+    chunks around it while the rest of the document keeps identical chunks
+    and content hashes.
+    """
+
+    # Sentence-like segments used as chunking units
+    _SEGMENT_RE = re.compile(r"[^.!?\n]*(?:[.!?]+|\n|$)\s*")
+
+    # Markdown (ATX) heading at the start of a line
+    _HEADING_RE = re.compile(r"[ \t]*#{1,6}[ \t]")
+
+    # Words with surrounding whitespace (for splitting over-long sentences)
+    _WORD_RE = re.compile(r"\s*\S+\s*")
+
+    # On average every Nth sentence may end a chunk (once it is half full)
+    CHUNK_ANCHOR_DIVISOR = 4
+
+    def __init__(self):
+        """Initialize chunker"""
+        self.logger = logger
+
+    def iter_chunks(
+        self,
+        text: str,
+        max_tokens: Optional[int] = None,
+        overlap_tokens: Optional[int] = None,
+        model: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily split text into chunks
+
+        Args:
+            text: Text to chunk
+            max_tokens: Maximum tokens per chunk (default: CHUNK_MAX_TOKENS)
+            overlap_tokens: Tokens repeated from the previous chunk
+                (default: CHUNK_OVERLAP_TOKENS)
+            model: Embedding model whose tokenizer counts tokens
+
+        Yields:
+            Chunks with index, content, char/token counts and content hash
+        """
+        max_tokens = max_tokens or settings.CHUNK_MAX_TOKENS
+        if overlap_tokens is None:
+            overlap_tokens = settings.CHUNK_OVERLAP_TOKENS
+        overlap_tokens = min(overlap_tokens, max_tokens // 2)
+
+        encoder = embeddings_service.get_encoder(model or settings.EMBEDDING_MODEL)
+
+        # Short text is a single chunk
+        if len(text) <= max_tokens * 4:
+            token_count = len(encoder.encode_ordinary(text))
+            if token_count <= max_tokens:
+                yield self._make_chunk(0, text, token_count)
+                return
+
+        max_body = max_tokens - overlap_tokens
+        min_body = max_body // 2
+
+        index = 0
+        body: List[str] = []
+        body_counts: List[int] = []
+        body_tokens = 0
+        prefix = ""
+        prefix_tokens = 0
+        at_line_start = True
+
+        def flush(keep_overlap: bool = True):
+            nonlocal index, body, body_counts, body_tokens, prefix, prefix_tokens
+            content = (prefix + "".join(body)).strip()
+            if content:
+                yield self._make_chunk(index, content, prefix_tokens + body_tokens)
+                index += 1
+
+            if keep_overlap:
+                prefix, prefix_tokens = self._overlap_tail(body, body_counts, overlap_tokens, encoder)
+            else:
+                prefix, prefix_tokens = "", 0
+            body, body_counts, body_tokens = [], [], 0
+
+        for segment, tokens in self._segments(text, max_body, encoder):
+            heading = at_line_start and self._HEADING_RE.match(segment) is not None
+            trailing = segment[len(segment.rstrip()):]
+            at_line_start = "\n" in trailing
+
+            if heading and body_tokens >= min_body // 2:
+                # New section: the previous one is not repeated as overlap
+                yield from flush(keep_overlap=False)
+            elif heading and not body:
+                prefix, prefix_tokens = "", 0
+            elif body and body_tokens + tokens > max_body:
+                yield from flush()
+
+            body.append(segment)
+            body_counts.append(tokens)
+            body_tokens += tokens
+
+            paragraph_end = trailing.count("\n") >= 2
+            if body_tokens >= min_body and (paragraph_end or self._is_anchor(segment)):
+                yield from flush()
+
+        if body:
+            yield from flush()
+
+    def iter_element_chunks(
+        self,
+        elements: Iterable[Dict[str, Any]],
+        max_tokens: Optional[int] = None,
+        overlap_tokens: Optional[int] = None,
+        model: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily chunk a parsed element stream without crossing element boundaries
+
+        Each element (page, slide, sheet rows, section, message) is chunked on
+        its own and its chunks carry the element's position.
+
+        Args:
+            elements: Dicts with text and position (see DocumentParserService)
+            max_tokens: Maximum tokens per chunk (default: CHUNK_MAX_TOKENS)
+            overlap_tokens: Tokens repeated from the previous chunk of the element
+            model: Embedding model whose tokenizer counts tokens
+
+        Yields:
+            Chunks as from iter_chunks, numbered across elements, with position
+        """
+        index = 0
+        for element in elements:
+            if not element["text"].strip():
+                continue
+
+            for chunk in self.iter_chunks(element["text"], max_tokens, overlap_tokens, model):
+                chunk["index"] = index
+                chunk["position"] = element.get("position")
+                index += 1
+                yield chunk
+
+    def _segments(self, text: str, max_tokens: int, encoder: Any) -> Iterator[Tuple[str, int]]:
+        """Sentences with their token counts, over-long sentences split at words"""
+        for match in self._SEGMENT_RE.finditer(text):
+            segment = match.group(0)
+            if not segment:
+                continue
+
+            tokens = len(encoder.encode_ordinary(segment))
+            if tokens <= max_tokens:
+                yield segment, tokens
+            else:
+                yield from self._split_words(segment, max_tokens, encoder)
+
+    def _split_words(self, segment: str, max_tokens: int, encoder: Any) -> Iterator[Tuple[str, int]]:
+        """Split a sentence into pieces of at most max_tokens at word boundaries"""
+        piece: List[str] = []
+        piece_tokens = 0
+
+        for word in self._WORD_RE.findall(segment):
+            tokens = len(encoder.encode_ordinary(word))
+
+            if piece and piece_tokens + tokens > max_tokens:
+                yield "".join(piece), piece_tokens
+                piece, piece_tokens = [], 0
+
+            if tokens > max_tokens:
+                # No word boundary to split at (e.g. encoded data): split tokens
+                token_ids = encoder.encode_ordinary(word)
+                for start in range(0, len(token_ids), max_tokens):
+                    window = token_ids[start:start + max_tokens]
+                    yield encoder.decode(window), len(window)
+                continue
+
+            piece.append(word)
+            piece_tokens += tokens
+
+        if piece:
+            yield "".join(piece), piece_tokens
+
+    def _is_anchor(self, segment: str) -> bool:
+        """Whether a chunk may end after this segment (depends on its content only)"""
+        digest = hashlib.blake2b(segment.strip().encode("utf-8"), digest_size=4).digest()
+        return int.from_bytes(digest, "big") % self.CHUNK_ANCHOR_DIVISOR == 0
+
+    @staticmethod
+    def _overlap_tail(
+        segments: List[str],
+        counts: List[int],
+        overlap_tokens: int,
+        encoder: Any,
+    ) -> Tuple[str, int]:
+        """Trailing whole segments of a chunk that fit into the overlap"""
+        tail: List[str] = []
+        tail_tokens = 0
+        for segment, tokens in zip(reversed(segments), reversed(counts)):
+            if tail_tokens + tokens > overlap_tokens:
+                break
+            tail.append(segment)
+            tail_tokens += tokens
+
+        if not tail and segments and overlap_tokens > 0:
+            # Last sentence is too long: overlap from a word boundary instead
+            text = encoder.decode(encoder.encode_ordinary(segments[-1])[-overlap_tokens:])
+            space = text.find(" ")
+            text = text[space + 1:] if space != -1 else ""
+            return text, len(encoder.encode_ordinary(text))
+
+        return "".join(reversed(tail)), tail_tokens
+
+    @staticmethod
+    def _make_chunk(index: int, content: str, token_count: int) -> Dict[str, Any]:
+        """Build chunk dict with a content hash identifying the chunk"""
+        return {
+            "index": index,
+            "content": content,
+            "char_count": len(content),
+            "token_count": token_count,
+            "content_hash": hashlib.sha256(content.encode("utf-8")).hexdigest(),
+        }
+
+
+# Create singleton instance
+chunker_service = ChunkerService()
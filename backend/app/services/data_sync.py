@@ -2,22 +2,33 @@
 Data Sync Service
 Orchestrates document fetching, parsing, embedding, and storage
 """
+import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, AsyncIterator, Type
 import uuid
 
+import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select, update, insert, delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
+from app.core.config import settings
 from app.models import DataSource, Document, DocumentChunk, SyncLog
+from app.connectors.base import BaseOAuthConnector
 from app.connectors.salesforce import SalesforceConnector
 from app.connectors.slack import SlackConnector
 from app.connectors.google import GoogleConnector
 from app.connectors.notion import NotionConnector
 from app.services.document_parser import document_parser_service
-from app.services.embeddings import embeddings_service
-from app.services.pinecone_service import pinecone_service
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.embedding_migration import embedding_migration_service
+from app.services.encryption import encryption_service
+from app.services.file_spool import SpooledFile
+from app.services.parse_cache import parse_cache_service
+from app.services.vector_store import vector_store
+from app.services.result_cache import search_result_cache
+from app.services.sync_pipeline import SyncPipeline, PipelineStage, PageCheckpoint
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +45,35 @@ class DataSyncService:
         "notion": NotionConnector,
     }
 
+    # Columns refreshed when an incoming document already exists
+    DOCUMENT_UPDATE_COLUMNS = (
+        "title",
+        "content",
+        "word_count",
+        "char_count",
+        "url",
+        "source_metadata",
+        "source_updated_at",
+        "parse_status",
+        "embedding_status",
+        "shadow_embedding_model",
+        "is_deleted",
+        "deleted_at",
+        "updated_at",
+    )
+
+    # Keeps multi-row statements well below the 32767 bind parameter limit
+    MAX_ROWS_PER_STATEMENT = 500
+
+    # Settings prefix holding each connector's OAuth client credentials
+    CONNECTOR_SETTINGS = {
+        "salesforce": "SALESFORCE",
+        "slack": "SLACK",
+        "google_drive": "GOOGLE",
+        "gmail": "GOOGLE",
+        "notion": "NOTION",
+    }
+
     def __init__(self):
         """Initialize data sync service"""
         self.logger = logger
@@ -70,11 +110,12 @@ class DataSyncService:
             raise ValueError(f"Data source is not active: {data_source_id}")
 
         # Create sync log
+        started_at = datetime.utcnow()
         sync_log = SyncLog(
             data_source_id=data_source_id,
             status="in_progress",
             sync_type=sync_type,
-            started_at=datetime.utcnow(),
+            started_at=started_at,
         )
         db.add(sync_log)
         await db.commit()
@@ -93,58 +134,38 @@ class DataSyncService:
             await db.commit()
 
             # Get connector
-            connector = self.CONNECTORS.get(data_source.source_type)
-            if not connector:
+            connector_class = self.CONNECTORS.get(data_source.source_type)
+            if not connector_class:
                 raise ValueError(f"No connector for source type: {data_source.source_type}")
 
-            # Fetch documents from source
+            # Fetch pages from source lazily and run them through the pipeline
             self.logger.info(f"Fetching documents from {data_source.source_type}")
-            documents = await self._fetch_documents(
-                connector=connector,
-                data_source=data_source,
-            )
-
-            self.logger.info(f"Fetched {len(documents)} documents from source")
-
-            # Process each document
-            stats = {
-                "processed": 0,
-                "added": 0,
-                "updated": 0,
-                "failed": 0,
-            }
+            async with self._create_connector(data_source, connector_class) as connector:
+                pages = self._fetch_documents(
+                    db=db,
+                    connector=connector,
+                    data_source=data_source,
+                )
 
-            for doc_data in documents:
-                try:
-                    result = await self._process_document(
+                # Embedding model switch-overs of the org wait for the sync
+                async with embedding_migration_service.sync_lock(data_source.org_id):
+                    stats = await self._run_pipeline(
                         db=db,
                         data_source=data_source,
-                        doc_data=doc_data,
-                    )
-
-                    if result["action"] == "created":
-                        stats["added"] += 1
-                    elif result["action"] == "updated":
-                        stats["updated"] += 1
-
-                    stats["processed"] += 1
-
-                except Exception as e:
-                    self.logger.error(
-                        f"Error processing document {doc_data.get('id')}: {str(e)}",
-                        exc_info=True
+                        connector=connector,
+                        pages=pages,
                     )
-                    stats["failed"] += 1
 
             # Update sync log
             sync_log.status = "success"
             sync_log.completed_at = datetime.utcnow()
             sync_log.duration_seconds = int(
-                (sync_log.completed_at - sync_log.started_at).total_seconds()
+                (sync_log.completed_at - started_at).total_seconds()
             )
             sync_log.documents_processed = stats["processed"]
             sync_log.documents_added = stats["added"]
             sync_log.documents_updated = stats["updated"]
+            sync_log.documents_deleted = stats["deleted"]
 
             # Update data source
             await db.execute(
@@ -156,7 +177,7 @@ class DataSyncService:
                     last_sync_at=datetime.utcnow(),
                     last_sync_error=None,
                     next_sync_at=datetime.utcnow() + timedelta(seconds=data_source.sync_frequency),
-                    total_documents=data_source.total_documents + stats["added"],
+                    total_documents=data_source.total_documents + stats["added"] - stats["deleted"],
                     total_sync_count=data_source.total_sync_count + 1,
                 )
             )
@@ -166,7 +187,7 @@ class DataSyncService:
             self.logger.info(
                 f"Sync completed for data source {data_source_id}: "
                 f"{stats['processed']} processed, {stats['added']} added, "
-                f"{stats['updated']} updated, {stats['failed']} failed"
+                f"{stats['updated']} updated, {stats['deleted']} deleted, {stats['failed']} failed"
             )
 
             return {
@@ -182,7 +203,7 @@ class DataSyncService:
             sync_log.status = "failed"
             sync_log.completed_at = datetime.utcnow()
             sync_log.duration_seconds = int(
-                (sync_log.completed_at - sync_log.started_at).total_seconds()
+                (sync_log.completed_at - started_at).total_seconds()
             )
             sync_log.error_message = str(e)
 
@@ -202,20 +223,60 @@ class DataSyncService:
 
             raise
 
+    def _create_connector(
+        self,
+        data_source: DataSource,
+        connector_class: Type[BaseOAuthConnector],
+    ) -> BaseOAuthConnector:
+        """Instantiate the connector with the provider's OAuth settings"""
+        prefix = self.CONNECTOR_SETTINGS[data_source.source_type]
+
+        return connector_class(
+            client_id=getattr(settings, f"{prefix}_CLIENT_ID") or "",
+            client_secret=getattr(settings, f"{prefix}_CLIENT_SECRET") or "",
+            redirect_uri=getattr(settings, f"{prefix}_REDIRECT_URI") or "",
+            scopes=[],
+        )
+
+    async def _get_access_token(
+        self,
+        db: AsyncSession,
+        connector: BaseOAuthConnector,
+        data_source: DataSource,
+    ) -> str:
+        """Decrypt the access token, refreshing it first if it has expired"""
+        access_token = encryption_service.decrypt(data_source.access_token or "")
+        refresh_token = encryption_service.decrypt(data_source.refresh_token or "")
+
+        expires_at = data_source.token_expires_at
+        if expires_at and expires_at.tzinfo:
+            expires_at = expires_at.astimezone(timezone.utc).replace(tzinfo=None)
+
+        if refresh_token and expires_at and expires_at <= datetime.utcnow():
+            self.logger.info(f"Refreshing access token for data source {data_source.id}")
+            token_data = await connector.refresh_access_token(refresh_token)
+
+            access_token = token_data["access_token"]
+            data_source.access_token = encryption_service.encrypt(access_token)
+            data_source.token_expires_at = connector.calculate_token_expiry(
+                token_data.get("expires_in", 3600)
+            )
+            await db.commit()
+
+        return access_token
+
     async def _fetch_documents(
         self,
-        connector: Any,
+        db: AsyncSession,
+        connector: BaseOAuthConnector,
         data_source: DataSource,
-    ) -> List[Dict[str, Any]]:
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Fetch documents from data source
+        Fetch pages of documents changed since the stored sync cursor
 
-        Returns:
-            List of document data dicts
+        Yields:
+            Pages with "documents" (list of document data dicts) and "cursor"
         """
-        # Each connector should implement a fetch_documents method
-        # For now, return empty list (to be implemented in each connector)
-
         # Example structure for each document:
         # {
         #     "id": "external-id",
@@ -233,45 +294,337 @@ class DataSyncService:
         #     },
         #     "created_at": datetime,
         #     "updated_at": datetime,
+        #     "deleted": False,
         # }
 
-        # TODO: Implement connector methods
-        self.logger.warning(f"Fetch documents not yet implemented for {data_source.source_type}")
-        return []
+        if data_source.source_type == "gmail":
+            # GoogleConnector only implements Drive sync so far
+            self.logger.warning("Fetch documents not yet implemented for gmail")
+            return
+
+        access_token = await self._get_access_token(db, connector, data_source)
+        since_cursor = (data_source.config or {}).get("sync_cursor")
+
+        self.logger.info(
+            f"Fetching {'changes' if since_cursor else 'all documents'} "
+            f"from {data_source.source_type}"
+        )
+
+        async for page in connector.fetch_documents(
+            access_token,
+            since_cursor=since_cursor,
+            config=data_source.config,
+        ):
+            yield page
 
-    async def _process_document(
+    async def _run_pipeline(
         self,
         db: AsyncSession,
         data_source: DataSource,
-        doc_data: Dict[str, Any],
-    ) -> Dict[str, Any]:
+        connector: BaseOAuthConnector,
+        pages: AsyncIterator[Dict[str, Any]],
+    ) -> Dict[str, int]:
         """
-        Process a single document: parse, chunk, embed, and store
+        Process fetched pages through the staged sync pipeline
 
-        Args:
-            db: Database session
-            data_source: Data source
-            doc_data: Document data from connector
+        Stages: fetch -> resolve -> parse -> chunk -> diff -> embed -> upsert ->
+        DB write.
+        Every stage has its own worker pool and the stages are joined by
+        bounded queues, so a slow stage throttles the source instead of
+        buffering the whole workspace in memory.
+
+        The database session is shared by the resolve, diff and DB write stages and
+        guarded by a lock, since AsyncSession is not safe for concurrent use.
+
+        The connector cursor is checkpointed into DataSource.config as pages
+        complete, so an interrupted sync resumes from the last stored page.
 
         Returns:
-            Dict with processing result
+            Dict with processed/added/updated/failed counts
         """
-        external_id = doc_data["id"]
+        stats = {
+            "processed": 0,
+            "added": 0,
+            "updated": 0,
+            "deleted": 0,
+            "failed": 0,
+        }
 
-        # Check if document already exists
-        result = await db.execute(
-            select(Document).where(
-                Document.data_source_id == data_source.id,
-                Document.external_id == external_id,
+        config = data_source.config or {}
+        checkpoint = PageCheckpoint(
+            config.get("sync_cursor"),
+            failures=config.get("sync_failures"),
+            max_attempts=settings.SYNC_MAX_ITEM_ATTEMPTS,
+        )
+
+        # Fixed for the whole sync (switch-overs wait for it), so not from a
+        # cache that may predate the last switch-over
+        org_embedding = await embedding_migration_service.get_org_embedding(
+            db, data_source.org_id, use_cache=False
+        )
+        migration = org_embedding["migration"]
+
+        context = {
+            "db": db,
+            "db_lock": asyncio.Lock(),
+            "data_source": data_source,
+            # Downloads files of documents without inline content
+            "connector": connector,
+            # external_id -> id/source_updated_at of documents seen in this run
+            "known_documents": {},
+            # Shared by all embed workers so small documents fill batches together
+            "embedding_batcher": EmbeddingBatcher(model=org_embedding["model"]),
+            "namespace": org_embedding["namespace"],
+            # Namespace of a running embedding migration (receives deletes)
+            "shadow_namespace": migration["namespace"] if migration else None,
+        }
+
+        def on_complete(item: Dict[str, Any]):
+            if item.get("embedding_error"):
+                # Stored without vectors: the page is fetched again (up to
+                # SYNC_MAX_ITEM_ATTEMPTS times) so the embeddings are retried
+                stats["failed"] += 1
+                checkpoint.item_done(item["page"], failed=True, key=item["doc_data"].get("id"))
+                return
+
+            action = item["result"]["action"]
+            if action == "created":
+                stats["added"] += 1
+            elif action == "updated":
+                stats["updated"] += 1
+            elif action == "deleted":
+                stats["deleted"] += 1
+
+            stats["processed"] += 1
+            checkpoint.item_done(item["page"], key=item["doc_data"].get("id"))
+
+        def on_error(item: Dict[str, Any], error: Exception):
+            self.logger.error(
+                f"Error processing document {item['doc_data'].get('id')}: {str(error)}",
+                exc_info=error
             )
+            stats["failed"] += 1
+            checkpoint.item_done(item["page"], failed=True, key=item["doc_data"].get("id"))
+
+        pipeline = SyncPipeline(
+            stages=[
+                PipelineStage(
+                    "resolve",
+                    lambda items: self._resolve_stage(context, items),
+                    batch_size=settings.SYNC_LOOKUP_BATCH_SIZE,
+                ),
+                PipelineStage(
+                    "parse",
+                    lambda item: self._parse_stage(context, item),
+                    concurrency=settings.SYNC_PARSE_CONCURRENCY,
+                ),
+                PipelineStage(
+                    "chunk",
+                    lambda item: self._chunk_stage(context, item),
+                    concurrency=settings.SYNC_CHUNK_CONCURRENCY,
+                ),
+                PipelineStage(
+                    "diff",
+                    lambda items: self._diff_stage(context, items),
+                    batch_size=settings.SYNC_LOOKUP_BATCH_SIZE,
+                ),
+                PipelineStage(
+                    "embed",
+                    lambda item: self._embed_stage(context, item),
+                    concurrency=settings.SYNC_EMBED_CONCURRENCY,
+                ),
+                PipelineStage(
+                    "upsert",
+                    lambda item: self._upsert_stage(context, item),
+                    concurrency=settings.SYNC_UPSERT_CONCURRENCY,
+                ),
+                # Single writer: the session cannot be used concurrently anyway
+                PipelineStage(
+                    "db_write",
+                    lambda items: self._write_stage(context, items),
+                    concurrency=1,
+                    batch_size=settings.SYNC_WRITE_BATCH_SIZE,
+                ),
+            ],
+            queue_size=settings.SYNC_QUEUE_SIZE,
+            on_complete=on_complete,
+            on_error=on_error,
         )
-        existing_doc = result.scalar_one_or_none()
+
+        async def source():
+            # Fetch stage: connector pagination is sequential
+            page_number = 0
+            async for page in pages:
+                await self._save_cursor(context, checkpoint)
+
+                documents = page["documents"]
+                checkpoint.add_page(page_number, len(documents), page["cursor"])
+                for doc_data in documents:
+                    yield {"doc_data": doc_data, "page": page_number}
+
+                page_number += 1
+
+        try:
+            await pipeline.run(source())
+        finally:
+            await context["embedding_batcher"].close()
+            await self._save_cursor(context, checkpoint)
+
+            # Cached search results of the org may now be stale
+            if stats["added"] or stats["updated"] or stats["deleted"]:
+                await search_result_cache.invalidate_org(data_source.org_id)
+
+        return stats
+
+    async def _save_cursor(self, context: Dict[str, Any], checkpoint: PageCheckpoint):
+        """Persist the sync cursor and failed attempts in the data source config if changed"""
+        data_source = context["data_source"]
+        config = data_source.config or {}
+
+        updates = {}
+        if checkpoint.cursor is not None and config.get("sync_cursor") != checkpoint.cursor:
+            updates["sync_cursor"] = checkpoint.cursor
+        if config.get("sync_failures", {}) != checkpoint.failures:
+            updates["sync_failures"] = checkpoint.failures
+
+        if not updates:
+            return
+
+        async with context["db_lock"]:
+            # Reassign so SQLAlchemy detects the JSON change
+            data_source.config = {**config, **updates}
+            await context["db"].commit()
+
+    async def _resolve_stage(
+        self,
+        context: Dict[str, Any],
+        items: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Resolve a batch of external IDs against existing documents
+
+        Runs one IN query per batch for IDs not seen yet in this run and keeps
+        the results in an in-memory map, so the staleness check needs no
+        further round trips. New documents get their ID assigned here, so a
+        document fetched twice in one run resolves to the same row.
+        """
+        db = context["db"]
+        data_source = context["data_source"]
+        known = context["known_documents"]
+
+        unknown_ids = {item["doc_data"]["id"] for item in items} - known.keys()
+        if unknown_ids:
+            async with context["db_lock"]:
+                result = await db.execute(
+                    select(
+                        Document.external_id,
+                        Document.id,
+                        Document.source_updated_at,
+                        Document.created_at,
+                        Document.is_deleted,
+                        Document.title,
+                        Document.url,
+                    ).where(
+                        Document.data_source_id == data_source.id,
+                        Document.external_id.in_(unknown_ids),
+                    )
+                )
+
+            for row in result:
+                known[row.external_id] = {
+                    "id": row.id,
+                    "source_updated_at": row.source_updated_at,
+                    "created_at": row.created_at,
+                    "is_deleted": row.is_deleted,
+                    "title": row.title,
+                    "url": row.url,
+                }
+
+        for item in items:
+            external_id = item["doc_data"]["id"]
+            existing = known.get(external_id)
+            item["existing"] = existing
+
+            if existing:
+                item["document_id"] = existing["id"]
+                item["created_at"] = existing["created_at"]
+            elif not item["doc_data"].get("deleted"):
+                # Document IDs are assigned up front so vector IDs can be
+                # built before the document row is written
+                item["document_id"] = uuid.uuid4()
+                item["created_at"] = datetime.utcnow()
+                known[external_id] = {
+                    "id": item["document_id"],
+                    "source_updated_at": None,
+                    "created_at": item["created_at"],
+                    "is_deleted": False,
+                    "title": None,
+                    "url": None,
+                }
+
+        return items
+
+    async def _delete_document(
+        self,
+        context: Dict[str, Any],
+        item: Dict[str, Any],
+    ) -> None:
+        """Soft delete a document removed at the source and drop its vectors"""
+        existing = item["existing"]
+        if not existing or existing["is_deleted"]:
+            item["result"] = {"action": "skipped", "reason": "not_found"}
+            return None
+
+        db = context["db"]
+
+        async with context["db_lock"]:
+            result = await db.execute(
+                select(DocumentChunk.vector_id).where(
+                    DocumentChunk.document_id == existing["id"],
+                    DocumentChunk.vector_id.is_not(None),
+                )
+            )
+            vector_ids = list(result.scalars().all())
+
+            await db.execute(
+                update(Document)
+                .where(Document.id == existing["id"])
+                .values(is_deleted=True, deleted_at=datetime.utcnow())
+            )
+            await parse_cache_service.delete(db, context["data_source"].id, item["doc_data"]["id"])
+            await db.commit()
+
+        existing["is_deleted"] = True
+
+        await self._delete_vectors(context, vector_ids)
+
+        item["result"] = {"action": "deleted", "document_id": existing["id"]}
+        return None
+
+    async def _parse_stage(
+        self,
+        context: Dict[str, Any],
+        item: Dict[str, Any],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Check staleness and parse the incoming content
+
+        Returns:
+            The work item, or None if the document is skipped
+        """
+        doc_data = item["doc_data"]
+        external_id = doc_data["id"]
+        existing = item["existing"]
+
+        if doc_data.get("deleted"):
+            return await self._delete_document(context, item)
 
         # If exists and not updated, skip
-        if existing_doc and doc_data.get("updated_at"):
-            if existing_doc.source_updated_at and existing_doc.source_updated_at >= doc_data["updated_at"]:
+        if existing and not existing["is_deleted"] and doc_data.get("updated_at"):
+            if existing["source_updated_at"] and existing["source_updated_at"] >= doc_data["updated_at"]:
                 self.logger.debug(f"Document {external_id} not updated, skipping")
-                return {"action": "skipped", "document_id": existing_doc.id}
+                item["result"] = {"action": "skipped", "document_id": existing["id"]}
+                return None
 
         # Parse document content
         parsed_content = None
@@ -283,155 +636,525 @@ class DataSyncService:
                 "char_count": len(doc_data["content"]),
             }
         elif doc_data.get("file_url"):
-            # Download and parse file
-            # TODO: Implement file download and parsing
-            self.logger.warning("File download not yet implemented")
-            return {"action": "skipped", "reason": "file_download_not_implemented"}
+            mime_type = doc_data.get("mime_type") or ""
+            size = (doc_data.get("metadata") or {}).get("size")
+
+            if not document_parser_service.is_supported(mime_type, doc_data.get("title")):
+                self.logger.debug(f"Unsupported file type {mime_type} for document {external_id}")
+                item["result"] = {"action": "skipped", "reason": "unsupported_type"}
+                return None
+
+            if size and size > document_parser_service.MAX_FILE_SIZE:
+                self.logger.warning(f"File of document {external_id} is too large ({size} bytes)")
+                item["result"] = {"action": "skipped", "reason": "file_too_large"}
+                return None
+
+            # Unchanged bytes (e.g. only renamed or re-shared): reuse the parse result
+            revision = parse_cache_service.get_revision(doc_data) if settings.PARSE_CACHE_ENABLED else None
+            if revision:
+                parsed_content = await self._get_cached_parse(context, external_id, revision)
+
+            if parsed_content is None:
+                # Download and parse file
+                try:
+                    parsed_content = await self._download_and_parse(context, doc_data)
+                except Exception as e:
+                    if not self._is_permanent_file_error(e):
+                        raise  # Retried by a later sync (blocks the cursor)
+
+                    # Retrying would fail the same way: record and move on
+                    self.logger.warning(f"Could not parse file of document {external_id}: {str(e)}")
+                    item["result"] = {"action": "skipped", "reason": "parse_failed"}
+                    return None
+
+                if revision:
+                    await self._cache_parse(context, external_id, revision, parsed_content)
 
         if not parsed_content:
             self.logger.warning(f"No content for document {external_id}")
-            return {"action": "skipped", "reason": "no_content"}
-
-        # Create or update document
-        if existing_doc:
-            # Update existing document
-            existing_doc.title = doc_data.get("title", "Untitled")
-            existing_doc.content = parsed_content["content"]
-            existing_doc.word_count = parsed_content.get("word_count")
-            existing_doc.char_count = parsed_content.get("char_count")
-            existing_doc.url = doc_data.get("url")
-            existing_doc.source_metadata = doc_data.get("metadata", {})
-            existing_doc.source_updated_at = doc_data.get("updated_at")
-            existing_doc.parse_status = "completed"
-            existing_doc.embedding_status = "pending"  # Re-embed on update
-            existing_doc.updated_at = datetime.utcnow()
-
-            document = existing_doc
-            action = "updated"
+            item["result"] = {"action": "skipped", "reason": "no_content"}
+            return None
 
-        else:
-            # Create new document
-            document = Document(
-                data_source_id=data_source.id,
-                org_id=data_source.org_id,
-                external_id=external_id,
-                source_type=data_source.source_type,
-                title=doc_data.get("title", "Untitled"),
-                content=parsed_content["content"],
-                content_type=doc_data.get("content_type", "document"),
-                mime_type=doc_data.get("mime_type"),
-                url=doc_data.get("url"),
-                word_count=parsed_content.get("word_count"),
-                char_count=parsed_content.get("char_count"),
-                source_metadata=doc_data.get("metadata", {}),
-                source_created_at=doc_data.get("created_at"),
-                source_updated_at=doc_data.get("updated_at"),
-                parse_status="completed",
-                embedding_status="pending",
+        item["parsed_content"] = parsed_content
+
+        return item
+
+    async def _download_and_parse(
+        self,
+        context: Dict[str, Any],
+        doc_data: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Stream a document's file into a spooled temp file and parse it
+
+        The parser worker opens (or memory-maps) the spooled file by path, so
+        large files are neither held in memory nor copied to the worker.
+        The file is parsed and chunked in one pass (see parse_and_chunk_document).
+
+        Returns:
+            Parsed content with chunks
+        """
+        access_token = await self._get_context_access_token(context)
+
+        with SpooledFile() as spool:
+            await context["connector"].download_file(
+                access_token,
+                doc_data["file_url"],
+                spool,
+                max_bytes=document_parser_service.MAX_FILE_SIZE,
             )
-            db.add(document)
-            action = "created"
 
-        await db.commit()
-        await db.refresh(document)
+            return await document_parser_service.parse_and_chunk_document(
+                spool.source(),
+                doc_data.get("mime_type") or "",
+                filename=doc_data.get("title"),
+                model=context["embedding_batcher"].model,
+                source_id=str(context["data_source"].id),
+            )
 
-        # Chunk the document
-        chunks = document_parser_service.chunk_text(
-            parsed_content["content"],
-            chunk_size=1000,
-            overlap=200,
-        )
+    @staticmethod
+    def _is_permanent_file_error(error: Exception) -> bool:
+        """
+        Whether downloading or parsing a file would fail the same way on retry
 
-        # Delete old chunks if updating
-        if action == "updated" and existing_doc:
-            await db.execute(
-                select(DocumentChunk).where(DocumentChunk.document_id == document.id)
+        Permanent: corrupt or oversized files (ValueError), parser timeouts
+        and crashes, and client errors such as 404. Network errors, rate
+        limits, server errors and auth errors are transient.
+        """
+        if isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+            return 400 <= status < 500 and status not in (401, 408, 429)
+
+        return isinstance(error, (ValueError, TimeoutError, RuntimeError))
+
+    async def _get_cached_parse(
+        self,
+        context: Dict[str, Any],
+        external_id: str,
+        revision: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Parse result of this file revision from the parse cache"""
+        async with context["db_lock"]:
+            parsed_content = await parse_cache_service.get(
+                context["db"],
+                context["data_source"].id,
+                external_id,
+                revision,
+                model=context["embedding_batcher"].model,
             )
-            # TODO: Delete old chunks and vectors
-
-        # Create chunks
-        chunk_objects = []
-        for chunk in chunks:
-            chunk_obj = DocumentChunk(
-                document_id=document.id,
-                chunk_index=chunk["index"],
-                content=chunk["content"],
-                char_count=chunk["char_count"],
-                embedding_status="pending",
+
+        if parsed_content is not None:
+            self.logger.debug(f"Document {external_id} unchanged at revision {revision}, using cached parse")
+
+        return parsed_content
+
+    async def _cache_parse(
+        self,
+        context: Dict[str, Any],
+        external_id: str,
+        revision: str,
+        parsed_content: Dict[str, Any],
+    ):
+        """Store a parse result (committed with the next document batch)"""
+        async with context["db_lock"]:
+            await parse_cache_service.put(
+                context["db"],
+                context["data_source"].id,
+                external_id,
+                revision,
+                parsed_content,
+                model=context["embedding_batcher"].model,
             )
-            db.add(chunk_obj)
-            chunk_objects.append(chunk_obj)
 
-        await db.commit()
+    async def _get_context_access_token(self, context: Dict[str, Any]) -> str:
+        """Access token for a file download (refreshed once expired, as syncs can outlive it)"""
+        async with context["db_lock"]:
+            return await self._get_access_token(
+                context["db"],
+                context["connector"],
+                context["data_source"],
+            )
+
+    async def _chunk_stage(
+        self,
+        context: Dict[str, Any],
+        item: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Split parsed content into chunks (along pages, slides, sheets, ...)"""
+        if "chunks" in item["parsed_content"]:
+            # Files are chunked by the parser worker while being parsed
+            item["chunks"] = item["parsed_content"].pop("chunks")
+        else:
+            item["chunks"] = document_parser_service.chunk_document(
+                item["parsed_content"],
+                model=context["embedding_batcher"].model,
+            )
+
+        return item
+
+    async def _diff_stage(
+        self,
+        context: Dict[str, Any],
+        items: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Diff new chunks against the stored chunks of updated documents
+
+        Chunks are identified by content hash (plus occurrence number for
+        repeated content), so unchanged chunks keep their rows and vector IDs
+        and only inserted or modified chunks are embedded. Stored chunks that
+        no longer occur are collected in item["removed_chunks"].
+        """
+        existing_ids = [
+            item["document_id"]
+            for item in items
+            if item["existing"] and not item["existing"]["is_deleted"]
+        ]
+
+        stored: Dict[uuid.UUID, List[Any]] = {}
+        if existing_ids:
+            async with context["db_lock"]:
+                result = await context["db"].execute(
+                    select(
+                        DocumentChunk.id,
+                        DocumentChunk.document_id,
+                        DocumentChunk.chunk_index,
+                        DocumentChunk.content_hash,
+                        DocumentChunk.vector_id,
+                        DocumentChunk.position,
+                    ).where(DocumentChunk.document_id.in_(existing_ids))
+                )
+            for row in result:
+                stored.setdefault(row.document_id, []).append(row)
+
+        for item in items:
+            existing = item["existing"]
+            doc_data = item["doc_data"]
+
+            # Vector metadata carries title and URL: re-embed everything if they
+            # changed (the embedding cache makes unchanged content cheap).
+            # Embeddings stored in the database have no copied metadata.
+            reusable = bool(existing) and not existing["is_deleted"] and (
+                vector_store.stores_in_database
+                or (
+                    existing["title"] == doc_data.get("title", "Untitled")
+                    and existing["url"] == doc_data.get("url")
+                )
+            )
+
+            stored_by_key = {}
+            stored_occurrences: Dict[str, int] = {}
+            removed = []
+            for row in sorted(stored.get(item["document_id"], []), key=lambda row: row.chunk_index):
+                if not (reusable and row.content_hash and row.vector_id):
+                    removed.append(row)
+                    continue
+
+                occurrence = stored_occurrences.get(row.content_hash, 0)
+                stored_occurrences[row.content_hash] = occurrence + 1
+                stored_by_key[(row.content_hash, occurrence)] = row
+
+            occurrences: Dict[str, int] = {}
+            for chunk in item["chunks"]:
+                occurrence = occurrences.get(chunk["content_hash"], 0)
+                occurrences[chunk["content_hash"]] = occurrence + 1
+
+                chunk["vector_id"] = f"{item['document_id']}_{chunk['content_hash'][:16]}"
+                if occurrence:
+                    chunk["vector_id"] += f"_{occurrence}"
+
+                row = stored_by_key.pop((chunk["content_hash"], occurrence), None)
+                if row and row.position != chunk.get("position"):
+                    # Moved to another page/slide/row range: vector metadata is stale
+                    removed.append(row)
+                    row = None
+                chunk["row_id"] = row.id if row else None
+                chunk["vector_id"] = row.vector_id if row else chunk["vector_id"]
+                chunk["unchanged"] = row is not None
+
+            removed.extend(stored_by_key.values())
+            item["removed_chunks"] = removed
+
+        return items
+
+    async def _embed_stage(
+        self,
+        context: Dict[str, Any],
+        item: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Create embeddings for new and modified chunks via the shared batcher"""
+        changed = [chunk for chunk in item["chunks"] if not chunk["unchanged"]]
+
+        if not changed:
+            return item
 
-        # Create embeddings (async task would be better)
         try:
-            await self._create_embeddings(db, document, chunk_objects)
+            # Chunks were sized with the same model's tokenizer
+            embeddings = await context["embedding_batcher"].embed(
+                [chunk["content"] for chunk in changed],
+                token_counts=[chunk["token_count"] for chunk in changed],
+            )
         except Exception as e:
+            # Document is still stored, with embedding_status = "failed"
             self.logger.error(f"Error creating embeddings: {str(e)}", exc_info=True)
-            document.embedding_status = "failed"
-            await db.commit()
+            item["embedding_error"] = str(e)
+            return item
 
-        return {
-            "action": action,
-            "document_id": document.id,
-            "chunks": len(chunk_objects),
-        }
+        for chunk, embedding_data in zip(changed, embeddings):
+            chunk["embedding"] = embedding_data["embedding"]
+
+        return item
 
-    async def _create_embeddings(
+    async def _upsert_stage(
         self,
-        db: AsyncSession,
-        document: Document,
-        chunks: List[DocumentChunk],
-    ):
-        """Create embeddings for document chunks"""
+        context: Dict[str, Any],
+        item: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Upsert vectors of new and modified chunks to the vector store"""
+        changed = [chunk for chunk in item["chunks"] if not chunk["unchanged"]]
+        item["vectors_stored"] = False
 
-        if not chunks:
-            return
+        if not changed or item.get("embedding_error"):
+            return item
 
-        # Get chunk texts
-        texts = [chunk.content for chunk in chunks]
+        if vector_store.stores_in_database:
+            # Embeddings are written with the chunk rows in the write stage
+            item["vectors_stored"] = True
+            return item
 
-        # Create embeddings
-        self.logger.info(f"Creating embeddings for {len(texts)} chunks")
-        embeddings = await embeddings_service.create_embeddings_batch(texts)
+        data_source = context["data_source"]
+        doc_data = item["doc_data"]
 
-        # Prepare vectors for Pinecone
+        # Prepare vectors for the vector store
         vectors = []
-        for i, (chunk, embedding_data) in enumerate(zip(chunks, embeddings)):
-            vector_id = f"{document.id}_{chunk.chunk_index}"
-
+        for chunk in changed:
             vectors.append({
-                "id": vector_id,
-                "values": embedding_data["embedding"],
+                "id": chunk["vector_id"],
+                "values": chunk["embedding"],
                 "metadata": {
-                    "document_id": str(document.id),
-                    "chunk_index": chunk.chunk_index,
-                    "org_id": str(document.org_id),
-                    "source_type": document.source_type,
-                    "title": document.title,
-                    "content": chunk.content[:500],  # First 500 chars for context
-                    "url": document.url or "",
-                    "created_at": document.created_at.isoformat(),
+                    "document_id": str(item["document_id"]),
+                    "chunk_index": chunk["index"],
+                    "org_id": str(data_source.org_id),
+                    "source_type": data_source.source_type,
+                    "title": doc_data.get("title", "Untitled"),
+                    "content": chunk["content"][:500],  # First 500 chars for context
+                    "url": doc_data.get("url") or "",
+                    "created_at": item["created_at"].isoformat(),
+                    # Position in the source file (page, slide, sheet, ...)
+                    **(chunk.get("position") or {}),
                 },
             })
 
-            # Update chunk
-            chunk.vector_id = vector_id
-            chunk.embedding_status = "completed"
+        # Upsert to the vector store
+        try:
+            await vector_store.upsert_vectors(vectors, namespace=context["namespace"])
+            item["vectors_stored"] = True
+            self.logger.info(
+                f"Created and stored {len(vectors)} embeddings "
+                f"({len(item['chunks']) - len(vectors)} chunks unchanged)"
+            )
+        except Exception as e:
+            self.logger.error(f"Error storing embeddings: {str(e)}", exc_info=True)
+            item["embedding_error"] = str(e)
+
+        return item
+
+    async def _write_stage(
+        self,
+        context: Dict[str, Any],
+        items: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Create or update a batch of documents and apply their chunk diffs
+
+        Documents are written with multi-row INSERT ... ON CONFLICT
+        (data_source_id, external_id) DO UPDATE statements, new chunks with
+        multi-row INSERTs, moved chunks with a bulk UPDATE and removed chunks
+        with a single DELETE, all in one commit per batch. Vectors of removed
+        chunks are then deleted from the vector store in one call (with the
+        pgvector backend the embeddings are columns of the chunk rows).
+        """
+        db = context["db"]
+        data_source = context["data_source"]
+        embedding_model = context["embedding_batcher"].model_key
+        now = datetime.utcnow()
+
+        # Keyed by external ID: a statement may not upsert the same row twice
+        latest = {item["doc_data"]["id"]: item for item in items}
+
+        document_rows = []
+        chunk_rows = []
+        moved_chunks = []
+        removed_chunk_ids = []
+        removed_vector_ids = []
+        removed_shadow_vector_ids = []
+
+        for item in latest.values():
+            doc_data = item["doc_data"]
+            parsed_content = item["parsed_content"]
+
+            if item.get("embedding_error"):
+                embedding_status = "failed"
+            elif item["chunks"]:
+                embedding_status = "completed"
+            else:
+                embedding_status = "pending"
+
+            document_rows.append({
+                "id": item["document_id"],
+                "data_source_id": data_source.id,
+                "org_id": data_source.org_id,
+                "external_id": doc_data["id"],
+                "source_type": data_source.source_type,
+                "title": doc_data.get("title", "Untitled"),
+                "content": parsed_content["content"],
+                "content_type": doc_data.get("content_type", "document"),
+                "mime_type": doc_data.get("mime_type"),
+                "url": doc_data.get("url"),
+                "word_count": parsed_content.get("word_count"),
+                "char_count": parsed_content.get("char_count"),
+                "source_metadata": doc_data.get("metadata", {}),
+                "source_created_at": doc_data.get("created_at"),
+                # Left unset when embedding failed, so the next fetch of the
+                # document is not skipped as unchanged
+                "source_updated_at": None if item.get("embedding_error") else doc_data.get("updated_at"),
+                "parse_status": "completed",
+                "embedding_status": embedding_status,
+                "embedding_model": embedding_model if item["vectors_stored"] else None,
+                "embedding_created_at": now if item["vectors_stored"] else None,
+                # Changed documents are re-embedded by a running migration
+                "shadow_embedding_model": None,
+                "is_deleted": False,
+                "deleted_at": None,
+                "created_at": item["created_at"],
+                "updated_at": now,
+            })
+
+            for chunk in item["chunks"]:
+                if chunk["unchanged"]:
+                    moved_chunks.append({"id": chunk["row_id"], "chunk_index": chunk["index"]})
+                    continue
+
+                chunk_row = {
+                    "id": uuid.uuid4(),
+                    "document_id": item["document_id"],
+                    "chunk_index": chunk["index"],
+                    "content": chunk["content"],
+                    "char_count": chunk["char_count"],
+                    "content_hash": chunk["content_hash"],
+                    "position": chunk.get("position"),
+                    "vector_id": chunk["vector_id"] if item["vectors_stored"] else None,
+                    "embedding_status": "completed" if item["vectors_stored"] else "pending",
+                }
+                if vector_store.stores_in_database:
+                    chunk_row["embedding"] = chunk.get("embedding") if item["vectors_stored"] else None
+                chunk_rows.append(chunk_row)
+
+            # Re-embedded chunks may have been upserted under their old vector ID
+            upserted = {
+                chunk["vector_id"] for chunk in item["chunks"]
+            } if item["vectors_stored"] else set()
+
+            for row in item["removed_chunks"]:
+                removed_chunk_ids.append(row.id)
+                if row.vector_id and row.vector_id not in upserted:
+                    removed_vector_ids.append(row.vector_id)
+                if row.vector_id:
+                    # Nothing is upserted to the shadow namespace during a sync
+                    removed_shadow_vector_ids.append(row.vector_id)
+
+        async with context["db_lock"]:
+            try:
+                for rows in self._batched(document_rows):
+                    stmt = pg_insert(Document).values(rows)
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=[Document.data_source_id, Document.external_id],
+                        set_={
+                            column: stmt.excluded[column]
+                            for column in self.DOCUMENT_UPDATE_COLUMNS
+                        } | {
+                            # Keep the previous embedding info if this run failed
+                            column: func.coalesce(stmt.excluded[column], getattr(Document, column))
+                            for column in ("embedding_model", "embedding_created_at")
+                        },
+                    )
+                    await db.execute(stmt)
 
-        # Upsert to Pinecone
-        namespace = str(document.org_id)  # Use org_id as namespace for multi-tenancy
-        await pinecone_service.upsert_vectors(vectors, namespace=namespace)
+                if removed_chunk_ids:
+                    await db.execute(
+                        delete(DocumentChunk).where(DocumentChunk.id.in_(removed_chunk_ids))
+                    )
 
-        # Update document
-        document.embedding_status = "completed"
-        document.embedding_model = "openai-ada-002"
-        document.embedding_created_at = datetime.utcnow()
+                if moved_chunks:
+                    # ORM bulk UPDATE by primary key (executemany)
+                    await db.execute(update(DocumentChunk), moved_chunks)
+
+                for rows in self._batched(chunk_rows):
+                    await db.execute(insert(DocumentChunk).values(rows))
+
+                await db.commit()
+            except Exception:
+                # A failed statement or commit leaves the shared session unusable
+                # until rolled back; later batches of the sync must still work
+                await db.rollback()
+                await db.refresh(data_source)
+                raise
+
+        # Embeddings stored in the database were deleted with their chunk rows
+        if not vector_store.stores_in_database:
+            await self._delete_vectors(context, removed_vector_ids, removed_shadow_vector_ids)
+
+        known = context["known_documents"]
+        for item in items:
+            existing = item["existing"]
+            known[item["doc_data"]["id"]].update(
+                source_updated_at=None if item.get("embedding_error") else item["doc_data"].get("updated_at"),
+                is_deleted=False,
+                title=item["doc_data"].get("title", "Untitled"),
+                url=item["doc_data"].get("url"),
+            )
 
-        await db.commit()
+            item["result"] = {
+                "action": "updated" if existing else "created",
+                "document_id": item["document_id"],
+                "chunks": len(item["chunks"]),
+            }
+
+        return items
+
+    async def _delete_vectors(
+        self,
+        context: Dict[str, Any],
+        vector_ids: List[str],
+        shadow_vector_ids: Optional[List[str]] = None,
+    ):
+        """
+        Delete vectors from the org's namespace and, while an embedding
+        migration runs, from its shadow namespace
+
+        Args:
+            context: Pipeline context
+            vector_ids: Vector IDs to delete from the org's namespace
+            shadow_vector_ids: Vector IDs to delete from the shadow namespace
+                (default: vector_ids)
+        """
+        if vector_ids:
+            await vector_store.delete_vectors(vector_ids, namespace=context["namespace"])
+
+        if shadow_vector_ids is None:
+            shadow_vector_ids = vector_ids
+        if context["shadow_namespace"] and shadow_vector_ids:
+            await vector_store.delete_vectors(
+                shadow_vector_ids,
+                namespace=context["shadow_namespace"],
+            )
 
-        self.logger.info(f"Created and stored {len(vectors)} embeddings")
+    def _batched(self, rows: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Split rows so each multi-row statement stays under the parameter limit"""
+        return [
+            rows[i:i + self.MAX_ROWS_PER_STATEMENT]
+            for i in range(0, len(rows), self.MAX_ROWS_PER_STATEMENT)
+        ]
 
 
 # Create singleton instance
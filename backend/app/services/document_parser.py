@@ -1,10 +1,18 @@
 """
 Document Parser Service
-Supports: PDF, DOCX, PPTX, XLSX, TXT, HTML, MD, JSON, CSV
+Supports: PDF, DOCX, PPTX, XLSX, TXT, HTML, MD, JSON, CSV, EML
 """
+import codecs
 import io
 import logging
-from typing import Dict, Any, Optional
+import mmap
+import os
+import re
+from collections import OrderedDict
+from contextlib import contextmanager
+from email import policy
+from email.parser import BytesParser
+from typing import List, Dict, Any, BinaryIO, Iterable, Iterator, Optional, Tuple, Union
 from pathlib import Path
 
 # Document parsing libraries
@@ -18,11 +26,61 @@ import chardet
 import json
 import csv
 
+from app.core.config import settings
+from app.services.chunker import chunker_service
+from app.services.parser_pool import parser_pool
+
 logger = logging.getLogger(__name__)
 
+# Document content: the file's bytes, or the path of a file on disk
+DocumentSource = Union[bytes, str, Path]
+
 
 class DocumentParserService:
-    """Service for parsing various document formats"""
+    """
+    Service for parsing various document formats
+
+    Parsers return the flattened text as "content" plus an "elements" list
+    following the structure of the file: pages (PDF), slides (PPTX), row
+    groups of sheets (XLSX, CSV), sections (DOCX, Markdown) and messages of
+    an email thread (EML). Documents are given as bytes or as the path of
+    a file (e.g. a spooled download), which is opened or memory-mapped by the
+    parser, so large files are not copied into the worker. Each element is {"text", "position"}, where
+    position locates it in the file, e.g. {"page": 3} or
+    {"sheet": "Q1", "row_start": 2, "row_end": 51}. Chunks never cross
+    element boundaries and carry the element's position.
+    """
+
+    # Table rows per element (each element repeats the header row)
+    ROWS_PER_ELEMENT = 50
+
+    # Markdown (ATX) heading lines, where sections start
+    _MARKDOWN_SECTION_RE = re.compile(r"^(?=#{1,6}[ \t])", re.MULTILINE)
+    _MARKDOWN_HEADING_RE = re.compile(r"#{1,6}[ \t]+(.*)")
+
+    # Start of a quoted earlier message in an email body
+    _EMAIL_QUOTE_RE = re.compile(
+        r"^(?:On\b.{0,200}?\bwrote:[ \t]*$|-{2,}[ \t]*Original Message[ \t]*-{2,}|From:[^\n]*\n(?:Sent|Date):)",
+        re.MULTILINE | re.IGNORECASE,
+    )
+
+    # Byte order marks (UTF-32 LE starts with the UTF-16 LE mark, so it is checked first)
+    _BOMS = (
+        (codecs.BOM_UTF32_LE, "utf-32"),
+        (codecs.BOM_UTF32_BE, "utf-32"),
+        (codecs.BOM_UTF8, "utf-8-sig"),
+        (codecs.BOM_UTF16_LE, "utf-16"),
+        (codecs.BOM_UTF16_BE, "utf-16"),
+    )
+
+    # Charset declared by an HTML document
+    _HTML_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
+
+    # Bytes given to the statistical encoding detector (chardet)
+    ENCODING_SAMPLE_SIZE = 64 * 1024
+
+    # (source, MIME type) pairs whose last detected encoding is remembered
+    ENCODING_HINT_CACHE_SIZE = 4096
 
     # Supported MIME types
     SUPPORTED_MIME_TYPES = {
@@ -43,26 +101,31 @@ class DocumentParserService:
         "message/rfc822": "eml",
     }
 
-    # Maximum file size (50 MB)
-    MAX_FILE_SIZE = 50 * 1024 * 1024
+    # Maximum file size
+    MAX_FILE_SIZE = settings.PARSER_MAX_FILE_SIZE_MB * 1024 * 1024
 
     def __init__(self):
         """Initialize document parser"""
         self.logger = logger
+        # (source id, MIME type) -> encoding of the last text file from that source
+        self._encoding_hints: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
 
     async def parse_document(
         self,
-        content: bytes,
+        content: DocumentSource,
         mime_type: str,
         filename: Optional[str] = None,
+        source_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Parse document and extract text content
 
         Args:
-            content: Document content as bytes
+            content: Document content as bytes, or the path of the file
             mime_type: MIME type of the document
             filename: Optional filename for extension detection
+            source_id: Data source of the document; the encoding detected for
+                its text files is tried first for the next file of the same type
 
         Returns:
             Dict with parsed content and metadata
@@ -70,8 +133,122 @@ class DocumentParserService:
         Raises:
             ValueError: If document type is not supported or parsing fails
         """
+        doc_type = self._check_document(content, mime_type, filename)
+
+        # Parse in a worker process (CPU-bound; must not block the event loop)
+        try:
+            result = await parser_pool.run(
+                _parse_in_worker,
+                doc_type,
+                content,
+                self._get_encoding_hint(source_id, mime_type),
+            )
+            self._remember_encoding(source_id, mime_type, result)
+            return result
+
+        except Exception as e:
+            self.logger.error(f"Error parsing document: {str(e)}", exc_info=True)
+            raise ValueError(f"Failed to parse document: {str(e)}")
+
+    async def parse_and_chunk_document(
+        self,
+        content: DocumentSource,
+        mime_type: str,
+        filename: Optional[str] = None,
+        model: Optional[str] = None,
+        source_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Parse a document and split it into chunks in a worker process
+
+        Only the text and chunks come back from the worker (see
+        parse_and_chunk_sync), instead of the text, elements and chunks.
+
+        Args:
+            content: Document content as bytes, or the path of the file
+            mime_type: MIME type of the document
+            filename: Optional filename for extension detection
+            model: Embedding model whose tokenizer counts tokens
+            source_id: Data source of the document (see parse_document)
+
+        Returns:
+            Dict with parsed content, metadata and chunks
+
+        Raises:
+            ValueError: If document type is not supported or parsing fails
+        """
+        doc_type = self._check_document(content, mime_type, filename)
+
+        try:
+            result = await parser_pool.run(
+                _parse_and_chunk_in_worker,
+                doc_type,
+                content,
+                settings.CHUNK_MAX_TOKENS,
+                settings.CHUNK_OVERLAP_TOKENS,
+                model,
+                self._get_encoding_hint(source_id, mime_type),
+            )
+            self._remember_encoding(source_id, mime_type, result)
+            return result
+
+        except Exception as e:
+            self.logger.error(f"Error parsing document: {str(e)}", exc_info=True)
+            raise ValueError(f"Failed to parse document: {str(e)}")
+
+    def is_supported(self, mime_type: str, filename: Optional[str] = None) -> bool:
+        """
+        Check whether a document can be parsed (before downloading it)
+
+        Args:
+            mime_type: MIME type of the document
+            filename: Optional filename for extension detection
+
+        Returns:
+            True if there is a parser for the document type
+        """
+        return self._get_document_type(mime_type, filename) is not None
+
+    def _get_encoding_hint(self, source_id: Optional[str], mime_type: str) -> Optional[str]:
+        """Encoding of the last text file of this type from the source"""
+        if source_id is None:
+            return None
+
+        key = (source_id, mime_type)
+        hint = self._encoding_hints.get(key)
+        if hint is not None:
+            self._encoding_hints.move_to_end(key)
+        return hint
+
+    def _remember_encoding(self, source_id: Optional[str], mime_type: str, result: Dict[str, Any]):
+        """
+        Store the encoding detected for a text file as the source's hint
+
+        A hint is only tried on a sample that fails strict UTF-8, and it is
+        used when it decodes that sample. Single-byte codecs (windows-1252,
+        latin-1, koi8-r, ...) decode almost any bytes, so such a hint would be
+        used for every later file and chardet would never run again for the
+        source. Those encodings are not remembered and clear the old hint.
+        """
+        encoding = (result.get("metadata") or {}).get("encoding")
+        if source_id is None or not encoding:
+            return
+
+        key = (source_id, mime_type)
+        if not self._rejects_bytes(encoding):
+            self._encoding_hints.pop(key, None)
+            return
+
+        self._encoding_hints[key] = encoding
+        self._encoding_hints.move_to_end(key)
+        while len(self._encoding_hints) > self.ENCODING_HINT_CACHE_SIZE:
+            self._encoding_hints.popitem(last=False)
+
+    def _check_document(self, content: DocumentSource, mime_type: str, filename: Optional[str]) -> str:
+        """Validate size and type of a document and return its type"""
         # Check file size
-        if len(content) > self.MAX_FILE_SIZE:
+        size = len(content) if isinstance(content, bytes) else os.path.getsize(content)
+        if size > self.MAX_FILE_SIZE:
             raise ValueError(f"File size exceeds maximum of {self.MAX_FILE_SIZE} bytes")
 
         # Determine document type
@@ -80,34 +257,49 @@ class DocumentParserService:
         if not doc_type:
             raise ValueError(f"Unsupported document type: {mime_type}")
 
-        self.logger.info(f"Parsing document type: {doc_type}, size: {len(content)} bytes")
+        self.logger.info(f"Parsing document type: {doc_type}, size: {size} bytes")
 
-        # Parse based on type
-        try:
-            if doc_type == "pdf":
-                return await self._parse_pdf(content)
-            elif doc_type == "docx":
-                return await self._parse_docx(content)
-            elif doc_type == "pptx":
-                return await self._parse_pptx(content)
-            elif doc_type == "xlsx":
-                return await self._parse_xlsx(content)
-            elif doc_type == "txt":
-                return await self._parse_text(content)
-            elif doc_type == "html":
-                return await self._parse_html(content)
-            elif doc_type == "md":
-                return await self._parse_markdown(content)
-            elif doc_type == "json":
-                return await self._parse_json(content)
-            elif doc_type == "csv":
-                return await self._parse_csv(content)
-            else:
-                raise ValueError(f"Parser not implemented for type: {doc_type}")
+        return doc_type
 
-        except Exception as e:
-            self.logger.error(f"Error parsing document: {str(e)}", exc_info=True)
-            raise ValueError(f"Failed to parse document: {str(e)}")
+    def parse_sync(
+        self,
+        doc_type: str,
+        content: DocumentSource,
+        encoding_hint: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Parse a document of a known type in the calling thread
+
+        Args:
+            doc_type: Document type (value of SUPPORTED_MIME_TYPES)
+            content: Document content as bytes, or the path of the file
+            encoding_hint: Likely encoding of text formats (see _decode)
+
+        Returns:
+            Dict with parsed content and metadata
+        """
+        if doc_type == "pdf":
+            return self._parse_pdf(content)
+        elif doc_type == "docx":
+            return self._parse_docx(content)
+        elif doc_type == "pptx":
+            return self._parse_pptx(content)
+        elif doc_type == "xlsx":
+            return self._parse_xlsx(content)
+        elif doc_type == "txt":
+            return self._parse_text(content, encoding_hint)
+        elif doc_type == "html":
+            return self._parse_html(content, encoding_hint)
+        elif doc_type == "md":
+            return self._parse_markdown(content, encoding_hint)
+        elif doc_type == "json":
+            return self._parse_json(content, encoding_hint)
+        elif doc_type == "csv":
+            return self._parse_csv(content, encoding_hint)
+        elif doc_type == "eml":
+            return self._parse_eml(content)
+        else:
+            raise ValueError(f"Parser not implemented for type: {doc_type}")
 
     def _get_document_type(self, mime_type: str, filename: Optional[str] = None) -> Optional[str]:
         """Determine document type from MIME type or filename"""
@@ -119,53 +311,199 @@ class DocumentParserService:
         # Try filename extension
         if filename:
             ext = Path(filename).suffix.lower().lstrip(".")
-            if ext in ["pdf", "docx", "pptx", "xlsx", "txt", "html", "md", "json", "csv"]:
+            if ext in ["pdf", "docx", "pptx", "xlsx", "txt", "html", "md", "json", "csv", "eml"]:
                 return ext
 
         return None
 
-    async def _parse_pdf(self, content: bytes) -> Dict[str, Any]:
-        """Parse PDF document"""
-        pdf_file = io.BytesIO(content)
-        reader = pypdf.PdfReader(pdf_file)
+    @staticmethod
+    @contextmanager
+    def _open_source(content: DocumentSource) -> Iterator[BinaryIO]:
+        """Binary file object over document bytes or a file on disk"""
+        if isinstance(content, bytes):
+            yield io.BytesIO(content)
+        else:
+            with open(content, "rb") as file:
+                yield file
+
+    @staticmethod
+    @contextmanager
+    def _map_source(content: DocumentSource) -> Iterator[Union[bytes, mmap.mmap]]:
+        """Document content as a buffer: the bytes, or the file memory-mapped"""
+        if isinstance(content, bytes):
+            yield content
+            return
+
+        with open(content, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                # Empty files cannot be mapped
+                yield b""
+                return
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
+    def _decode(
+        self,
+        content: DocumentSource,
+        errors: str = "ignore",
+        encoding_hint: Optional[str] = None,
+        html: bool = False,
+    ) -> Tuple[str, str]:
+        """
+        Decode text content, detecting its encoding in tiers
 
-        # Extract text from all pages
-        text_parts = []
-        for page in reader.pages:
-            text = page.extract_text()
-            if text:
-                text_parts.append(text)
+        1. A byte order mark decides the encoding.
+        2. Strict UTF-8 (which includes ASCII): the decode is the validation,
+           so valid UTF-8 costs a single pass and no detection at all.
+        3. Otherwise a sample is taken (the start of the content and the text
+           around the first byte that is not UTF-8) and the first of these
+           that decodes the sample strictly is used: the charset declared by
+           an HTML document, then encoding_hint.
+        4. Failing that, chardet runs on the sample only.
 
-        full_text = "\n\n".join(text_parts)
+        Args:
+            content: Document content as bytes, or the path of the file
+            errors: Error handling of the decoder
+            encoding_hint: Encoding of earlier files from the same source
+            html: Look for a charset declared in a meta tag
 
-        # Get metadata
-        metadata = {}
-        if reader.metadata:
-            metadata = {
-                "title": reader.metadata.get("/Title"),
-                "author": reader.metadata.get("/Author"),
-                "subject": reader.metadata.get("/Subject"),
-                "creator": reader.metadata.get("/Creator"),
-                "producer": reader.metadata.get("/Producer"),
-                "creation_date": reader.metadata.get("/CreationDate"),
-            }
+        Returns:
+            Tuple of (text, encoding)
+        """
+        with self._map_source(content) as data:
+            for bom, encoding in self._BOMS:
+                if data[:len(bom)] == bom:
+                    return str(data, encoding, errors), encoding
+
+            try:
+                return str(data, "utf-8"), "utf-8"
+            except UnicodeDecodeError as e:
+                sample = self._encoding_sample(data, e.start)
+
+            candidates = []
+            if html:
+                declared = self._HTML_CHARSET_RE.search(sample, 0, 4096)
+                if declared:
+                    candidates.append(declared.group(1).decode("ascii"))
+            if encoding_hint:
+                candidates.append(encoding_hint)
+
+            encoding = next(
+                (candidate for candidate in candidates if self._decodes(sample, candidate)),
+                None,
+            )
+            if encoding is None:
+                encoding = chardet.detect(sample)["encoding"] or "utf-8"
+
+            return str(data, encoding, errors), encoding
+
+    def _encoding_sample(self, data: Union[bytes, mmap.mmap], invalid_at: int) -> bytes:
+        """Start of the content plus the lines around its first non-UTF-8 byte"""
+        size = self.ENCODING_SAMPLE_SIZE
+        if invalid_at < size // 2:
+            return data[:size]
+
+        # Start at a line break so a multi-byte character is not cut in half
+        start = data.rfind(b"\n", max(invalid_at - 1024, 0), invalid_at) + 1 or invalid_at
+        return data[:size // 2] + b"\n" + data[start:start + size // 2]
+
+    @staticmethod
+    def _rejects_bytes(encoding: str) -> bool:
+        """
+        Whether the encoding rejects enough input to be checked by decoding
 
-        return {
-            "content": full_text,
-            "word_count": len(full_text.split()),
-            "char_count": len(full_text),
-            "page_count": len(reader.pages),
-            "metadata": metadata,
-        }
+        True for UTF-8 and multi-byte codecs, which decode few or none of the
+        high bytes 0x80-0xFF on their own (Shift_JIS: 63); False for
+        single-byte codecs, which decode all or nearly all of them.
+        """
+        try:
+            decoder = codecs.getincrementaldecoder(encoding)
+        except LookupError:
+            return False
+
+        decoded = 0
+        for byte in range(0x80, 0x100):
+            try:
+                decoder().decode(bytes((byte,)), final=True)
+                decoded += 1
+            except UnicodeDecodeError:
+                pass
+        return decoded < 96
+
+    @staticmethod
+    def _decodes(sample: bytes, encoding: str) -> bool:
+        """Whether the sample is valid in the encoding (cut-off last character allowed)"""
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return True
+        except (LookupError, UnicodeDecodeError):
+            return False
+
+    def _parse_pdf(self, content: DocumentSource) -> Dict[str, Any]:
+        """Parse PDF document"""
+        info: Dict[str, Any] = {}
+        elements = list(self._iter_pdf(content, info))
 
-    async def _parse_docx(self, content: bytes) -> Dict[str, Any]:
+        return self._element_result(elements, info)
+
+    def _iter_pdf(self, content: DocumentSource, info: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield one element per PDF page, extracting text a page at a time
+
+        Args:
+            content: PDF content as bytes, or the path of the file
+            info: Filled with page_count and metadata
+        """
+        with self._open_source(content) as pdf_file:
+            # Objects are read from the file as pages are extracted
+            reader = pypdf.PdfReader(pdf_file)
+
+            # Get metadata
+            metadata = {}
+            if reader.metadata:
+                metadata = {
+                    "title": reader.metadata.get("/Title"),
+                    "author": reader.metadata.get("/Author"),
+                    "subject": reader.metadata.get("/Subject"),
+                    "creator": reader.metadata.get("/Creator"),
+                    "producer": reader.metadata.get("/Producer"),
+                    "creation_date": reader.metadata.get("/CreationDate"),
+                }
+            info["page_count"] = len(reader.pages)
+            info["metadata"] = metadata
+
+            for page_number, page in enumerate(reader.pages, start=1):
+                text = page.extract_text()
+                if text:
+                    yield {"text": text, "position": {"page": page_number}}
+
+    def _parse_docx(self, content: DocumentSource) -> Dict[str, Any]:
         """Parse DOCX document"""
-        docx_file = io.BytesIO(content)
-        doc = DocxDocument(docx_file)
+        with self._open_source(content) as docx_file:
+            doc = DocxDocument(docx_file)
 
-        # Extract text from paragraphs
-        text_parts = [paragraph.text for paragraph in doc.paragraphs if paragraph.text.strip()]
-        full_text = "\n\n".join(text_parts)
+        # Extract text from paragraphs, split into sections at headings
+        elements = []
+        section = None
+        section_parts: List[str] = []
+        for paragraph in doc.paragraphs:
+            if not paragraph.text.strip():
+                continue
+
+            style = paragraph.style.name if paragraph.style is not None else ""
+            if style.startswith(("Heading", "Title")):
+                if section_parts:
+                    elements.append(self._section_element(section, section_parts))
+                    section_parts = []
+                section = paragraph.text.strip()
+
+            section_parts.append(paragraph.text)
+
+        if section_parts:
+            elements.append(self._section_element(section, section_parts))
+
+        full_text = self._join_elements(elements)
 
         # Get metadata
         metadata = {
@@ -182,21 +520,26 @@ class DocumentParserService:
             "char_count": len(full_text),
             "paragraph_count": len(doc.paragraphs),
             "metadata": metadata,
+            "elements": elements,
         }
 
-    async def _parse_pptx(self, content: bytes) -> Dict[str, Any]:
+    def _parse_pptx(self, content: DocumentSource) -> Dict[str, Any]:
         """Parse PPTX presentation"""
-        pptx_file = io.BytesIO(content)
-        prs = Presentation(pptx_file)
+        with self._open_source(content) as pptx_file:
+            prs = Presentation(pptx_file)
 
         # Extract text from all slides
-        text_parts = []
-        for slide in prs.slides:
-            for shape in slide.shapes:
-                if hasattr(shape, "text") and shape.text.strip():
-                    text_parts.append(shape.text)
-
-        full_text = "\n\n".join(text_parts)
+        elements = []
+        for slide_number, slide in enumerate(prs.slides, start=1):
+            text_parts = [
+                shape.text
+                for shape in slide.shapes
+                if hasattr(shape, "text") and shape.text.strip()
+            ]
+            if text_parts:
+                elements.append({"text": "\n\n".join(text_parts), "position": {"slide": slide_number}})
+
+        full_text = self._join_elements(elements)
 
         # Get metadata
         metadata = {
@@ -212,63 +555,70 @@ class DocumentParserService:
             "char_count": len(full_text),
             "slide_count": len(prs.slides),
             "metadata": metadata,
+            "elements": elements,
         }
 
-    async def _parse_xlsx(self, content: bytes) -> Dict[str, Any]:
+    def _parse_xlsx(self, content: DocumentSource) -> Dict[str, Any]:
         """Parse XLSX spreadsheet"""
-        xlsx_file = io.BytesIO(content)
-        wb = load_workbook(xlsx_file, data_only=True)
-
-        # Extract text from all sheets
-        text_parts = []
-        for sheet in wb.worksheets:
-            sheet_text = []
-            for row in sheet.iter_rows(values_only=True):
-                row_text = [str(cell) for cell in row if cell is not None]
-                if row_text:
-                    sheet_text.append(" | ".join(row_text))
+        info: Dict[str, Any] = {}
+        elements = list(self._iter_xlsx(content, info))
 
-            if sheet_text:
-                text_parts.append(f"Sheet: {sheet.title}\n" + "\n".join(sheet_text))
+        return self._element_result(elements, info)
 
-        full_text = "\n\n".join(text_parts)
+    def _iter_xlsx(self, content: DocumentSource, info: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield groups of rows of all sheets, streaming rows from the workbook
 
-        metadata = {
-            "sheet_count": len(wb.worksheets),
-            "sheet_names": [sheet.title for sheet in wb.worksheets],
-        }
+        The workbook is opened in read-only mode, so rows are read from the
+        XML as they are iterated instead of building the whole object model.
 
-        return {
-            "content": full_text,
-            "word_count": len(full_text.split()),
-            "char_count": len(full_text),
-            "metadata": metadata,
-        }
-
-    async def _parse_text(self, content: bytes) -> Dict[str, Any]:
+        Args:
+            content: XLSX content as bytes, or the path of the file
+            info: Filled with metadata
+        """
+        # Passed as a file object: openpyxl rejects paths without an .xlsx suffix
+        with self._open_source(content) as xlsx_file:
+            wb = load_workbook(xlsx_file, read_only=True, data_only=True)
+
+            try:
+                info["metadata"] = {
+                    "sheet_count": len(wb.worksheets),
+                    "sheet_names": wb.sheetnames,
+                }
+
+                for sheet in wb.worksheets:
+                    rows = (
+                        (row_number, " | ".join(str(cell) for cell in row if cell is not None))
+                        for row_number, row in enumerate(sheet.iter_rows(values_only=True), start=1)
+                    )
+                    yield from self._iter_row_elements(
+                        ((row_number, line) for row_number, line in rows if line),
+                        f"Sheet: {sheet.title}",
+                        {"sheet": sheet.title},
+                    )
+            finally:
+                wb.close()
+
+    def _parse_text(self, content: DocumentSource, encoding_hint: Optional[str] = None) -> Dict[str, Any]:
         """Parse plain text document"""
-        # Detect encoding
-        detection = chardet.detect(content)
-        encoding = detection["encoding"] or "utf-8"
-
-        # Decode text
-        text = content.decode(encoding, errors="ignore")
+        # Detect encoding and decode text
+        text, encoding = self._decode(content, encoding_hint=encoding_hint)
 
         return {
             "content": text,
             "word_count": len(text.split()),
             "char_count": len(text),
             "metadata": {"encoding": encoding},
+            "elements": [{"text": text, "position": None}],
         }
 
-    async def _parse_html(self, content: bytes) -> Dict[str, Any]:
+    def _parse_html(self, content: DocumentSource, encoding_hint: Optional[str] = None) -> Dict[str, Any]:
         """Parse HTML document"""
-        # Detect encoding
-        detection = chardet.detect(content)
-        encoding = detection["encoding"] or "utf-8"
+        # Detect encoding and decode
+        html_text, encoding = self._decode(content, encoding_hint=encoding_hint, html=True)
 
         # Parse HTML
-        soup = BeautifulSoup(content, "lxml")
+        soup = BeautifulSoup(html_text, "lxml")
 
         # Remove script and style tags
         for script in soup(["script", "style"]):
@@ -288,37 +638,46 @@ class DocumentParserService:
                 "title": title,
                 "encoding": encoding,
             },
+            "elements": [{"text": text, "position": None}],
         }
 
-    async def _parse_markdown(self, content: bytes) -> Dict[str, Any]:
+    def _parse_markdown(self, content: DocumentSource, encoding_hint: Optional[str] = None) -> Dict[str, Any]:
         """Parse Markdown document"""
-        # Detect encoding
-        detection = chardet.detect(content)
-        encoding = detection["encoding"] or "utf-8"
-
-        # Decode markdown
-        md_text = content.decode(encoding, errors="ignore")
-
-        # Convert to HTML and extract text
-        html = markdown.markdown(md_text)
-        soup = BeautifulSoup(html, "lxml")
-        text = soup.get_text(separator="\n", strip=True)
+        # Detect encoding and decode markdown
+        md_text, encoding = self._decode(content, encoding_hint=encoding_hint)
+
+        # Convert each section to HTML and extract text
+        elements = []
+        for section in self._MARKDOWN_SECTION_RE.split(md_text):
+            html = markdown.markdown(section)
+            soup = BeautifulSoup(html, "lxml")
+            section_text = soup.get_text(separator="\n", strip=True)
+            if not section_text:
+                continue
+
+            heading = self._MARKDOWN_HEADING_RE.match(section)
+            elements.append({
+                "text": section_text,
+                "position": {"section": heading.group(1).strip()} if heading else None,
+            })
+
+        text = self._join_elements(elements)
 
         return {
             "content": text,
             "word_count": len(text.split()),
             "char_count": len(text),
             "metadata": {"encoding": encoding},
+            "elements": elements,
         }
 
-    async def _parse_json(self, content: bytes) -> Dict[str, Any]:
+    def _parse_json(self, content: DocumentSource, encoding_hint: Optional[str] = None) -> Dict[str, Any]:
         """Parse JSON document"""
-        # Detect encoding
-        detection = chardet.detect(content)
-        encoding = detection["encoding"] or "utf-8"
+        # Detect encoding and decode
+        json_text, encoding = self._decode(content, errors="strict", encoding_hint=encoding_hint)
 
         # Parse JSON
-        json_data = json.loads(content.decode(encoding))
+        json_data = json.loads(json_text)
 
         # Convert to readable text
         text = json.dumps(json_data, indent=2)
@@ -328,25 +687,26 @@ class DocumentParserService:
             "word_count": len(text.split()),
             "char_count": len(text),
             "metadata": {"encoding": encoding},
+            "elements": [{"text": text, "position": None}],
         }
 
-    async def _parse_csv(self, content: bytes) -> Dict[str, Any]:
+    def _parse_csv(self, content: DocumentSource, encoding_hint: Optional[str] = None) -> Dict[str, Any]:
         """Parse CSV document"""
-        # Detect encoding
-        detection = chardet.detect(content)
-        encoding = detection["encoding"] or "utf-8"
+        # Detect encoding and decode
+        csv_text, encoding = self._decode(content, encoding_hint=encoding_hint)
 
         # Parse CSV
-        csv_text = content.decode(encoding, errors="ignore")
         csv_reader = csv.reader(io.StringIO(csv_text))
 
-        # Convert to text
-        rows = []
-        for row in csv_reader:
-            if row:
-                rows.append(" | ".join(row))
+        # Convert to text in groups of rows
+        rows = [
+            (row_number, " | ".join(row))
+            for row_number, row in enumerate(csv_reader, start=1)
+            if row
+        ]
+        elements = list(self._iter_row_elements(rows, None, {}))
 
-        text = "\n".join(rows)
+        text = self._join_elements(elements)
 
         return {
             "content": text,
@@ -356,71 +716,261 @@ class DocumentParserService:
                 "encoding": encoding,
                 "row_count": len(rows),
             },
+            "elements": elements,
         }
 
     def chunk_text(
         self,
         text: str,
-        chunk_size: int = 1000,
-        overlap: int = 200,
+        max_tokens: Optional[int] = None,
+        overlap_tokens: Optional[int] = None,
+        model: Optional[str] = None,
     ) -> list[Dict[str, Any]]:
         """
-        Split text into overlapping chunks for better vector search
+        Split text into overlapping token-sized chunks for vector search
 
         Args:
             text: Text to chunk
-            chunk_size: Maximum characters per chunk
-            overlap: Number of characters to overlap between chunks
+            max_tokens: Maximum tokens per chunk (default: CHUNK_MAX_TOKENS)
+            overlap_tokens: Tokens repeated from the previous chunk
+            model: Embedding model whose tokenizer counts tokens
 
         Returns:
-            List of chunks with metadata
+            List of chunks with metadata (see ChunkerService.iter_chunks)
+        """
+        return list(chunker_service.iter_chunks(text, max_tokens, overlap_tokens, model))
+
+    def chunk_document(
+        self,
+        parsed: Dict[str, Any],
+        max_tokens: Optional[int] = None,
+        overlap_tokens: Optional[int] = None,
+        model: Optional[str] = None,
+    ) -> list[Dict[str, Any]]:
         """
-        chunks = []
-
-        # If text is smaller than chunk size, return as single chunk
-        if len(text) <= chunk_size:
-            return [{
-                "index": 0,
-                "content": text,
-                "char_count": len(text),
-            }]
-
-        # Split into chunks with overlap
-        start = 0
-        index = 0
-
-        while start < len(text):
-            end = min(start + chunk_size, len(text))
-
-            # Try to break at sentence or word boundary
-            if end < len(text):
-                # Look for sentence end
-                for delimiter in [".", "!", "?", "\n"]:
-                    last_delimiter = text[start:end].rfind(delimiter)
-                    if last_delimiter > chunk_size * 0.5:  # At least 50% of chunk size
-                        end = start + last_delimiter + 1
-                        break
-                else:
-                    # Look for word boundary
-                    last_space = text[start:end].rfind(" ")
-                    if last_space > chunk_size * 0.5:
-                        end = start + last_space + 1
-
-            chunk_text = text[start:end].strip()
-
-            if chunk_text:
-                chunks.append({
-                    "index": index,
-                    "content": chunk_text,
-                    "char_count": len(chunk_text),
-                })
-                index += 1
-
-            # Move to next chunk with overlap
-            start = end - overlap if end < len(text) else end
-
-        return chunks
+        Chunk parsed content along its element boundaries
+
+        Args:
+            parsed: Parsed content (from parse_document, or with content only)
+            max_tokens: Maximum tokens per chunk (default: CHUNK_MAX_TOKENS)
+            overlap_tokens: Tokens repeated from the previous chunk
+            model: Embedding model whose tokenizer counts tokens
+
+        Returns:
+            List of chunks with metadata and position
+        """
+        elements = parsed.get("elements") or [{"text": parsed["content"], "position": None}]
+        return list(chunker_service.iter_element_chunks(elements, max_tokens, overlap_tokens, model))
+
+    def parse_and_chunk_sync(
+        self,
+        doc_type: str,
+        content: DocumentSource,
+        max_tokens: Optional[int] = None,
+        overlap_tokens: Optional[int] = None,
+        model: Optional[str] = None,
+        encoding_hint: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Parse a document and chunk it in one pass, in the calling thread
+
+        PDF pages and spreadsheet rows are streamed into the chunker as they
+        are extracted; no element list or parsed object model of the whole
+        file is kept.
+
+        Args:
+            doc_type: Document type (value of SUPPORTED_MIME_TYPES)
+            content: Document content as bytes, or the path of the file
+            max_tokens: Maximum tokens per chunk (default: CHUNK_MAX_TOKENS)
+            overlap_tokens: Tokens repeated from the previous chunk
+            model: Embedding model whose tokenizer counts tokens
+            encoding_hint: Likely encoding of text formats (see _decode)
+
+        Returns:
+            Parse result (without elements) plus "chunks"
+        """
+        streams = {"pdf": self._iter_pdf, "xlsx": self._iter_xlsx}
+
+        if doc_type in streams:
+            info: Dict[str, Any] = {}
+            elements = streams[doc_type](content, info)
+        else:
+            info = self.parse_sync(doc_type, content, encoding_hint)
+            elements = info.pop("elements")
+            del info["content"], info["word_count"], info["char_count"]
+
+        parts: List[str] = []
+        word_count = 0
+
+        def collect(elements):
+            nonlocal word_count
+            for element in elements:
+                parts.append(element["text"])
+                word_count += len(element["text"].split())
+                yield element
+
+        chunks = list(chunker_service.iter_element_chunks(
+            collect(elements), max_tokens, overlap_tokens, model
+        ))
+        full_text = "\n\n".join(parts)
+
+        return {
+            "content": full_text,
+            "word_count": word_count,
+            "char_count": len(full_text),
+            **info,
+            "chunks": chunks,
+        }
+
+    def _parse_eml(self, content: DocumentSource) -> Dict[str, Any]:
+        """Parse email message (one element per message of the quoted thread)"""
+        with self._open_source(content) as eml_file:
+            message = BytesParser(policy=policy.default).parse(eml_file)
+
+        # Prefer the plain text body
+        body = ""
+        body_part = message.get_body(preferencelist=("plain", "html"))
+        if body_part is not None:
+            body = body_part.get_content().replace("\r\n", "\n")
+            if body_part.get_content_type() == "text/html":
+                body = BeautifulSoup(body, "lxml").get_text(separator="\n", strip=True)
+
+        headers = "\n".join(
+            f"{name}: {message[name]}"
+            for name in ("From", "To", "Cc", "Date", "Subject")
+            if message[name]
+        )
+
+        # Newest message first, then the earlier messages quoted below it
+        starts = [0] + [match.start() for match in self._EMAIL_QUOTE_RE.finditer(body)]
+        elements = []
+        for number, (start, end) in enumerate(zip(starts, starts[1:] + [len(body)]), start=1):
+            text = "\n".join(line.lstrip("> ") for line in body[start:end].splitlines()).strip()
+            if number == 1:
+                text = f"{headers}\n\n{text}".strip()
+            if text:
+                elements.append({"text": text, "position": {"message": number}})
+
+        full_text = self._join_elements(elements)
+
+        metadata = {
+            "subject": message["Subject"],
+            "from": message["From"],
+            "to": message["To"],
+            "date": message["Date"],
+            "message_id": message["Message-ID"],
+            "attachments": [part.get_filename() for part in message.iter_attachments()],
+        }
+
+        return {
+            "content": full_text,
+            "word_count": len(full_text.split()),
+            "char_count": len(full_text),
+            "message_count": len(elements),
+            "metadata": metadata,
+            "elements": elements,
+        }
+
+    def _iter_row_elements(
+        self,
+        rows: Iterable[Tuple[int, str]],
+        heading: Optional[str],
+        position: Dict[str, Any],
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Group table rows into elements of ROWS_PER_ELEMENT rows
+
+        The first row is taken as the header and repeated in every group.
+
+        Args:
+            rows: (row number, row text) pairs of non-empty rows
+            heading: Optional line starting every group (e.g. the sheet name)
+            position: Position shared by all groups (row range is added)
+
+        Yields:
+            Elements, as soon as their rows have been read
+        """
+        header = None
+        group: List[Tuple[int, str]] = []
+        emitted = False
+
+        for row in rows:
+            if header is None:
+                header = row
+                continue
+
+            group.append(row)
+            if len(group) == self.ROWS_PER_ELEMENT:
+                yield self._rows_element(heading, header, group, position)
+                group = []
+                emitted = True
+
+        if group or (header and not emitted):
+            yield self._rows_element(heading, header, group, position)
+
+    @staticmethod
+    def _rows_element(
+        heading: Optional[str],
+        header: Tuple[int, str],
+        group: List[Tuple[int, str]],
+        position: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Element for a group of table rows below the header row"""
+        lines = ([heading] if heading else []) + [header[1]] + [line for _, line in group]
+        rows = group or [header]
+        return {
+            "text": "\n".join(lines),
+            "position": {**position, "row_start": rows[0][0], "row_end": rows[-1][0]},
+        }
+
+    @staticmethod
+    def _section_element(title: Optional[str], parts: List[str]) -> Dict[str, Any]:
+        """Element for a document section (paragraphs below a heading)"""
+        return {
+            "text": "\n\n".join(parts),
+            "position": {"section": title} if title else None,
+        }
+
+    @staticmethod
+    def _join_elements(elements: List[Dict[str, Any]]) -> str:
+        """Flattened text of all elements"""
+        return "\n\n".join(element["text"] for element in elements)
+
+    def _element_result(self, elements: List[Dict[str, Any]], info: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse result for elements read from a stream (see _iter_pdf)"""
+        full_text = self._join_elements(elements)
+
+        return {
+            "content": full_text,
+            "word_count": len(full_text.split()),
+            "char_count": len(full_text),
+            **info,
+            "elements": elements,
+        }
 
 
 # Create singleton instance
 document_parser_service = DocumentParserService()
+
+
+def _parse_in_worker(
+    doc_type: str,
+    content: DocumentSource,
+    encoding_hint: Optional[str],
+) -> Dict[str, Any]:
+    """Parser pool entry point (module-level so it can be pickled)"""
+    return document_parser_service.parse_sync(doc_type, content, encoding_hint)
+
+
+def _parse_and_chunk_in_worker(
+    doc_type: str,
+    content: DocumentSource,
+    max_tokens: int,
+    overlap_tokens: int,
+    model: Optional[str],
+    encoding_hint: Optional[str],
+) -> Dict[str, Any]:
+    """Parser pool entry point for parsing and chunking"""
+    return document_parser_service.parse_and_chunk_sync(
+        doc_type, content, max_tokens, overlap_tokens, model, encoding_hint
+    )
@@ -0,0 +1,155 @@
+"""
+Embedding Batcher
+Coalesces chunks from many documents into full embedding requests
+"""
+import asyncio
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+from app.core.config import settings
+from app.services.embeddings import embeddings_service
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    """
+    Sync-wide micro-batcher for embedding requests
+
+    Callers submit the chunk texts of a single document and await their
+    vectors. Texts from all concurrent callers are packed into one request
+    until the model's input count or token budget is reached, or until
+    max_wait_seconds passes without the batch filling up. Results are fanned
+    back to each caller in submission order.
+    """
+
+    def __init__(
+        self,
+        model: str = embeddings_service.DEFAULT_MODEL,
+        max_wait_seconds: float = settings.EMBEDDING_BATCH_MAX_WAIT_MS / 1000,
+        max_concurrent_requests: int = settings.EMBEDDING_BATCH_CONCURRENCY,
+    ):
+        """
+        Initialize batcher
+
+        Args:
+            model: Embedding model to use
+            max_wait_seconds: How long a partial batch may wait for more texts
+            max_concurrent_requests: Maximum in-flight provider requests
+        """
+        self.logger = logger
+        self.model = model
+        self.model_key = embeddings_service.get_model_key(model)
+
+        model_config = embeddings_service.get_model_info(model)
+        self.max_batch_inputs = model_config["max_batch_inputs"]
+        self.max_batch_tokens = model_config["max_batch_tokens"]
+        self.max_wait_seconds = max_wait_seconds
+
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrent_requests))
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._pending_tokens = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._in_flight: set = set()
+
+        # Statistics
+        self.requests_sent = 0
+        self.texts_embedded = 0
+
+    async def embed(
+        self,
+        texts: List[str],
+        token_counts: Optional[List[int]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Embed texts as part of the next shared batches
+
+        Args:
+            texts: Texts to embed (typically the chunks of one document)
+            token_counts: Token counts of the texts with this model's tokenizer,
+                if already known (chunks carry them); otherwise counted here
+
+        Returns:
+            List of embedding results, in the same order as texts
+        """
+        if token_counts is None:
+            token_counts = [embeddings_service.count_tokens(text, self.model) for text in texts]
+
+        futures = [self._submit(text, tokens) for text, tokens in zip(texts, token_counts)]
+        return list(await asyncio.gather(*futures))
+
+    async def close(self):
+        """Flush any partial batch and wait for in-flight requests"""
+        self._flush()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+        self.logger.info(
+            f"Embedding batcher sent {self.requests_sent} requests "
+            f"for {self.texts_embedded} texts"
+        )
+
+    def _submit(self, text: str, tokens: int) -> asyncio.Future:
+        """Add a text with its token count to the pending batch"""
+        future = asyncio.get_running_loop().create_future()
+
+        # Flush first if this text would not fit into the pending batch
+        if self._pending and self._pending_tokens + tokens > self.max_batch_tokens:
+            self._flush()
+
+        self._pending.append((text, future))
+        self._pending_tokens += tokens
+
+        if (
+            len(self._pending) >= self.max_batch_inputs
+            or self._pending_tokens >= self.max_batch_tokens
+        ):
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.max_wait_seconds,
+                self._flush,
+            )
+
+        return future
+
+    def _flush(self):
+        """Send the pending batch"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._pending:
+            return
+
+        batch = self._pending
+        self._pending = []
+        self._pending_tokens = 0
+
+        task = asyncio.create_task(self._send(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _send(self, batch: List[Tuple[str, asyncio.Future]]):
+        """Embed a batch and resolve the waiting futures"""
+        texts = [text for text, _ in batch]
+
+        async with self._semaphore:
+            try:
+                results = await embeddings_service.create_embeddings_batch(
+                    texts,
+                    model=self.model,
+                    batch_size=len(texts),
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+        self.requests_sent += 1
+        self.texts_embedded += len(texts)
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,311 @@
+"""
+Embedding Cache
+Content-hash cache of embedding vectors with a local and an optional Redis tier
+"""
+import hashlib
+import logging
+import re
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Cache of embedding vectors keyed by (model, sha256 of normalized text)
+
+    Vectors are stored as packed float32 bytes. The local tier is an
+    in-process LRU bounded by total size in bytes; the optional Redis tier
+    (REDIS_URL) is shared across processes and survives restarts. Redis
+    errors are logged and treated as misses so the cache can never break
+    embedding generation.
+    """
+
+    KEY_PREFIX = "embedding:"
+
+    _WHITESPACE_RE = re.compile(r"\s+")
+
+    def __init__(
+        self,
+        max_bytes: int = settings.EMBEDDING_CACHE_MAX_BYTES,
+        redis_url: Optional[str] = None,
+        ttl_seconds: int = settings.EMBEDDING_CACHE_TTL_SECONDS,
+    ):
+        """
+        Initialize embedding cache
+
+        Args:
+            max_bytes: Maximum size of the local tier
+            redis_url: Redis URL for the shared tier (None to disable)
+            ttl_seconds: Expiry of Redis entries
+        """
+        self.logger = logger
+        self.max_bytes = max_bytes
+        self.redis_url = redis_url
+        self.ttl_seconds = ttl_seconds
+
+        self._local: "OrderedDict[str, bytes]" = OrderedDict()
+        self._local_bytes = 0
+        self._redis = None
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def normalize_text(cls, text: str) -> str:
+        """Normalize text so trivially different chunks share a cache entry"""
+        text = unicodedata.normalize("NFC", text)
+        return cls._WHITESPACE_RE.sub(" ", text).strip()
+
+    @classmethod
+    def make_key(cls, model: str, text: str) -> str:
+        """Build cache key for a model and text"""
+        digest = hashlib.sha256(cls.normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{cls.KEY_PREFIX}{model}:{digest}"
+
+    async def get_many(self, model: str, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Look up cached vectors
+
+        Args:
+            model: Embedding model name
+            texts: Texts to look up
+
+        Returns:
+            List aligned with texts, None for misses
+        """
+        keys = [self.make_key(model, text) for text in texts]
+        results: List[Optional[List[float]]] = [None] * len(keys)
+
+        redis_lookups: Dict[str, List[int]] = {}
+        for i, key in enumerate(keys):
+            packed = self._local_get(key)
+            if packed is not None:
+                results[i] = self._unpack(packed)
+            else:
+                redis_lookups.setdefault(key, []).append(i)
+
+        if redis_lookups:
+            for key, packed in (await self._redis_get_many(list(redis_lookups))).items():
+                self._local_set(key, packed)
+                for i in redis_lookups[key]:
+                    results[i] = self._unpack(packed)
+
+        found = sum(1 for result in results if result is not None)
+        self.hits += found
+        self.misses += len(results) - found
+
+        return results
+
+    async def set_many(
+        self,
+        model: str,
+        texts: List[str],
+        embeddings: List[List[float]],
+    ):
+        """
+        Store vectors
+
+        Args:
+            model: Embedding model name
+            texts: Texts that were embedded
+            embeddings: Vectors aligned with texts
+        """
+        entries = {
+            self.make_key(model, text): self._pack(embedding)
+            for text, embedding in zip(texts, embeddings)
+        }
+
+        for key, packed in entries.items():
+            self._local_set(key, packed)
+
+        await self._redis_set_many(entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "local_entries": len(self._local),
+            "local_bytes": self._local_bytes,
+            "redis_enabled": self.redis_url is not None,
+        }
+
+    def _local_get(self, key: str) -> Optional[bytes]:
+        """Get entry from the local tier and mark it recently used"""
+        packed = self._local.get(key)
+        if packed is not None:
+            self._local.move_to_end(key)
+        return packed
+
+    def _local_set(self, key: str, packed: bytes):
+        """Put entry into the local tier, evicting least recently used entries"""
+        if len(packed) > self.max_bytes:
+            return
+
+        previous = self._local.pop(key, None)
+        if previous is not None:
+            self._local_bytes -= len(previous)
+
+        self._local[key] = packed
+        self._local_bytes += len(packed)
+
+        while self._local_bytes > self.max_bytes:
+            _, evicted = self._local.popitem(last=False)
+            self._local_bytes -= len(evicted)
+
+    def _get_redis(self):
+        """Lazily create the Redis client"""
+        if self._redis is None and self.redis_url:
+            self._redis = aioredis.from_url(self.redis_url)
+        return self._redis
+
+    async def _redis_get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        """Get entries from Redis (missing keys are omitted)"""
+        client = self._get_redis()
+        if client is None:
+            return {}
+
+        try:
+            values = await client.mget(keys)
+        except Exception as e:
+            self.logger.warning(f"Embedding cache Redis lookup failed: {str(e)}")
+            return {}
+
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    async def _redis_set_many(self, entries: Dict[str, bytes]):
+        """Store entries in Redis"""
+        client = self._get_redis()
+        if client is None or not entries:
+            return
+
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for key, packed in entries.items():
+                    pipe.set(key, packed, ex=self.ttl_seconds)
+                await pipe.execute()
+        except Exception as e:
+            self.logger.warning(f"Embedding cache Redis write failed: {str(e)}")
+
+    @staticmethod
+    def _pack(embedding: List[float]) -> bytes:
+        """Pack vector as float32 bytes"""
+        return array("f", embedding).tobytes()
+
+    @staticmethod
+    def _unpack(packed: bytes) -> List[float]:
+        """Unpack float32 bytes into a vector"""
+        values = array("f")
+        values.frombytes(packed)
+        return values.tolist()
+
+
+class QueryEmbeddingCache:
+    """
+    In-process LRU + TTL cache of query embeddings
+
+    Search queries and chat questions repeat far more often than document
+    chunks, so their embeddings are kept in a small entry-bounded LRU keyed
+    by (model, normalized query). Queries are case-folded as well as
+    whitespace-normalized. Entries expire after ttl_seconds so a changed
+    model deployment is picked up without a restart.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = settings.QUERY_EMBEDDING_CACHE_SIZE,
+        ttl_seconds: int = settings.QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+    ):
+        """
+        Initialize query embedding cache
+
+        Args:
+            max_entries: Maximum number of cached queries
+            ttl_seconds: Lifetime of an entry
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model: str, query: str) -> tuple:
+        """Build cache key for a model and query"""
+        return (model, EmbeddingCache.normalize_text(query).casefold())
+
+    def get(self, model: str, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a query embedding
+
+        Args:
+            model: Embedding model name
+            query: Query text
+
+        Returns:
+            Cached embedding result, or None on a miss
+        """
+        key = self.make_key(model, query)
+        entry = self._entries.get(key)
+
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            metrics.increment("query_embedding_cache_hits")
+            return entry[1]
+
+        if entry is not None:
+            del self._entries[key]
+
+        self.misses += 1
+        metrics.increment("query_embedding_cache_misses")
+        return None
+
+    def set(self, model: str, query: str, result: Dict[str, Any]):
+        """
+        Store a query embedding
+
+        Args:
+            model: Embedding model name
+            query: Query text
+            result: Embedding result
+        """
+        key = self.make_key(model, query)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, result)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._entries),
+        }
+
+
+# Create singleton instances
+embedding_cache = EmbeddingCache(
+    redis_url=settings.REDIS_URL if settings.EMBEDDING_CACHE_REDIS_ENABLED else None,
+)
+
+query_embedding_cache = QueryEmbeddingCache()
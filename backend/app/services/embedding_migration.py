@@ -0,0 +1,697 @@
+"""
+Embedding Migration Service
+Zero-downtime switch of an organization's embedding model
+"""
+import asyncio
+import logging
+import random
+import re
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Coroutine
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func, tuple_
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.core.metrics import metrics
+from app.models import Organization, Document, DocumentChunk, EmbeddingMigration
+from app.services.embeddings import embeddings_service
+from app.services.vector_store import vector_store
+from app.services.result_cache import search_result_cache
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingMigrationService:
+    """
+    Re-embeds an organization's documents with a new model without downtime
+
+    1. start_migration pins the org's current model, creates a migration and
+       starts a background backfill that embeds every document's chunks with
+       the target model into a shadow namespace, throttled to
+       EMBEDDING_MIGRATION_MAX_CHUNKS_PER_SECOND. Progress is tracked per
+       document (Document.shadow_embedding_model) so the job resumes where it
+       stopped after a restart. Syncs keep writing to the active namespace;
+       documents they change are reset and picked up again by the backfill,
+       and their vector deletes are mirrored to the shadow namespace.
+    2. When every document is done the migration enters "dual_read": a sample
+       of searches also queries the shadow namespace with the new model in
+       the background and records the overlap of the two result lists.
+    3. switch_over (automatic once enough searches agree, or on request)
+       points the organization at the new model and namespace in a single
+       transaction. Old vectors are deleted after a grace period so
+       processes with a cached org lookup keep working.
+
+    Syncs hold the org's sync lock (a shared Postgres advisory lock) while
+    they run, and switch_over takes it exclusively: it waits for running
+    syncs, which embed with the model and write to the namespace they
+    started with, and syncs starting meanwhile wait for the switch.
+    """
+
+    ACTIVE_STATUSES = ("backfilling", "dual_read")
+
+    def __init__(self):
+        """Initialize embedding migration service"""
+        self.logger = logger
+        self._org_cache: Dict[uuid.UUID, tuple] = {}
+        self._tasks: set = set()
+
+    async def get_org_embedding(
+        self,
+        db: AsyncSession,
+        org_id: uuid.UUID,
+        use_cache: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Get the embedding model and vector namespace an organization uses
+
+        Cached for EMBEDDING_ORG_CACHE_TTL_SECONDS.
+
+        Args:
+            db: Database session
+            org_id: Organization ID
+            use_cache: Whether a cached lookup may be returned
+
+        Returns:
+            Dict with model, namespace and the active migration (or None)
+        """
+        cached = self._org_cache.get(org_id)
+        if use_cache and cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        result = await db.execute(
+            select(Organization.embedding_model, Organization.vector_namespace)
+            .where(Organization.id == org_id)
+        )
+        org = result.one_or_none()
+
+        result = await db.execute(
+            select(EmbeddingMigration)
+            .where(
+                EmbeddingMigration.org_id == org_id,
+                EmbeddingMigration.status.in_(self.ACTIVE_STATUSES),
+            )
+            .order_by(EmbeddingMigration.created_at.desc())
+            .limit(1)
+        )
+        migration = result.scalar_one_or_none()
+
+        org_embedding = {
+            "model": (org.embedding_model if org else None) or settings.EMBEDDING_MODEL,
+            "namespace": (org.vector_namespace if org else None) or str(org_id),
+            "migration": {
+                "id": migration.id,
+                "status": migration.status,
+                "target_model": migration.target_model,
+                "namespace": migration.namespace,
+            } if migration else None,
+        }
+
+        self._org_cache[org_id] = (
+            time.monotonic() + settings.EMBEDDING_ORG_CACHE_TTL_SECONDS,
+            org_embedding,
+        )
+
+        return org_embedding
+
+    def invalidate(self, org_id: uuid.UUID):
+        """Drop the cached org lookup"""
+        self._org_cache.pop(org_id, None)
+
+    @asynccontextmanager
+    async def sync_lock(self, org_id: uuid.UUID):
+        """
+        Hold the org's sync lock (shared) for the duration of a sync
+
+        Look up the org embedding only after entering, with use_cache=False.
+
+        Args:
+            org_id: Organization ID
+        """
+        lock_key = self._sync_lock_key(org_id)
+
+        # Session-level lock on its own connection, as the sync commits often
+        async with engine.connect() as lock_connection:
+            await lock_connection.scalar(select(func.pg_advisory_lock_shared(lock_key)))
+            try:
+                yield
+            finally:
+                await lock_connection.scalar(select(func.pg_advisory_unlock_shared(lock_key)))
+
+    @staticmethod
+    def _sync_lock_key(org_id: uuid.UUID) -> int:
+        """Advisory lock key of an org's sync lock"""
+        return (org_id.int >> 64) & 0x7FFFFFFFFFFFFFFF
+
+    async def start_migration(
+        self,
+        db: AsyncSession,
+        org_id: uuid.UUID,
+        target_model: str,
+    ) -> Dict[str, Any]:
+        """
+        Start migrating an organization to a new embedding model
+
+        Args:
+            db: Database session
+            org_id: Organization ID
+            target_model: Model to migrate to (EmbeddingsService.MODELS name)
+
+        Returns:
+            Migration status
+        """
+        if vector_store.stores_in_database:
+            raise ValueError("Embedding migrations require a vector store with namespaces")
+
+        target_model_key = embeddings_service.get_model_key(target_model)
+
+        # The shadow namespace lives in the same index, so every upsert of
+        # the backfill would fail on a size mismatch
+        index_dimensions = vector_store.get_dimensions()
+        target_dimensions = embeddings_service.get_dimensions(target_model)
+        if index_dimensions is not None and target_dimensions != index_dimensions:
+            raise ValueError(
+                f"{target_model_key} produces {target_dimensions}-dimensional embeddings but "
+                f"the vector index holds {index_dimensions}; choose a model of that size "
+                f"(text-embedding-3 models can be reduced with EMBEDDING_DIMENSIONS)"
+            )
+
+        result = await db.execute(
+            select(EmbeddingMigration).where(
+                EmbeddingMigration.org_id == org_id,
+                EmbeddingMigration.status.in_(self.ACTIVE_STATUSES),
+            )
+        )
+        if result.scalars().first():
+            raise ValueError("An embedding migration is already running for this organization")
+
+        org = await db.get(Organization, org_id)
+        if org is None:
+            raise ValueError(f"Organization {org_id} not found")
+
+        # Pin the current model so changing EMBEDDING_MODEL cannot affect the org
+        source_model = org.embedding_model or settings.EMBEDDING_MODEL
+        org.embedding_model = source_model
+        current_namespace = org.vector_namespace or str(org_id)
+
+        if embeddings_service.get_model_key(source_model) == target_model_key:
+            raise ValueError(f"Organization already uses {target_model_key}")
+
+        namespace = re.sub(r"[^\w.-]", "-", f"{org_id}-{target_model_key}")
+        if namespace == current_namespace:
+            raise ValueError(f"Namespace {namespace} is already in use")
+
+        documents_total = await db.scalar(
+            select(func.count()).select_from(Document).where(
+                Document.org_id == org_id,
+                Document.is_deleted == False,
+            )
+        )
+
+        migration = EmbeddingMigration(
+            org_id=org_id,
+            source_model=source_model,
+            target_model=target_model,
+            target_model_key=target_model_key,
+            namespace=namespace,
+            status="backfilling",
+            documents_total=documents_total,
+            started_at=datetime.utcnow(),
+        )
+        db.add(migration)
+
+        # Progress of an earlier failed migration to the same model is kept
+        await db.commit()
+        self.invalidate(org_id)
+
+        self.logger.info(
+            f"Started embedding migration {migration.id} for org {org_id}: "
+            f"{source_model} -> {target_model_key} ({documents_total} documents)"
+        )
+
+        self._launch(self.run_backfill(migration.id))
+
+        return self._serialize(migration)
+
+    async def resume_migrations(self):
+        """Restart the backfill of migrations interrupted by a shutdown"""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(EmbeddingMigration.id).where(EmbeddingMigration.status == "backfilling")
+            )
+            migration_ids = list(result.scalars().all())
+
+        for migration_id in migration_ids:
+            self.logger.info(f"Resuming embedding migration {migration_id}")
+            self._launch(self.run_backfill(migration_id))
+
+    async def run_backfill(self, migration_id: uuid.UUID):
+        """
+        Embed all pending documents into the shadow namespace
+
+        A Postgres advisory lock keeps a migration's backfill to one process.
+
+        Args:
+            migration_id: Migration ID
+        """
+        lock_key = migration_id.int & 0x7FFFFFFFFFFFFFFF
+
+        async with engine.connect() as lock_connection:
+            if not await lock_connection.scalar(select(func.pg_try_advisory_lock(lock_key))):
+                self.logger.info(f"Embedding migration {migration_id} is backfilled by another process")
+                return
+
+            try:
+                await self._run_backfill(migration_id)
+            finally:
+                await lock_connection.scalar(select(func.pg_advisory_unlock(lock_key)))
+
+    async def _run_backfill(self, migration_id: uuid.UUID):
+        """Backfill loop (see run_backfill)"""
+        try:
+            while True:
+                started = time.monotonic()
+
+                async with AsyncSessionLocal() as db:
+                    migration = await db.get(EmbeddingMigration, migration_id)
+                    if migration is None or migration.status != "backfilling":
+                        return
+
+                    chunk_count = await self._backfill_batch(db, migration)
+                    if chunk_count is None:
+                        break
+
+                # Throttle to EMBEDDING_MIGRATION_MAX_CHUNKS_PER_SECOND (0 = unthrottled)
+                rate = settings.EMBEDDING_MIGRATION_MAX_CHUNKS_PER_SECOND
+                if rate > 0:
+                    delay = chunk_count / rate - (time.monotonic() - started)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(EmbeddingMigration)
+                    .where(
+                        EmbeddingMigration.id == migration_id,
+                        EmbeddingMigration.status == "backfilling",
+                    )
+                    .values(status="dual_read")
+                )
+                await db.commit()
+                migration = await db.get(EmbeddingMigration, migration_id)
+                self.invalidate(migration.org_id)
+
+            self.logger.info(f"Embedding migration {migration_id} backfilled, dual-reading")
+
+            if settings.EMBEDDING_MIGRATION_AUTO_SWITCH and settings.EMBEDDING_MIGRATION_MIN_DUAL_READS <= 0:
+                status = await self.switch_over(migration_id, resume_backfill=False)
+                if status["status"] == "backfilling":
+                    await self._run_backfill(migration_id)
+
+        except Exception as e:
+            self.logger.error(f"Embedding migration {migration_id} failed: {str(e)}", exc_info=True)
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(EmbeddingMigration)
+                    .where(EmbeddingMigration.id == migration_id)
+                    .values(status="failed", error=str(e), completed_at=datetime.utcnow())
+                )
+                await db.commit()
+
+    async def _backfill_batch(self, db: AsyncSession, migration: EmbeddingMigration) -> Optional[int]:
+        """
+        Embed the next batch of pending documents
+
+        Args:
+            db: Database session
+            migration: Running migration
+
+        Returns:
+            Number of chunks embedded, or None when no document is pending
+        """
+        result = await db.execute(
+            select(
+                Document.id,
+                Document.updated_at,
+                Document.title,
+                Document.url,
+                Document.source_type,
+                Document.created_at,
+            )
+            .where(
+                Document.org_id == migration.org_id,
+                Document.is_deleted == False,
+                Document.shadow_embedding_model.is_distinct_from(migration.target_model_key),
+            )
+            .order_by(Document.id)
+            .limit(settings.EMBEDDING_MIGRATION_BATCH_SIZE)
+        )
+        documents = {row.id: row for row in result}
+        if not documents:
+            return None
+
+        result = await db.execute(
+            select(
+                DocumentChunk.document_id,
+                DocumentChunk.chunk_index,
+                DocumentChunk.content,
+                DocumentChunk.vector_id,
+                DocumentChunk.position,
+            ).where(
+                DocumentChunk.document_id.in_(list(documents)),
+                DocumentChunk.vector_id.is_not(None),
+            )
+        )
+        chunks = result.all()
+
+        if chunks:
+            embeddings = await embeddings_service.create_embeddings_batch(
+                [chunk.content for chunk in chunks],
+                model=migration.target_model,
+            )
+
+            # Same metadata as the vectors written by the sync
+            vectors = []
+            for chunk, embedding_data in zip(chunks, embeddings):
+                document = documents[chunk.document_id]
+                vectors.append({
+                    "id": chunk.vector_id,
+                    "values": embedding_data["embedding"],
+                    "metadata": {
+                        "document_id": str(chunk.document_id),
+                        "chunk_index": chunk.chunk_index,
+                        "org_id": str(migration.org_id),
+                        "source_type": document.source_type,
+                        "title": document.title,
+                        "content": chunk.content[:500],
+                        "url": document.url or "",
+                        "created_at": document.created_at.isoformat(),
+                        **(chunk.position or {}),
+                    },
+                })
+
+            await vector_store.upsert_vectors(vectors, namespace=migration.namespace)
+
+        # Documents changed by a sync in the meantime stay pending
+        await db.execute(
+            update(Document)
+            .where(
+                tuple_(Document.id, Document.updated_at).in_(
+                    [(row.id, row.updated_at) for row in documents.values()]
+                )
+            )
+            .values(shadow_embedding_model=migration.target_model_key)
+            .execution_options(synchronize_session=False)
+        )
+
+        documents_done = await db.scalar(
+            select(func.count()).select_from(Document).where(
+                Document.org_id == migration.org_id,
+                Document.is_deleted == False,
+                Document.shadow_embedding_model == migration.target_model_key,
+            )
+        )
+        migration.documents_done = documents_done
+        migration.chunks_embedded += len(chunks)
+        await db.commit()
+
+        metrics.increment("embedding_migration_chunks", len(chunks))
+        self.logger.info(
+            f"Embedding migration {migration.id}: {documents_done}/{migration.documents_total} "
+            f"documents ({len(chunks)} chunks in this batch)"
+        )
+
+        return len(chunks)
+
+    def schedule_dual_read(self, comparison: Coroutine):
+        """
+        Run a dual-read comparison in the background (sampled)
+
+        Args:
+            comparison: Coroutine querying the shadow namespace and calling
+                record_dual_read
+        """
+        if random.random() >= settings.EMBEDDING_MIGRATION_DUAL_READ_SAMPLE_RATE:
+            comparison.close()
+            return
+
+        self._launch(comparison)
+
+    async def record_dual_read(
+        self,
+        migration_id: uuid.UUID,
+        primary_matches: List[Dict[str, Any]],
+        shadow_matches: List[Dict[str, Any]],
+    ):
+        """
+        Record how well the new model's results agree with the current ones
+
+        Overlap is the share of the top documents both result lists contain.
+        Comparisons where either side found nothing are not recorded: an
+        empty org or filter says nothing about the new model.
+
+        Args:
+            migration_id: Migration ID
+            primary_matches: Matches from the active namespace
+            shadow_matches: Matches from the shadow namespace
+        """
+        primary = {match["metadata"]["document_id"] for match in primary_matches}
+        shadow = {match["metadata"]["document_id"] for match in shadow_matches}
+        if not primary or not shadow:
+            metrics.increment("embedding_migration_dual_reads_skipped")
+            return
+
+        overlap = len(primary & shadow) / max(len(primary), len(shadow))
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(EmbeddingMigration)
+                .where(
+                    EmbeddingMigration.id == migration_id,
+                    EmbeddingMigration.status == "dual_read",
+                )
+                .values(
+                    dual_reads=EmbeddingMigration.dual_reads + 1,
+                    dual_read_overlap=EmbeddingMigration.dual_read_overlap + overlap,
+                )
+                .returning(EmbeddingMigration.dual_reads, EmbeddingMigration.dual_read_overlap)
+            )
+            row = result.one_or_none()
+            await db.commit()
+
+        metrics.increment("embedding_migration_dual_reads")
+
+        if (
+            row is not None
+            and settings.EMBEDDING_MIGRATION_AUTO_SWITCH
+            and row.dual_reads >= settings.EMBEDDING_MIGRATION_MIN_DUAL_READS
+            and row.dual_read_overlap / row.dual_reads >= settings.EMBEDDING_MIGRATION_MIN_OVERLAP
+        ):
+            await self.switch_over(migration_id)
+
+    async def switch_over(self, migration_id: uuid.UUID, resume_backfill: bool = True) -> Dict[str, Any]:
+        """
+        Point the organization at the new model and namespace
+
+        Runs in one transaction with the migration row locked, after running
+        syncs of the org have finished (see sync_lock). If syncs left
+        documents pending since the backfill finished, the migration goes
+        back to backfilling instead and switches after catching up.
+
+        Args:
+            migration_id: Migration ID
+            resume_backfill: Whether to start the catch-up backfill
+
+        Returns:
+            Migration status
+        """
+        async with AsyncSessionLocal() as db:
+            org_id = await db.scalar(
+                select(EmbeddingMigration.org_id).where(EmbeddingMigration.id == migration_id)
+            )
+            if org_id is None:
+                raise ValueError(f"Embedding migration {migration_id} not found")
+
+            # Wait for running syncs before locking the migration row, which
+            # dual reads keep updating meanwhile
+            self.logger.info(f"Embedding migration {migration_id}: waiting for running syncs")
+            await db.execute(select(func.pg_advisory_xact_lock(self._sync_lock_key(org_id))))
+
+            result = await db.execute(
+                select(EmbeddingMigration)
+                .where(EmbeddingMigration.id == migration_id)
+                .with_for_update()
+            )
+            migration = result.scalar_one()
+            if migration.status != "dual_read":
+                raise ValueError(f"Cannot switch a migration in '{migration.status}' state")
+
+            pending = await db.scalar(
+                select(func.count()).select_from(Document).where(
+                    Document.org_id == migration.org_id,
+                    Document.is_deleted == False,
+                    Document.shadow_embedding_model.is_distinct_from(migration.target_model_key),
+                )
+            )
+            if pending:
+                migration.status = "backfilling"
+                await db.commit()
+                self.invalidate(migration.org_id)
+                self.logger.info(f"Embedding migration {migration_id}: {pending} documents changed, catching up")
+                if resume_backfill:
+                    self._launch(self.run_backfill(migration_id))
+                return self._serialize(migration)
+
+            org = await db.get(Organization, migration.org_id)
+            old_namespace = org.vector_namespace or str(org.id)
+
+            org.embedding_model = migration.target_model
+            org.vector_namespace = migration.namespace
+
+            await db.execute(
+                update(Document)
+                .where(Document.org_id == migration.org_id)
+                .values(embedding_model=migration.target_model_key)
+                .execution_options(synchronize_session=False)
+            )
+
+            migration.status = "completed"
+            migration.completed_at = datetime.utcnow()
+            await db.commit()
+
+        self.invalidate(migration.org_id)
+        await search_result_cache.invalidate_org(migration.org_id)
+
+        self.logger.info(
+            f"Organization {migration.org_id} switched to {migration.target_model_key} "
+            f"(namespace {migration.namespace})"
+        )
+
+        self._launch(self._delete_namespace_vectors(
+            migration.org_id,
+            old_namespace,
+            delay=settings.EMBEDDING_MIGRATION_CLEANUP_DELAY_SECONDS,
+        ))
+
+        return self._serialize(migration)
+
+    async def cancel_migration(self, migration_id: uuid.UUID) -> Dict[str, Any]:
+        """
+        Cancel a running migration and drop its shadow vectors
+
+        Args:
+            migration_id: Migration ID
+
+        Returns:
+            Migration status
+        """
+        async with AsyncSessionLocal() as db:
+            migration = await db.get(EmbeddingMigration, migration_id)
+            if migration is None:
+                raise ValueError(f"Embedding migration {migration_id} not found")
+            if migration.status not in self.ACTIVE_STATUSES:
+                raise ValueError(f"Cannot cancel a migration in '{migration.status}' state")
+
+            migration.status = "cancelled"
+            migration.completed_at = datetime.utcnow()
+
+            # The shadow vectors are deleted, so a later migration starts over
+            await db.execute(
+                update(Document)
+                .where(
+                    Document.org_id == migration.org_id,
+                    Document.shadow_embedding_model == migration.target_model_key,
+                )
+                .values(shadow_embedding_model=None)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+        self.invalidate(migration.org_id)
+        self._launch(self._delete_namespace_vectors(migration.org_id, migration.namespace))
+
+        return self._serialize(migration)
+
+    async def get_status(self, db: AsyncSession, org_id: uuid.UUID) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest migration of an organization
+
+        Args:
+            db: Database session
+            org_id: Organization ID
+
+        Returns:
+            Migration status, or None if the org was never migrated
+        """
+        result = await db.execute(
+            select(EmbeddingMigration)
+            .where(EmbeddingMigration.org_id == org_id)
+            .order_by(EmbeddingMigration.created_at.desc())
+            .limit(1)
+        )
+        migration = result.scalar_one_or_none()
+
+        return self._serialize(migration) if migration else None
+
+    async def _delete_namespace_vectors(
+        self,
+        org_id: uuid.UUID,
+        namespace: str,
+        delay: float = 0,
+    ):
+        """Delete the vectors of an org's chunks from a namespace"""
+        await asyncio.sleep(delay)
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(DocumentChunk.vector_id)
+                .join(Document, Document.id == DocumentChunk.document_id)
+                .where(Document.org_id == org_id, DocumentChunk.vector_id.is_not(None))
+            )
+            vector_ids = list(result.scalars().all())
+
+        await vector_store.delete_vectors(vector_ids, namespace=namespace)
+        self.logger.info(f"Deleted {len(vector_ids)} vectors from namespace {namespace}")
+
+    def _launch(self, coroutine: Coroutine):
+        """Run a coroutine in the background (keeping a reference until done)"""
+        task = asyncio.create_task(self._run_logged(coroutine))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_logged(self, coroutine: Coroutine):
+        """Await a background coroutine and log its failure"""
+        try:
+            await coroutine
+        except Exception as e:
+            self.logger.warning(f"Embedding migration background task failed: {str(e)}")
+
+    @staticmethod
+    def _serialize(migration: EmbeddingMigration) -> Dict[str, Any]:
+        """Convert a migration to a status dict"""
+        return {
+            "id": str(migration.id),
+            "org_id": str(migration.org_id),
+            "source_model": migration.source_model,
+            "target_model": migration.target_model_key,
+            "namespace": migration.namespace,
+            "status": migration.status,
+            "documents_total": migration.documents_total,
+            "documents_done": migration.documents_done,
+            "chunks_embedded": migration.chunks_embedded,
+            "dual_reads": migration.dual_reads,
+            "dual_read_overlap": (
+                migration.dual_read_overlap / migration.dual_reads if migration.dual_reads else None
+            ),
+            "error": migration.error,
+            "started_at": migration.started_at,
+            "completed_at": migration.completed_at,
+        }
+
+
+# Create singleton instance
+embedding_migration_service = EmbeddingMigrationService()
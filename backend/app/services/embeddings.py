@@ -3,13 +3,14 @@ Vector Embeddings Service
 Supports OpenAI and Anthropic models
 """
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import asyncio
 
 from openai import AsyncOpenAI
 import tiktoken
 
 from app.core.config import settings
+from app.services.embedding_cache import embedding_cache, query_embedding_cache
 
 logger = logging.getLogger(__name__)
 
@@ -23,27 +24,36 @@ class EmbeddingsService:
             "provider": "openai",
             "model": "text-embedding-ada-002",
             "dimensions": 1536,
+            "supports_dimensions": False,
             "max_tokens": 8191,
+            "max_batch_inputs": 2048,
+            "max_batch_tokens": 300000,
             "encoding": "cl100k_base",
         },
         "openai-3-small": {
             "provider": "openai",
             "model": "text-embedding-3-small",
             "dimensions": 1536,
+            "supports_dimensions": True,  # Matryoshka: shorter outputs via the dimensions parameter
             "max_tokens": 8191,
+            "max_batch_inputs": 2048,
+            "max_batch_tokens": 300000,
             "encoding": "cl100k_base",
         },
         "openai-3-large": {
             "provider": "openai",
             "model": "text-embedding-3-large",
             "dimensions": 3072,
+            "supports_dimensions": True,
             "max_tokens": 8191,
+            "max_batch_inputs": 2048,
+            "max_batch_tokens": 300000,
             "encoding": "cl100k_base",
         },
     }
 
     # Default model
-    DEFAULT_MODEL = "openai-ada-002"
+    DEFAULT_MODEL = settings.EMBEDDING_MODEL
 
     def __init__(self):
         """Initialize embeddings service"""
@@ -63,6 +73,9 @@ class EmbeddingsService:
         """
         Create embedding for a single text
 
+        The embedding cache is consulted first; the provider is only called
+        on a miss.
+
         Args:
             text: Text to embed
             model: Model to use (default: openai-ada-002)
@@ -70,31 +83,35 @@ class EmbeddingsService:
         Returns:
             Dict with embedding vector and metadata
         """
-        # Get model config
-        if model not in self.MODELS:
-            raise ValueError(f"Unsupported model: {model}")
+        results = await self.create_embeddings_batch([text], model=model)
+        return results[0]
 
-        model_config = self.MODELS[model]
+    async def embed_query(
+        self,
+        query: str,
+        model: str = DEFAULT_MODEL,
+    ) -> Dict[str, Any]:
+        """
+        Create embedding for a search query or chat question
 
-        # Truncate text if needed
-        truncated_text = await self._truncate_text(text, model_config)
+        Repeated queries are served from the query embedding cache.
 
-        # Create embedding based on provider
-        if model_config["provider"] == "openai":
-            embedding = await self._create_openai_embedding(
-                truncated_text,
-                model_config["model"]
-            )
-        else:
-            raise ValueError(f"Unsupported provider: {model_config['provider']}")
+        Args:
+            query: Query text
+            model: Model to use (default: openai-ada-002)
 
-        return {
-            "embedding": embedding,
-            "model": model,
-            "dimensions": len(embedding),
-            "text_length": len(text),
-            "truncated": len(text) != len(truncated_text),
-        }
+        Returns:
+            Dict with embedding vector and metadata
+        """
+        model_key = self.get_model_key(model)
+        cached = query_embedding_cache.get(model_key, query)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+        result = await self.create_embedding(query, model=model)
+        query_embedding_cache.set(model_key, query, result)
+
+        return result
 
     async def create_embeddings_batch(
         self,
@@ -105,6 +122,9 @@ class EmbeddingsService:
         """
         Create embeddings for multiple texts in batches
 
+        Cached vectors are returned directly; only cache misses are sent to
+        the provider (each distinct text once) and then added to the cache.
+
         Args:
             texts: List of texts to embed
             model: Model to use
@@ -118,11 +138,41 @@ class EmbeddingsService:
             raise ValueError(f"Unsupported model: {model}")
 
         model_config = self.MODELS[model]
+        dimensions = self.get_dimensions(model)
 
-        # Process in batches
-        results = []
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
+        # Vectors of different output dimensions are cached separately
+        model_key = self.get_model_key(model)
+
+        # Look up cached vectors
+        if settings.EMBEDDING_CACHE_ENABLED:
+            cached = await embedding_cache.get_many(model_key, texts)
+        else:
+            cached = [None] * len(texts)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        for i, embedding in enumerate(cached):
+            if embedding is not None:
+                results[i] = {
+                    "embedding": embedding,
+                    "model": model,
+                    "dimensions": len(embedding),
+                    "text_length": len(texts[i]),
+                    "truncated": self._exceeds_token_limit(texts[i], model_config),
+                    "cached": True,
+                }
+
+        # Group misses by cache key so duplicate texts are embedded once
+        misses: Dict[str, List[int]] = {}
+        for i, result in enumerate(results):
+            if result is None:
+                misses.setdefault(embedding_cache.make_key(model_key, texts[i]), []).append(i)
+
+        miss_groups = list(misses.values())
+
+        # Process misses in batches
+        for i in range(0, len(miss_groups), batch_size):
+            groups = miss_groups[i:i + batch_size]
+            batch = [texts[group[0]] for group in groups]
 
             # Truncate texts
             truncated_batch = []
@@ -134,54 +184,47 @@ class EmbeddingsService:
             if model_config["provider"] == "openai":
                 embeddings = await self._create_openai_embeddings_batch(
                     truncated_batch,
-                    model_config["model"]
+                    model_config["model"],
+                    dimensions=dimensions if dimensions != model_config["dimensions"] else None,
                 )
             else:
                 raise ValueError(f"Unsupported provider: {model_config['provider']}")
 
+            if settings.EMBEDDING_CACHE_ENABLED:
+                await embedding_cache.set_many(model_key, batch, embeddings)
+
             # Format results
             for j, embedding in enumerate(embeddings):
-                original_text = batch[j]
-                results.append({
-                    "embedding": embedding,
-                    "model": model,
-                    "dimensions": len(embedding),
-                    "text_length": len(original_text),
-                    "truncated": len(original_text) != len(truncated_batch[j]),
-                })
+                for index in groups[j]:
+                    results[index] = {
+                        "embedding": embedding,
+                        "model": model,
+                        "dimensions": len(embedding),
+                        "text_length": len(texts[index]),
+                        "truncated": len(batch[j]) != len(truncated_batch[j]),
+                        "cached": False,
+                    }
 
             # Log progress
             self.logger.info(
                 f"Created embeddings for batch {i // batch_size + 1} "
-                f"({len(results)}/{len(texts)} total)"
+                f"({min(i + batch_size, len(miss_groups))}/{len(miss_groups)} uncached texts)"
             )
 
         return results
 
-    async def _create_openai_embedding(self, text: str, model: str) -> List[float]:
-        """Create embedding using OpenAI"""
-        try:
-            response = await self.openai_client.embeddings.create(
-                input=text,
-                model=model,
-            )
-
-            return response.data[0].embedding
-
-        except Exception as e:
-            self.logger.error(f"Error creating OpenAI embedding: {str(e)}", exc_info=True)
-            raise
-
     async def _create_openai_embeddings_batch(
         self,
         texts: List[str],
-        model: str
+        model: str,
+        dimensions: Optional[int] = None,
     ) -> List[List[float]]:
-        """Create embeddings for batch using OpenAI"""
+        """Create embeddings for batch using OpenAI (dimensions: reduced output size)"""
         try:
             response = await self.openai_client.embeddings.create(
                 input=texts,
                 model=model,
+                **({"dimensions": dimensions} if dimensions else {}),
             )
 
             # Sort by index to maintain order
@@ -193,14 +236,55 @@ class EmbeddingsService:
             self.logger.error(f"Error creating OpenAI embeddings batch: {str(e)}", exc_info=True)
             raise
 
-    async def _truncate_text(self, text: str, model_config: Dict[str, Any]) -> str:
-        """Truncate text to fit model's token limit"""
-        # Get or create encoder
-        encoding_name = model_config["encoding"]
+    def _get_encoder(self, encoding_name: str) -> Any:
+        """Get cached tiktoken encoder"""
         if encoding_name not in self.encoders:
             self.encoders[encoding_name] = tiktoken.get_encoding(encoding_name)
 
-        encoder = self.encoders[encoding_name]
+        return self.encoders[encoding_name]
+
+    def get_encoder(self, model: str = DEFAULT_MODEL) -> Any:
+        """
+        Get the cached tokenizer of a model
+
+        Args:
+            model: Model name
+
+        Returns:
+            tiktoken encoder
+        """
+        if model not in self.MODELS:
+            raise ValueError(f"Unsupported model: {model}")
+
+        return self._get_encoder(self.MODELS[model]["encoding"])
+
+    def count_tokens(self, text: str, model: str = DEFAULT_MODEL) -> int:
+        """
+        Count tokens the model will be billed for (after truncation)
+
+        Args:
+            text: Text to count
+            model: Model whose tokenizer and limit apply
+
+        Returns:
+            Token count, capped at the model's max_tokens
+        """
+        if model not in self.MODELS:
+            raise ValueError(f"Unsupported model: {model}")
+
+        model_config = self.MODELS[model]
+        encoder = self._get_encoder(model_config["encoding"])
+
+        return min(len(encoder.encode(text)), model_config["max_tokens"])
+
+    def _exceeds_token_limit(self, text: str, model_config: Dict[str, Any]) -> bool:
+        """Check whether text would be truncated for the model"""
+        encoder = self._get_encoder(model_config["encoding"])
+        return len(encoder.encode(text)) > model_config["max_tokens"]
+
+    async def _truncate_text(self, text: str, model_config: Dict[str, Any]) -> str:
+        """Truncate text to fit model's token limit"""
+        encoder = self._get_encoder(model_config["encoding"])
 
         # Count tokens
         tokens = encoder.encode(text)
@@ -216,12 +300,59 @@ class EmbeddingsService:
 
         return text
 
+    def get_dimensions(self, model: str = DEFAULT_MODEL) -> int:
+        """
+        Get the output dimensions of a model
+
+        Args:
+            model: Model name
+
+        Returns:
+            Configured dimensions (EMBEDDING_DIMENSIONS) or the model's native size
+        """
+        if model not in self.MODELS:
+            raise ValueError(f"Unsupported model: {model}")
+
+        model_config = self.MODELS[model]
+        dimensions = settings.EMBEDDING_DIMENSIONS.get(model, model_config["dimensions"])
+
+        if dimensions != model_config["dimensions"]:
+            if not model_config["supports_dimensions"]:
+                raise ValueError(f"Model {model} does not support reduced dimensions")
+            if not 0 < dimensions < model_config["dimensions"]:
+                raise ValueError(
+                    f"Dimensions for {model} must be between 1 and {model_config['dimensions']}"
+                )
+
+        return dimensions
+
+    def get_model_key(self, model: str = DEFAULT_MODEL) -> str:
+        """
+        Identify the vectors a model produces (name plus reduced dimensions)
+
+        Used for cache keys and stored as Document.embedding_model, so vectors
+        of different sizes are never mixed.
+
+        Args:
+            model: Model name
+
+        Returns:
+            "model" or "model:dimensions"
+        """
+        dimensions = self.get_dimensions(model)
+        if dimensions == self.MODELS[model]["dimensions"]:
+            return model
+        return f"{model}:{dimensions}"
+
     def get_model_info(self, model: str = DEFAULT_MODEL) -> Dict[str, Any]:
         """Get information about a model"""
         if model not in self.MODELS:
             raise ValueError(f"Unsupported model: {model}")
 
-        return self.MODELS[model].copy()
+        return {
+            **self.MODELS[model],
+            "output_dimensions": self.get_dimensions(model),
+        }
 
     def list_models(self) -> List[Dict[str, Any]]:
         """List all available models"""
@@ -0,0 +1,116 @@
+"""
+File Spool
+Buffers downloaded files in memory, or on disk once they grow large
+"""
+import io
+import logging
+import os
+import tempfile
+from typing import Any, Optional, Union
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SpooledFile:
+    """
+    Write-only buffer for a downloaded file
+
+    Content is kept in memory up to max_memory bytes and moved to a named
+    temporary file on disk once it grows past that. source() hands the
+    content to the parsers: the bytes of a small file, or the path of a
+    spooled one, which parser workers open or memory-map themselves instead
+    of receiving a pickled copy of the whole file.
+
+    The temporary file is deleted by close() (or on leaving the with block).
+    """
+
+    def __init__(self, max_memory: Optional[int] = None, directory: Optional[str] = None):
+        """
+        Initialize spooled file
+
+        Args:
+            max_memory: Bytes kept in memory (default: FILE_SPOOL_MAX_MEMORY_MB)
+            directory: Directory for the temporary file (default: FILE_SPOOL_DIR)
+        """
+        if max_memory is None:
+            max_memory = settings.FILE_SPOOL_MAX_MEMORY_MB * 1024 * 1024
+
+        self.max_memory = max_memory
+        self.directory = directory or settings.FILE_SPOOL_DIR
+        self.size = 0
+        self._buffer: Optional[io.BytesIO] = io.BytesIO()
+        self._file: Optional[Any] = None
+
+    @property
+    def path(self) -> Optional[str]:
+        """Path of the temporary file, or None while the content is in memory"""
+        return self._file.name if self._file is not None else None
+
+    def write(self, data: bytes) -> int:
+        """
+        Append data, moving the content to disk when it outgrows memory
+
+        Args:
+            data: Bytes to append
+
+        Returns:
+            Number of bytes written
+        """
+        if self._buffer is not None and self.size + len(data) > self.max_memory:
+            self._rollover()
+
+        if self._file is not None:
+            self._file.write(data)
+        else:
+            self._buffer.write(data)
+
+        self.size += len(data)
+        return len(data)
+
+    def _rollover(self):
+        """Move the buffered content to a temporary file"""
+        self._file = tempfile.NamedTemporaryFile(
+            prefix="unifydata-",
+            suffix=".spool",
+            dir=self.directory,
+            delete=False,
+        )
+        self._file.write(self._buffer.getbuffer())
+        self._buffer = None
+
+    def source(self) -> Union[bytes, str]:
+        """
+        Content for the document parsers
+
+        Returns:
+            The content as bytes while in memory, else the temporary file's path
+        """
+        if self._file is not None:
+            self._file.flush()
+            return self._file.name
+
+        return self._buffer.getvalue()
+
+    def close(self):
+        """Discard the content and delete the temporary file"""
+        if self._file is not None:
+            self._file.close()
+            try:
+                os.unlink(self._file.name)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not delete spooled file {self._file.name}: {e}")
+            self._file = None
+
+        self._buffer = None
+
+    def __enter__(self):
+        """Context manager entry"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.close()
@@ -0,0 +1,140 @@
+"""
+Lexical Search Service
+Full-text search over document chunks (Postgres tsvector + GIN)
+"""
+import logging
+import re
+from typing import List, Dict, Any, Optional
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, func, cast
+from sqlalchemy.dialects.postgresql import REGCONFIG
+
+from app.models import Document, DocumentChunk
+from app.models.document import TEXT_SEARCH_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class LexicalSearchService:
+    """
+    Keyword search over DocumentChunk.content
+
+    Chunks carry a generated tsvector column with a GIN index; queries are
+    parsed with websearch_to_tsquery (quoted phrases, OR, -term) and ranked
+    with ts_rank_cd. Matches use the same shape as vector store matches so
+    both can be fused by the search service.
+    """
+
+    # Identifier-like tokens: emails, URLs, ticket/record numbers (ABC-123,
+    # 0061x00000AbCdE, #4521). Plain words and short numbers such as years
+    # ("revenue 2024") are left to the embedding.
+    _IDENTIFIER_RE = re.compile(
+        r"""
+        [^@\s]+@[^@\s]+\.\w+                      # email
+        | https?://\S+                            # URL
+        | (?=\S*\d)(?=\S*[A-Za-z])[\w.#/-]{3,}    # mixed letters and digits
+        | \#\d{3,}                                # ticket number
+        | \d{6,}                                  # record number
+        """,
+        re.VERBOSE,
+    )
+
+    # Queries with more tokens than this are treated as natural language
+    MAX_KEYWORD_QUERY_TOKENS = 4
+
+    def __init__(self):
+        """Initialize lexical search service"""
+        self.logger = logger
+
+    def is_keyword_query(self, query: str) -> bool:
+        """
+        Whether a query is an obvious keyword lookup (no embedding needed)
+
+        True for fully quoted queries and for short queries containing an
+        identifier such as an email address, URL or ticket number.
+
+        Args:
+            query: Search query
+
+        Returns:
+            True if lexical search alone should answer the query
+        """
+        query = query.strip()
+        if len(query) > 2 and query[0] == query[-1] == '"':
+            return True
+
+        tokens = query.split()
+        if not tokens or len(tokens) > self.MAX_KEYWORD_QUERY_TOKENS:
+            return False
+
+        return any(self._IDENTIFIER_RE.fullmatch(token.strip(",;:()")) for token in tokens)
+
+    async def search(
+        self,
+        db: AsyncSession,
+        org_id: uuid.UUID,
+        query: str,
+        limit: int = 20,
+        source_types: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search chunks by keywords
+
+        Args:
+            db: Database session
+            org_id: Organization ID
+            query: Search query (websearch syntax)
+            limit: Maximum number of chunks
+            source_types: Optional filter by source types
+
+        Returns:
+            List of matches ({"id", "score", "metadata"}) ordered by rank
+        """
+        tsquery = func.websearch_to_tsquery(cast(TEXT_SEARCH_CONFIG, REGCONFIG), query)
+        rank = func.ts_rank_cd(DocumentChunk.search_vector, tsquery).label("rank")
+
+        conditions = [
+            DocumentChunk.search_vector.op("@@")(tsquery),
+            Document.org_id == org_id,
+            Document.is_deleted == False,
+        ]
+        if source_types:
+            conditions.append(Document.source_type.in_(source_types))
+
+        result = await db.execute(
+            select(
+                DocumentChunk.id,
+                DocumentChunk.vector_id,
+                DocumentChunk.document_id,
+                DocumentChunk.chunk_index,
+                DocumentChunk.content,
+                rank,
+            )
+            .join(Document, Document.id == DocumentChunk.document_id)
+            .where(and_(*conditions))
+            .order_by(rank.desc())
+            .limit(limit)
+        )
+
+        matches = []
+        for row in result:
+            matches.append({
+                # Same ID as the vector match so both lists can be fused
+                "id": row.vector_id or f"chunk:{row.id}",
+                "score": row.rank,
+                "metadata": {
+                    "document_id": str(row.document_id),
+                    "chunk_index": row.chunk_index,
+                    "content": row.content,
+                },
+            })
+
+        self.logger.info(f"Found {len(matches)} lexical matches (query: '{query[:50]}')")
+
+        return matches
+
+
+# Create singleton instance
+lexical_search_service = LexicalSearchService()
@@ -0,0 +1,724 @@
+"""
+Local Vector Store
+In-process vector storage backed by memory-mapped NumPy matrices
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+try:
+    import hnswlib
+except ImportError:  # Optional: brute-force search is used without it
+    hnswlib = None
+
+from app.core.config import settings
+from app.services.vector_store_base import BaseVectorStore
+
+logger = logging.getLogger(__name__)
+
+
+def matches_filter(metadata: Dict[str, Any], filter_metadata: Dict[str, Any]) -> bool:
+    """
+    Evaluate a Pinecone-style metadata filter
+
+    Args:
+        metadata: Vector metadata
+        filter_metadata: Filter ({"field": value} or {"field": {"$op": operand}},
+            combined with $and / $or)
+
+    Returns:
+        True if the metadata matches
+    """
+    for key, condition in filter_metadata.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, sub) for sub in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_filter(metadata, sub) for sub in condition):
+                return False
+        elif isinstance(condition, dict):
+            if not all(
+                _compare(metadata.get(key), operator, operand, key in metadata)
+                for operator, operand in condition.items()
+            ):
+                return False
+        elif not _compare(metadata.get(key), "$eq", condition, key in metadata):
+            return False
+
+    return True
+
+
+def _compare(value: Any, operator: str, operand: Any, present: bool) -> bool:
+    """Apply a single filter operator (list values match if any element does)"""
+    if operator == "$exists":
+        return present == operand
+
+    values = value if isinstance(value, list) else [value]
+
+    if operator == "$eq":
+        return operand in values
+    if operator == "$ne":
+        return operand not in values
+    if operator == "$in":
+        return any(v in operand for v in values)
+    if operator == "$nin":
+        return not any(v in operand for v in values)
+
+    if value is None or isinstance(value, list):
+        return False
+    try:
+        if operator == "$gt":
+            return value > operand
+        if operator == "$gte":
+            return value >= operand
+        if operator == "$lt":
+            return value < operand
+        if operator == "$lte":
+            return value <= operand
+    except TypeError:
+        return False
+
+    raise ValueError(f"Unsupported filter operator: {operator}")
+
+
+# Number of set bits of every byte value (Hamming distance of packed codes)
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint16)
+
+
+class _Namespace:
+    """
+    Vectors of one namespace
+
+    Rows are unit-normalized float32 vectors in a memory-mapped file, so
+    dot products are cosine similarities. IDs and metadata live in a JSON
+    snapshot plus an append-only journal of changed slots, which is folded
+    into the snapshot once it outgrows it (and whenever the matrix grows),
+    so a write costs the size of the change rather than of the namespace.
+    Deleted rows are recycled. An HNSW
+    index is built lazily (in memory, from the matrix) once the namespace
+    is large enough and hnswlib is installed.
+
+    With quantization, brute-force search first scores compact in-memory
+    codes (int8: 1 byte per dimension plus a scale per row; binary: 1 bit
+    per dimension, compared by Hamming distance) and then re-scores the best
+    top_k * OVERSAMPLING rows exactly, so only those rows of the float32
+    matrix are read. Codes are rebuilt from the matrix when loading.
+
+    With coarse_dimensions (coarse-to-fine search for Matryoshka embeddings
+    such as text-embedding-3), codes are built from the re-normalized
+    leading dimensions of each vector, so the first pass compares short
+    vectors and the re-ranking uses the full ones.
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    QUANTIZATIONS = ("none", "int8", "binary")
+
+    # First-stage candidates per requested result
+    OVERSAMPLING = {"none": 4, "int8": 4, "binary": 10}
+
+    # Rows scored per block (bounds the temporary arrays of a query)
+    SCORE_BLOCK_ROWS = 4096
+
+    # Journal records kept before compaction (at least one per live vector)
+    COMPACT_MIN_RECORDS = 10000
+
+    def __init__(self, path: Path, quantization: str = "none", coarse_dimensions: int = 0):
+        """
+        Load or create namespace
+
+        Args:
+            path: Directory holding the namespace files
+            quantization: First-stage codes: "none", "int8" or "binary"
+            coarse_dimensions: Leading dimensions used by the first pass (0 = all)
+        """
+        if quantization not in self.QUANTIZATIONS:
+            raise ValueError(f"Unknown quantization: {quantization}")
+
+        self.path = path
+        self.lock = threading.RLock()
+        self.quantization = quantization
+        self.coarse_dimensions = coarse_dimensions
+
+        self.dimension: Optional[int] = None
+        self.capacity = 0
+        self.matrix: Optional[np.memmap] = None
+        self.ids: List[Optional[str]] = []
+        self.metadata: List[Optional[Dict[str, Any]]] = []
+        self.slots: Dict[str, int] = {}
+        self.free: List[int] = []
+        self.hnsw = None
+        self.codes: Optional[np.ndarray] = None
+        self.code_scales: Optional[np.ndarray] = None
+        self._journal_records = 0
+
+        self._load()
+
+    @property
+    def vectors_path(self) -> Path:
+        return self.path / "vectors.f32"
+
+    @property
+    def meta_path(self) -> Path:
+        return self.path / "meta.json"
+
+    @property
+    def journal_path(self) -> Path:
+        return self.path / "meta.journal"
+
+    def _load(self):
+        """Load namespace files if they exist"""
+        if not self.meta_path.exists():
+            return
+
+        with open(self.meta_path) as f:
+            meta = json.load(f)
+
+        self.dimension = meta["dimension"]
+        self.capacity = meta["capacity"]
+        self.ids = meta["ids"]
+        self.metadata = meta["metadata"]
+        torn = not self._replay_journal()
+        self.slots = {vector_id: slot for slot, vector_id in enumerate(self.ids) if vector_id is not None}
+        self.free = [slot for slot, vector_id in enumerate(self.ids) if vector_id is None]
+        self.matrix = np.memmap(
+            self.vectors_path, dtype=np.float32, mode="r+", shape=(self.capacity, self.dimension)
+        )
+        if torn:
+            # Later appends must not follow the torn line
+            self._compact()
+
+        if self._uses_codes():
+            self._allocate_codes(self.capacity)
+            for start in range(0, len(self.ids), self.SCORE_BLOCK_ROWS):
+                end = min(start + self.SCORE_BLOCK_ROWS, len(self.ids))
+                self._encode(np.arange(start, end), np.asarray(self.matrix[start:end]))
+
+    def _replay_journal(self) -> bool:
+        """
+        Apply the journal records written since the snapshot
+
+        Returns:
+            False if the journal ends in a torn write (of a crashed process)
+        """
+        if not self.journal_path.exists():
+            return True
+
+        with open(self.journal_path) as f:
+            for line in f:
+                try:
+                    records = json.loads(line)
+                except json.JSONDecodeError:
+                    return False
+
+                for slot, vector_id, metadata in records:
+                    while len(self.ids) <= slot:
+                        self.ids.append(None)
+                        self.metadata.append(None)
+                    self.ids[slot] = vector_id
+                    self.metadata[slot] = metadata
+                self._journal_records += len(records)
+
+        return True
+
+    def _log(self, records: List[list]):
+        """
+        Flush vectors and append [slot, id, metadata] records to the journal
+
+        Compacts once the journal holds more records than the snapshot.
+        """
+        self.matrix.flush()
+
+        with open(self.journal_path, "a") as f:
+            f.write(json.dumps(records, separators=(",", ":")) + "\n")
+        self._journal_records += len(records)
+
+        if self._journal_records > max(self.COMPACT_MIN_RECORDS, len(self.slots)):
+            self._compact()
+
+    def _compact(self):
+        """Flush vectors, atomically rewrite the snapshot and clear the journal"""
+        self.matrix.flush()
+
+        tmp_path = self.meta_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "dimension": self.dimension,
+                "capacity": self.capacity,
+                "ids": self.ids,
+                "metadata": self.metadata,
+            }, f)
+        os.replace(tmp_path, self.meta_path)
+
+        # Replaying records already in the snapshot is harmless, so a crash
+        # before the journal is cleared loses nothing
+        self.journal_path.unlink(missing_ok=True)
+        self._journal_records = 0
+
+    def _ensure_capacity(self, size: int):
+        """Grow the memory-mapped matrix (doubling) to hold size rows"""
+        if size <= self.capacity:
+            return
+
+        capacity = max(self.capacity, self.INITIAL_CAPACITY)
+        while capacity < size:
+            capacity *= 2
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.vectors_path.with_suffix(".tmp")
+        matrix = np.memmap(tmp_path, dtype=np.float32, mode="w+", shape=(capacity, self.dimension))
+        if self.matrix is not None:
+            matrix[:self.capacity] = self.matrix
+            matrix.flush()
+            del self.matrix
+        del matrix
+        os.replace(tmp_path, self.vectors_path)
+
+        self.capacity = capacity
+        self.matrix = np.memmap(
+            self.vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dimension)
+        )
+        if self.hnsw is not None:
+            self.hnsw.resize_index(capacity)
+        if self._uses_codes():
+            self._allocate_codes(capacity)
+
+        # The snapshot records the capacity (and the dimension of a new namespace)
+        self._compact()
+
+    def _code_dimensions(self) -> int:
+        """Number of leading dimensions the first-stage codes are built from"""
+        if 0 < self.coarse_dimensions < self.dimension:
+            return self.coarse_dimensions
+        return self.dimension
+
+    def _uses_codes(self) -> bool:
+        """Whether brute-force search runs a first pass over codes"""
+        return self.quantization != "none" or self._code_dimensions() < self.dimension
+
+    def _code_input(self, values: np.ndarray) -> np.ndarray:
+        """Leading dimensions of unit vectors, re-normalized"""
+        dimensions = self._code_dimensions()
+        if dimensions == self.dimension:
+            return values
+
+        values = values[:, :dimensions].copy()
+        norms = np.linalg.norm(values, axis=1, keepdims=True)
+        values /= np.where(norms == 0, 1, norms)
+        return values
+
+    def _allocate_codes(self, capacity: int):
+        """Allocate (or grow) the first-stage code arrays"""
+        dimensions = self._code_dimensions()
+        if self.quantization == "none":
+            codes = np.zeros((capacity, dimensions), dtype=np.float32)
+        elif self.quantization == "int8":
+            codes = np.zeros((capacity, dimensions), dtype=np.int8)
+            scales = np.zeros(capacity, dtype=np.float32)
+            if self.code_scales is not None:
+                scales[:len(self.code_scales)] = self.code_scales
+            self.code_scales = scales
+        else:
+            codes = np.zeros((capacity, (dimensions + 7) // 8), dtype=np.uint8)
+
+        if self.codes is not None:
+            codes[:len(self.codes)] = self.codes
+        self.codes = codes
+
+    def _encode(self, slots, values: np.ndarray):
+        """Store the first-stage codes of unit-normalized rows"""
+        values = self._code_input(values)
+        if self.quantization == "none":
+            self.codes[slots] = values
+        elif self.quantization == "int8":
+            # Symmetric scalar quantization with one scale per row
+            scales = np.abs(values).max(axis=1) / 127
+            scales[scales == 0] = 1.0
+            self.codes[slots] = np.round(values / scales[:, None]).astype(np.int8)
+            self.code_scales[slots] = scales
+        else:
+            self.codes[slots] = np.packbits(values > 0, axis=1)
+
+    def _approximate_scores(self, query: np.ndarray, size: int) -> np.ndarray:
+        """Score the first size rows against the query using their codes"""
+        scores = np.empty(size, dtype=np.float32)
+        query = self._code_input(query[None, :])[0]
+        if self.quantization == "binary":
+            query_bits = np.packbits(query > 0)
+
+        for start in range(0, size, self.SCORE_BLOCK_ROWS):
+            end = min(start + self.SCORE_BLOCK_ROWS, size)
+            if self.quantization == "none":
+                scores[start:end] = self.codes[start:end] @ query
+            elif self.quantization == "int8":
+                scores[start:end] = (
+                    (self.codes[start:end].astype(np.float32) @ query) * self.code_scales[start:end]
+                )
+            else:
+                hamming = _POPCOUNT[np.bitwise_xor(self.codes[start:end], query_bits)].sum(axis=1)
+                scores[start:end] = -hamming.astype(np.float32)
+
+        return scores
+
+    def upsert(self, vectors: List[Dict[str, Any]]) -> int:
+        """Insert or replace vectors"""
+        with self.lock:
+            if self.dimension is None:
+                self.dimension = len(vectors[0]["values"])
+
+            values = np.asarray([vector["values"] for vector in vectors], dtype=np.float32)
+            if values.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Vector dimension {values.shape[1]} does not match namespace "
+                    f"dimension {self.dimension}"
+                )
+            norms = np.linalg.norm(values, axis=1, keepdims=True)
+            values /= np.where(norms == 0, 1, norms)
+
+            new_ids = [v["id"] for v in vectors if v["id"] not in self.slots]
+            self._ensure_capacity(len(self.ids) + max(0, len(set(new_ids)) - len(self.free)))
+
+            slots = []
+            records = []
+            for vector in vectors:
+                slot = self.slots.get(vector["id"])
+                if slot is None:
+                    slot = self.free.pop() if self.free else len(self.ids)
+                    if slot == len(self.ids):
+                        self.ids.append(None)
+                        self.metadata.append(None)
+                    self.slots[vector["id"]] = slot
+                    self.ids[slot] = vector["id"]
+                self.metadata[slot] = vector.get("metadata", {})
+                slots.append(slot)
+                records.append([slot, vector["id"], self.metadata[slot]])
+
+            self.matrix[slots] = values
+            if self._uses_codes():
+                self._encode(slots, values)
+
+            if self.hnsw is not None:
+                for slot in slots:
+                    try:
+                        self.hnsw.unmark_deleted(slot)
+                    except RuntimeError:
+                        pass  # Not deleted (or new)
+                self.hnsw.add_items(values, slots)
+
+            self._log(records)
+            return len(vectors)
+
+    def delete(self, vector_ids: List[str]) -> int:
+        """Delete vectors by ID"""
+        with self.lock:
+            records = []
+            for vector_id in vector_ids:
+                slot = self.slots.pop(vector_id, None)
+                if slot is None:
+                    continue
+                self.ids[slot] = None
+                self.metadata[slot] = None
+                self.matrix[slot] = 0
+                if self.codes is not None:
+                    self.codes[slot] = 0
+                self.free.append(slot)
+                if self.hnsw is not None:
+                    self.hnsw.mark_deleted(slot)
+                records.append([slot, None, None])
+
+            if records:
+                self._log(records)
+            return len(records)
+
+    def delete_by_filter(self, filter_metadata: Dict[str, Any]) -> int:
+        """Delete vectors matching a metadata filter"""
+        with self.lock:
+            return self.delete([
+                vector_id
+                for vector_id, metadata in zip(self.ids, self.metadata)
+                if vector_id is not None and matches_filter(metadata, filter_metadata)
+            ])
+
+    def query(
+        self,
+        query_vector: List[float],
+        top_k: int,
+        filter_metadata: Optional[Dict[str, Any]],
+        include_metadata: bool,
+    ) -> List[Dict[str, Any]]:
+        """Find the most similar vectors"""
+        with self.lock:
+            if self.dimension is None or not self.slots:
+                return []
+
+            query = np.asarray(query_vector, dtype=np.float32)
+            if query.shape[0] != self.dimension:
+                raise ValueError(
+                    f"Query dimension {query.shape[0]} does not match namespace "
+                    f"dimension {self.dimension}"
+                )
+            query /= np.linalg.norm(query) or 1.0
+
+            size = len(self.ids)
+            mask = np.fromiter((vector_id is not None for vector_id in self.ids), dtype=bool, count=size)
+            if filter_metadata:
+                mask &= np.fromiter(
+                    (
+                        metadata is not None and matches_filter(metadata, filter_metadata)
+                        for metadata in self.metadata
+                    ),
+                    dtype=bool,
+                    count=size,
+                )
+
+            candidates = int(mask.sum())
+            k = min(top_k, candidates)
+            if k == 0:
+                return []
+
+            hnsw = self._get_hnsw()
+            if hnsw is not None:
+                hnsw.set_ef(max(settings.LOCAL_VECTOR_STORE_HNSW_EF, k))
+                labels, distances = hnsw.knn_query(
+                    query,
+                    k=k,
+                    filter=(lambda label: bool(mask[label])) if filter_metadata else None,
+                )
+                top = labels[0].astype(int)
+                scores = 1.0 - distances[0]  # "ip" space distance is 1 - dot product
+            elif self._uses_codes():
+                # Shortlist by codes, then re-score the shortlist exactly
+                approximate = self._approximate_scores(query, size)
+                approximate[~mask] = -np.inf
+                shortlist_size = min(candidates, k * self.OVERSAMPLING[self.quantization])
+                shortlist = np.argpartition(-approximate, shortlist_size - 1)[:shortlist_size]
+                shortlist.sort()  # Sequential reads from the memory map
+                exact = self.matrix[shortlist] @ query
+                order = np.argsort(-exact)[:k]
+                top = shortlist[order]
+                scores = exact[order]
+            else:
+                all_scores = self.matrix[:size] @ query
+                all_scores[~mask] = -np.inf
+                top = np.argpartition(-all_scores, k - 1)[:k]
+                top = top[np.argsort(-all_scores[top])]
+                scores = all_scores[top]
+
+            return [
+                {
+                    "id": self.ids[slot],
+                    "score": float(score),
+                    "metadata": dict(self.metadata[slot]) if include_metadata else {},
+                }
+                for slot, score in zip(top, scores)
+            ]
+
+    def _get_hnsw(self):
+        """Get the HNSW index, building it once the namespace is large enough"""
+        if (
+            self.hnsw is None
+            and hnswlib is not None
+            and settings.LOCAL_VECTOR_STORE_HNSW
+            and len(self.slots) >= settings.LOCAL_VECTOR_STORE_HNSW_MIN_SIZE
+        ):
+            index = hnswlib.Index(space="ip", dim=self.dimension)
+            index.init_index(max_elements=self.capacity, ef_construction=200, M=16)
+            slots = np.fromiter(self.slots.values(), dtype=np.int64, count=len(self.slots))
+            index.add_items(self.matrix[slots], slots)
+            self.hnsw = index
+            logger.info(f"Built HNSW index for {self.path.name} ({len(slots)} vectors)")
+
+        return self.hnsw
+
+    def stats(self) -> Dict[str, Any]:
+        """Get namespace statistics"""
+        with self.lock:
+            return {
+                "vector_count": len(self.slots),
+                "dimension": self.dimension,
+                "capacity": self.capacity,
+                "hnsw": self.hnsw is not None,
+                "quantization": self.quantization,
+                "coarse_dimensions": self._code_dimensions() if self.dimension else None,
+                "vector_bytes": self.capacity * (self.dimension or 0) * 4,
+                "code_bytes": (
+                    self.codes.nbytes
+                    + (self.code_scales.nbytes if self.code_scales is not None else 0)
+                    if self.codes is not None else 0
+                ),
+            }
+
+
+class LocalVectorStore(BaseVectorStore):
+    """
+    In-process vector store for development, benchmarks and small tenants
+
+    Each namespace is a memory-mapped float32 matrix under
+    LOCAL_VECTOR_STORE_PATH searched by brute-force dot product (optionally
+    with a first pass on int8/binary codes or on the leading dimensions,
+    re-ranked with the float vectors), or by an optional HNSW index
+    (hnswlib) for large namespaces. Work runs in worker threads so the
+    event loop is never blocked.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.LOCAL_VECTOR_STORE_PATH,
+        quantization: str = settings.LOCAL_VECTOR_STORE_QUANTIZATION,
+        coarse_dimensions: int = settings.LOCAL_VECTOR_STORE_COARSE_DIMENSIONS,
+    ):
+        """
+        Initialize local vector store
+
+        Args:
+            path: Directory holding one subdirectory per namespace
+            quantization: First-stage codes: "none", "int8" or "binary"
+            coarse_dimensions: Leading dimensions used by the first pass (0 = all)
+        """
+        self.logger = logger
+        self.path = Path(path)
+        self.quantization = quantization
+        self.coarse_dimensions = coarse_dimensions
+        self._namespaces: Dict[str, _Namespace] = {}
+        self._lock = threading.Lock()
+
+    def _namespace(self, namespace: Optional[str]) -> _Namespace:
+        """Get (loading or creating) a namespace"""
+        name = re.sub(r"[^\w.-]", "_", namespace or "") or "_default"
+        with self._lock:
+            if name not in self._namespaces:
+                self._namespaces[name] = _Namespace(
+                    self.path / name, self.quantization, self.coarse_dimensions
+                )
+            return self._namespaces[name]
+
+    async def upsert_vectors(
+        self,
+        vectors: List[Dict[str, Any]],
+        namespace: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Upsert vectors
+
+        Args:
+            vectors: List of vectors with id, values and metadata
+            namespace: Optional namespace for multi-tenancy
+
+        Returns:
+            Dict with the total upserted count and per-batch counts
+        """
+        if not vectors:
+            return {"upserted_count": 0, "batches": []}
+
+        upserted = await asyncio.to_thread(self._namespace(namespace).upsert, vectors)
+
+        self.logger.info(f"Upserted {upserted} vectors (namespace: {namespace or 'default'})")
+
+        return {
+            "upserted_count": upserted,
+            "batches": [{"batch": 0, "size": len(vectors), "upserted_count": upserted}],
+        }
+
+    async def query(
+        self,
+        query_vector: List[float],
+        top_k: int = 10,
+        namespace: Optional[str] = None,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Query for similar vectors
+
+        Args:
+            query_vector: Query embedding vector
+            top_k: Number of results to return
+            namespace: Optional namespace for multi-tenancy
+            filter_metadata: Optional metadata filters
+            include_metadata: Whether to include metadata in results
+
+        Returns:
+            List of matches with scores and metadata
+        """
+        return await asyncio.to_thread(
+            self._namespace(namespace).query,
+            query_vector,
+            top_k,
+            filter_metadata,
+            include_metadata,
+        )
+
+    async def delete_vectors(
+        self,
+        vector_ids: List[str],
+        namespace: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Delete vectors
+
+        Args:
+            vector_ids: List of vector IDs to delete
+            namespace: Optional namespace
+
+        Returns:
+            Dict with deletion results
+        """
+        if not vector_ids:
+            return {"deleted_count": 0}
+
+        deleted = await asyncio.to_thread(self._namespace(namespace).delete, vector_ids)
+        return {"deleted_count": deleted}
+
+    async def delete_by_filter(
+        self,
+        filter_metadata: Dict[str, Any],
+        namespace: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Delete vectors by metadata filter
+
+        Args:
+            filter_metadata: Metadata filter for deletion
+            namespace: Optional namespace
+
+        Returns:
+            Dict with deletion results
+        """
+        deleted = await asyncio.to_thread(
+            self._namespace(namespace).delete_by_filter, filter_metadata
+        )
+        return {"status": "deleted", "deleted_count": deleted}
+
+    async def get_index_stats(self, namespace: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get index statistics
+
+        Args:
+            namespace: Optional namespace
+
+        Returns:
+            Dict with index stats
+        """
+        names = [p.name for p in self.path.iterdir() if p.is_dir()] if self.path.exists() else []
+        stats = [self._namespace(name).stats() for name in names]
+
+        namespace_stats = self._namespace(namespace).stats() if namespace else None
+
+        return {
+            "total_vector_count": sum(s["vector_count"] for s in stats),
+            "dimension": next((s["dimension"] for s in stats if s["dimension"]), None),
+            "index_fullness": 0.0,
+            "namespace_count": len(stats),
+            "namespace_stats": namespace_stats,
+        }
+
+
+# Create singleton instance
+local_vector_store = LocalVectorStore()
@@ -0,0 +1,192 @@
+"""
+Parse Cache Service
+Parse results of source files, keyed by the file's revision
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import uuid
+import zlib
+from typing import Dict, Any, Optional, Tuple
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models import ParseCache
+
+logger = logging.getLogger(__name__)
+
+
+class ParseCacheService:
+    """
+    Cache of parsed and chunked files in the parse_cache table
+
+    Entries are keyed by (data source, external ID) and hold the latest
+    revision only: a content hash or provider revision of the file (e.g.
+    Drive's md5Checksum), so a rename or sharing change that leaves the
+    bytes alone still hits. The parse key covers the chunking settings and
+    the tokenizer model, since cached chunks are only valid for those.
+
+    Google Docs, Sheets and Slides are exported and have no md5Checksum;
+    their revision is the Drive file version, which also changes on sharing
+    and other metadata changes, so those files miss more often than binary
+    files but are never served stale.
+
+    The parse result (text, metadata and chunks) is stored as zlib-compressed
+    JSON. Files without a revision are not cached.
+    """
+
+    # Bump when parser output changes, to invalidate all entries
+    PARSER_VERSION = 1
+
+    # Document metadata fields holding a content revision, in order of preference
+    REVISION_FIELDS = ("md5_checksum", "content_hash", "revision", "etag")
+
+    COMPRESSION_LEVEL = 6
+
+    def __init__(self):
+        """Initialize parse cache"""
+        self.logger = logger
+
+    def get_revision(self, doc_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Content revision of a fetched file
+
+        Args:
+            doc_data: Document data from the connector
+
+        Returns:
+            Revision string, or None if the connector provides none
+        """
+        metadata = doc_data.get("metadata") or {}
+        for field in self.REVISION_FIELDS:
+            value = doc_data.get(field) or metadata.get(field)
+            if value:
+                return f"{field}:{value}"
+
+        return None
+
+    def get_parse_key(self, model: Optional[str]) -> str:
+        """Hash of everything besides the file that determines the cached chunks"""
+        key = (
+            f"{self.PARSER_VERSION}:{model or settings.EMBEDDING_MODEL}:"
+            f"{settings.CHUNK_MAX_TOKENS}:{settings.CHUNK_OVERLAP_TOKENS}"
+        )
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+    async def get(
+        self,
+        db: AsyncSession,
+        data_source_id: uuid.UUID,
+        external_id: str,
+        revision: str,
+        model: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up the parse result of a file revision
+
+        Args:
+            db: Database session
+            data_source_id: Data source of the file
+            external_id: External ID of the file
+            revision: Revision from get_revision
+            model: Embedding model whose tokenizer sized the chunks
+
+        Returns:
+            Parse result with chunks (as from parse_and_chunk_document), or None
+        """
+        result = await db.execute(
+            select(ParseCache.data).where(
+                ParseCache.data_source_id == data_source_id,
+                ParseCache.external_id == external_id,
+                ParseCache.revision == revision,
+                ParseCache.parse_key == self.get_parse_key(model),
+            )
+        )
+        data = result.scalar_one_or_none()
+
+        if data is None:
+            metrics.increment("parse_cache_misses")
+            return None
+
+        metrics.increment("parse_cache_hits")
+        return await asyncio.to_thread(self._decode, data)
+
+    async def put(
+        self,
+        db: AsyncSession,
+        data_source_id: uuid.UUID,
+        external_id: str,
+        revision: str,
+        parsed: Dict[str, Any],
+        model: Optional[str] = None,
+    ):
+        """
+        Store the parse result of a file revision (replacing older revisions)
+
+        The row is written in the caller's transaction and not committed.
+
+        Args:
+            db: Database session
+            data_source_id: Data source of the file
+            external_id: External ID of the file
+            revision: Revision from get_revision
+            parsed: Parse result with chunks
+            model: Embedding model whose tokenizer sized the chunks
+        """
+        data, size = await asyncio.to_thread(self._encode, parsed)
+
+        if len(data) > settings.PARSE_CACHE_MAX_MB * 1024 * 1024:
+            self.logger.debug(f"Parse result of {external_id} too large to cache ({len(data)} bytes)")
+            return
+
+        values = {
+            "revision": revision,
+            "parse_key": self.get_parse_key(model),
+            "data": data,
+            "size_bytes": size,
+        }
+        stmt = pg_insert(ParseCache).values(
+            data_source_id=data_source_id,
+            external_id=external_id,
+            **values,
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_parse_cache_source_external_id",
+            set_={**values, "updated_at": func.now()},
+        )
+        await db.execute(stmt)
+
+    async def delete(self, db: AsyncSession, data_source_id: uuid.UUID, external_id: str):
+        """
+        Drop the entry of a file removed at the source (not committed)
+
+        Args:
+            db: Database session
+            data_source_id: Data source of the file
+            external_id: External ID of the file
+        """
+        await db.execute(
+            delete(ParseCache).where(
+                ParseCache.data_source_id == data_source_id,
+                ParseCache.external_id == external_id,
+            )
+        )
+
+    def _encode(self, parsed: Dict[str, Any]) -> Tuple[bytes, int]:
+        """Compressed JSON of a parse result and its uncompressed size"""
+        raw = json.dumps(parsed, default=str, separators=(",", ":")).encode("utf-8")
+        return zlib.compress(raw, self.COMPRESSION_LEVEL), len(raw)
+
+    @staticmethod
+    def _decode(data: bytes) -> Dict[str, Any]:
+        """Parse result from compressed JSON"""
+        return json.loads(zlib.decompress(data))
+
+
+# Create singleton instance
+parse_cache_service = ParseCacheService()
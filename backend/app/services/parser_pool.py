@@ -0,0 +1,189 @@
+"""
+Parser Pool
+Bounded process pool for CPU-bound document parsing
+"""
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _init_worker(memory_limit_mb: int):
+    """Worker process setup: cap the address space so a runaway parse fails alone"""
+    if memory_limit_mb <= 0:
+        return
+
+    try:
+        import resource
+
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError) as e:
+        # Not available on every platform; the timeout still applies
+        logger.warning(f"Could not set parser memory limit: {e}")
+
+
+class ParserPool:
+    """
+    Runs parse functions in worker processes, off the event loop
+
+    Parsing (pypdf, python-docx, openpyxl, lxml, chardet) is CPU-bound and
+    holds the GIL, so it runs in a ProcessPoolExecutor sized to
+    PARSER_PROCESSES and scales across cores. Each task has a timeout and
+    each worker a memory limit (RLIMIT_AS).
+
+    The executor cannot tell which worker runs a task, so a hung worker is
+    dealt with by retiring its pool: new tasks go to a fresh pool at once,
+    the other tasks still running in the old one finish normally (each
+    within its own timeout), and then the old pool's processes, including
+    the hung one, are terminated. A worker that runs out of memory or
+    crashes breaks its whole pool; the tasks that were running in it are
+    retried once in a single-worker pool of their own, so only the task
+    that caused the crash fails.
+
+    With PARSER_PROCESSES = 0 tasks run in a thread instead (no isolation).
+    """
+
+    def __init__(self):
+        """Initialize parser pool (workers start on first use)"""
+        self.logger = logger
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._generation = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # generation -> tasks running in that pool
+        self._running: Dict[int, int] = {}
+        # generation -> retired pool, terminated once its tasks are done
+        self._retired: Dict[int, ProcessPoolExecutor] = {}
+
+    def _new_executor(self, max_workers: int) -> ProcessPoolExecutor:
+        """Process pool with the worker memory limit"""
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            # Fresh interpreters: forking a process with an event loop and threads is unsafe
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(settings.PARSER_MEMORY_LIMIT_MB,),
+            max_tasks_per_child=settings.PARSER_MAX_TASKS_PER_CHILD or None,
+        )
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the shared process pool on first use"""
+        if self._executor is None:
+            self._executor = self._new_executor(settings.PARSER_PROCESSES)
+            self._generation += 1
+        return self._executor
+
+    def _retire(self, generation: int):
+        """Send new tasks to a fresh pool; the old one is terminated once idle"""
+        if self._executor is None or generation != self._generation:
+            return
+
+        self._retired[generation], self._executor = self._executor, None
+        metrics.increment("parser_pool_restarts")
+
+    def _task_done(self, generation: int):
+        """Count a finished task and terminate its pool if retired and now idle"""
+        self._running[generation] -= 1
+        if self._running[generation]:
+            return
+
+        del self._running[generation]
+        executor = self._retired.pop(generation, None)
+        if executor is not None:
+            self._terminate(executor)
+
+    @staticmethod
+    def _terminate(executor: ProcessPoolExecutor):
+        """Stop a pool without waiting for its running tasks"""
+        # Running tasks cannot be cancelled, so their processes are terminated.
+        # ProcessPoolExecutor has no public access to its workers: _processes
+        # (pid -> Process) is private but present in CPython 3.8 through 3.13.
+        # Without it, shutdown() below stops idle workers only.
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _submit(self, executor: ProcessPoolExecutor, function: Callable[..., Any], *args: Any) -> Any:
+        """Run a task in a pool with the task timeout"""
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(executor, function, *args),
+                timeout=settings.PARSER_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Parsing timed out after {settings.PARSER_TIMEOUT_SECONDS} seconds")
+
+    async def run(self, function: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a picklable function in a worker process
+
+        Args:
+            function: Module-level function to run
+            *args: Picklable arguments
+
+        Returns:
+            The function's result
+
+        Raises:
+            TimeoutError: If the task exceeds PARSER_TIMEOUT_SECONDS
+            RuntimeError: If the worker process died (e.g. out of memory)
+            Exception: Whatever the function raised
+        """
+        if self._semaphore is None:
+            # Queue beyond the workers here rather than inside the executor
+            self._semaphore = asyncio.Semaphore(max(settings.PARSER_PROCESSES, 1))
+
+        async with self._semaphore:
+            with metrics.histogram("parse_seconds").time():
+                if settings.PARSER_PROCESSES <= 0:
+                    return await asyncio.wait_for(
+                        asyncio.to_thread(function, *args),
+                        timeout=settings.PARSER_TIMEOUT_SECONDS,
+                    )
+
+                executor = self._get_executor()
+                generation = self._generation
+                self._running[generation] = self._running.get(generation, 0) + 1
+                try:
+                    return await self._submit(executor, function, *args)
+                except TimeoutError:
+                    self.logger.warning("Parse task timed out, replacing parser pool once its other tasks finish")
+                    self._retire(generation)
+                    raise
+                except BrokenProcessPool:
+                    # A dying worker takes the pool's running tasks with it
+                    self.logger.warning("Parser process died, replacing parser pool")
+                    self._retire(generation)
+                finally:
+                    self._task_done(generation)
+
+                # Retry alone, so a task that crashes again takes no other task with it
+                isolated = self._new_executor(1)
+                try:
+                    return await self._submit(isolated, function, *args)
+                except BrokenProcessPool:
+                    raise RuntimeError("Parser process died (out of memory or crashed)")
+                finally:
+                    self._terminate(isolated)
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+        for executor in self._retired.values():
+            self._terminate(executor)
+        self._retired.clear()
+
+
+# Create singleton instance
+parser_pool = ParserPool()
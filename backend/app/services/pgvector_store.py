@@ -0,0 +1,408 @@
+"""
+pgvector Vector Store
+Chunk embeddings stored in Postgres next to DocumentChunk
+"""
+import logging
+from typing import List, Dict, Any, Optional
+import uuid
+
+from sqlalchemy import select, update, and_, or_, func, text, bindparam, true
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import metrics
+from app.models import Document, DocumentChunk
+from app.services.embeddings import embeddings_service
+from app.services.vector_store_base import BaseVectorStore
+
+logger = logging.getLogger(__name__)
+
+
+class PgVectorStore(BaseVectorStore):
+    """
+    Vector store backed by the document_chunks.embedding column
+
+    Embeddings are written by the sync together with their chunk rows and
+    searched through an HNSW index (cosine distance). A query is a single
+    SQL statement that does the nearest-neighbour search, the tenant filter
+    (namespace = org ID), the is_deleted exclusion and the document
+    hydration, so search needs no follow-up lookups for vector matches.
+
+    Metadata filters are translated to SQL on the document and chunk
+    columns listed in FILTER_COLUMNS. The HNSW index is scanned before
+    those filters apply, so with pgvector 0.8+ queries use iterative index
+    scans, and a query that still comes back short of top_k (e.g. a small
+    organization in a large table) is re-run as an exact scan of the
+    filtered rows.
+    """
+
+    stores_in_database = True
+
+    # First pgvector version with iterative index scans
+    ITERATIVE_SCAN_VERSION = (0, 8, 0)
+
+    # Filterable metadata fields -> (column, value conversion)
+    FILTER_COLUMNS = {
+        "document_id": (Document.id, uuid.UUID),
+        "org_id": (Document.org_id, uuid.UUID),
+        "source_type": (Document.source_type, str),
+        "title": (Document.title, str),
+        "url": (Document.url, str),
+        "chunk_index": (DocumentChunk.chunk_index, int),
+    }
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        """
+        Initialize pgvector store
+
+        Args:
+            session_factory: Factory for the store's own database sessions
+        """
+        self.logger = logger
+        self.session_factory = session_factory
+        self._iterative_scan: Optional[bool] = None
+
+    def get_dimensions(self) -> Optional[int]:
+        """The embedding column holds PGVECTOR_DIMENSIONS values"""
+        return settings.PGVECTOR_DIMENSIONS
+
+    def validate_dimensions(self):
+        """
+        Check that the embedding column fits the configured embedding model
+
+        Raises:
+            ValueError: If PGVECTOR_DIMENSIONS differs from the model's output size
+        """
+        dimensions = embeddings_service.get_dimensions(settings.EMBEDDING_MODEL)
+        if dimensions != settings.PGVECTOR_DIMENSIONS:
+            raise ValueError(
+                f"PGVECTOR_DIMENSIONS is {settings.PGVECTOR_DIMENSIONS} but "
+                f"{settings.EMBEDDING_MODEL} produces {dimensions}-dimensional embeddings"
+            )
+
+    async def upsert_vectors(
+        self,
+        vectors: List[Dict[str, Any]],
+        namespace: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Set the embeddings of existing chunk rows (matched by vector_id)
+
+        The sync stores embeddings while inserting chunks; this is for
+        re-embedding chunks that are already stored.
+
+        Args:
+            vectors: List of dicts with id and values (metadata is ignored)
+            namespace: Optional namespace (org ID)
+
+        Returns:
+            Dict with upsert results
+        """
+        if not vectors:
+            return {"upserted_count": 0, "batches": []}
+
+        chunks = DocumentChunk.__table__
+        stmt = (
+            update(chunks)
+            .where(chunks.c.vector_id == bindparam("b_vector_id"))
+            .values(embedding=bindparam("b_embedding"), embedding_status="completed")
+        )
+
+        async with self.session_factory() as db:
+            result = await db.execute(
+                stmt,
+                [{"b_vector_id": vector["id"], "b_embedding": vector["values"]} for vector in vectors],
+            )
+            await db.commit()
+
+        upserted = result.rowcount
+        self.logger.info(f"Stored {upserted} embeddings (namespace: {namespace or 'default'})")
+
+        return {
+            "upserted_count": upserted,
+            "batches": [{"batch": 0, "size": len(vectors), "upserted_count": upserted}],
+        }
+
+    async def query(
+        self,
+        query_vector: List[float],
+        top_k: int = 10,
+        namespace: Optional[str] = None,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Query for similar chunks of non-deleted documents
+
+        Args:
+            query_vector: Query embedding vector
+            top_k: Number of results to return
+            namespace: Optional namespace (org ID)
+            filter_metadata: Optional metadata filters
+            include_metadata: Whether to include metadata in results
+
+        Returns:
+            List of matches with scores and metadata; metadata holds the full
+            chunk content and the result columns of its document
+        """
+        distance = DocumentChunk.embedding.cosine_distance(query_vector)
+
+        conditions = [
+            DocumentChunk.embedding.is_not(None),
+            Document.is_deleted == False,
+        ]
+        if namespace:
+            conditions.append(Document.org_id == uuid.UUID(namespace))
+        if filter_metadata:
+            conditions.append(self._filter_clause(filter_metadata))
+
+        base = (
+            select(
+                DocumentChunk.id.label("chunk_id"),
+                DocumentChunk.vector_id,
+                DocumentChunk.chunk_index,
+                DocumentChunk.content.label("chunk_content"),
+                DocumentChunk.position,
+                distance.label("distance"),
+                Document.id,
+                Document.title,
+                # Same columns as the search service's document lookup
+                func.substr(Document.content, 1, 300).label("content_head"),
+                Document.source_type,
+                Document.url,
+                Document.source_created_at,
+                Document.created_at,
+                Document.source_metadata,
+            )
+            .join(Document, Document.id == DocumentChunk.document_id)
+            .where(and_(*conditions))
+            .limit(top_k)
+        )
+
+        # Without iterative scans, filtered HNSW scans return at most ef_search rows
+        ef_search = max(settings.PGVECTOR_HNSW_EF_SEARCH, top_k)
+
+        with metrics.histogram("vector_query_seconds").time():
+            async with self.session_factory() as db:
+                async with db.begin():
+                    await db.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+                    if await self._supports_iterative_scan(db):
+                        await db.execute(text("SET LOCAL hnsw.iterative_scan = relaxed_order"))
+                    result = await db.execute(base.order_by(distance))
+                    rows = result.all()
+
+                    if len(rows) < top_k:
+                        # Ordering by an expression the index cannot serve
+                        # makes Postgres filter first and sort exactly
+                        metrics.increment("pgvector_exact_scans")
+                        result = await db.execute(base.order_by(distance + 0))
+                        rows = result.all()
+
+        # Relaxed order scans may return rows slightly out of order
+        rows.sort(key=lambda row: row.distance)
+
+        matches = []
+        for row in rows:
+            match = {
+                "id": row.vector_id or f"chunk:{row.chunk_id}",
+                "score": 1.0 - row.distance,
+            }
+            if include_metadata:
+                match["metadata"] = {
+                    "document_id": str(row.id),
+                    "chunk_index": row.chunk_index,
+                    "content": row.chunk_content,
+                    "position": row.position,
+                    "document": {
+                        "id": row.id,
+                        "title": row.title,
+                        "content_head": row.content_head,
+                        "source_type": row.source_type,
+                        "url": row.url,
+                        "source_created_at": row.source_created_at,
+                        "created_at": row.created_at,
+                        "source_metadata": row.source_metadata,
+                    },
+                }
+            matches.append(match)
+
+        self.logger.info(f"Found {len(matches)} matches (namespace: {namespace or 'default'})")
+
+        return matches
+
+    async def delete_vectors(
+        self,
+        vector_ids: List[str],
+        namespace: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Clear the embeddings of chunks
+
+        Args:
+            vector_ids: List of vector IDs to delete
+            namespace: Optional namespace (org ID)
+
+        Returns:
+            Dict with deletion results
+        """
+        if not vector_ids:
+            return {"deleted_count": 0}
+
+        return await self._clear_embeddings(
+            DocumentChunk.vector_id.in_(vector_ids), namespace
+        )
+
+    async def delete_by_filter(
+        self,
+        filter_metadata: Dict[str, Any],
+        namespace: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Clear the embeddings of chunks matching a metadata filter
+
+        Args:
+            filter_metadata: Metadata filter for deletion
+            namespace: Optional namespace (org ID)
+
+        Returns:
+            Dict with deletion results
+        """
+        result = await self._clear_embeddings(self._filter_clause(filter_metadata), namespace)
+        return {"status": "deleted", **result}
+
+    async def get_index_stats(self, namespace: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get index statistics
+
+        Args:
+            namespace: Optional namespace (org ID)
+
+        Returns:
+            Dict with index stats
+        """
+        stored = DocumentChunk.embedding.is_not(None)
+
+        async with self.session_factory() as db:
+            total = await db.scalar(
+                select(func.count()).select_from(DocumentChunk).where(stored)
+            )
+
+            namespace_stats = None
+            if namespace:
+                count = await db.scalar(
+                    select(func.count())
+                    .select_from(DocumentChunk)
+                    .join(Document, Document.id == DocumentChunk.document_id)
+                    .where(stored, Document.org_id == uuid.UUID(namespace))
+                )
+                namespace_stats = {
+                    "vector_count": count,
+                    "dimension": settings.PGVECTOR_DIMENSIONS,
+                }
+
+        return {
+            "total_vector_count": total,
+            "dimension": settings.PGVECTOR_DIMENSIONS,
+            "index_fullness": 0.0,
+            "namespace_stats": namespace_stats,
+        }
+
+    async def _clear_embeddings(self, condition, namespace: Optional[str]) -> Dict[str, Any]:
+        """Set embedding to NULL on the chunks matching a condition"""
+        documents = select(Document.id)
+        if namespace:
+            documents = documents.where(Document.org_id == uuid.UUID(namespace))
+
+        chunk_ids = (
+            select(DocumentChunk.id)
+            .join(Document, Document.id == DocumentChunk.document_id)
+            .where(condition, DocumentChunk.document_id.in_(documents))
+        )
+
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(DocumentChunk)
+                .where(DocumentChunk.id.in_(chunk_ids))
+                .values(embedding=None)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+        return {"deleted_count": result.rowcount}
+
+    async def _supports_iterative_scan(self, db) -> bool:
+        """Whether the installed pgvector has iterative index scans (checked once)"""
+        if self._iterative_scan is None:
+            result = await db.execute(
+                text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+            )
+            version = result.scalar_one_or_none() or "0"
+            self._iterative_scan = (
+                tuple(int(part) for part in version.split(".")[:3] if part.isdigit())
+                >= self.ITERATIVE_SCAN_VERSION
+            )
+            if not self._iterative_scan:
+                self.logger.info(
+                    f"pgvector {version} has no iterative index scans; "
+                    f"short filtered queries fall back to exact scans"
+                )
+
+        return self._iterative_scan
+
+    def _filter_clause(self, filter_metadata: Dict[str, Any]):
+        """
+        Translate a Pinecone-style metadata filter to a SQL condition
+
+        Args:
+            filter_metadata: Metadata filter
+
+        Returns:
+            SQLAlchemy boolean expression
+        """
+        clauses = []
+        for key, condition in filter_metadata.items():
+            if key in ("$and", "$or"):
+                parts = [self._filter_clause(part) for part in condition]
+                clauses.append(and_(*parts) if key == "$and" else or_(*parts))
+                continue
+
+            if key not in self.FILTER_COLUMNS:
+                raise ValueError(f"Unsupported pgvector filter field: {key}")
+            column, convert = self.FILTER_COLUMNS[key]
+
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+
+            for operator, value in condition.items():
+                clauses.append(self._compare(column, convert, operator, value))
+
+        return and_(*clauses) if clauses else true()
+
+    @staticmethod
+    def _compare(column, convert, operator: str, value: Any):
+        """SQL condition for one filter operator"""
+        if operator == "$exists":
+            return column.is_not(None) if value else column.is_(None)
+        if operator in ("$in", "$nin"):
+            values = [convert(item) for item in value]
+            return column.in_(values) if operator == "$in" else column.not_in(values)
+
+        value = convert(value)
+        if operator == "$eq":
+            return column == value
+        if operator == "$ne":
+            return column != value
+        if operator == "$gt":
+            return column > value
+        if operator == "$gte":
+            return column >= value
+        if operator == "$lt":
+            return column < value
+        if operator == "$lte":
+            return column <= value
+
+        raise ValueError(f"Unsupported filter operator: {operator}")
+
+
+# Create singleton instance
+pgvector_store = PgVectorStore()
@@ -1,19 +1,44 @@
 """
 Pinecone Vector Storage Service
 """
+import asyncio
+import functools
+import hashlib
+import json
 import logging
-from typing import List, Dict, Any, Optional
+import random
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Callable
 import uuid
 
 from pinecone import Pinecone, ServerlessSpec
 
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.embeddings import embeddings_service
+from app.services.vector_store_base import BaseVectorStore
 
 logger = logging.getLogger(__name__)
 
 
-class PineconeService:
-    """Service for managing vectors in Pinecone"""
+class PineconeService(BaseVectorStore):
+    """
+    Service for managing vectors in Pinecone
+
+    The Pinecone client is blocking, so write calls run on a dedicated thread
+    pool instead of the event loop. Upserts and deletes are split into
+    size-bounded batches that are sent concurrently and retried with
+    exponential backoff and full jitter.
+
+    Queries run on a separate pool. Identical queries that are in flight at
+    the same time (same namespace, vector, filter and top_k) share a single
+    call, and query latencies are recorded in the metrics registry.
+    """
+
+    # Maximum IDs per delete request
+    DELETE_BATCH_SIZE = 1000
 
     def __init__(self):
         """Initialize Pinecone client"""
@@ -22,33 +47,130 @@ class PineconeService:
         self.index_name = settings.PINECONE_INDEX_NAME
         self.index = None
         self._initialized = False
+        self._init_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.PINECONE_MAX_CONCURRENCY,
+            thread_name_prefix="pinecone",
+        )
+        # Queries get their own pool so a running sync cannot starve searches
+        self._query_executor = ThreadPoolExecutor(
+            max_workers=settings.PINECONE_QUERY_CONCURRENCY,
+            thread_name_prefix="pinecone-query",
+        )
+        self._in_flight_queries: Dict[tuple, asyncio.Future] = {}
 
     def _ensure_initialized(self):
         """Lazy initialization of Pinecone client"""
         if self._initialized:
             return
 
-        try:
-            self.pc = Pinecone(api_key=settings.PINECONE_API_KEY)
-            self._init_index()
-            self._initialized = True
-        except Exception as e:
-            self.logger.error(f"Failed to initialize Pinecone: {str(e)}")
-            raise
+        with self._init_lock:
+            if self._initialized:
+                return
+
+            try:
+                self.pc = Pinecone(api_key=settings.PINECONE_API_KEY)
+                self._init_index()
+                self._initialized = True
+            except Exception as e:
+                self.logger.error(f"Failed to initialize Pinecone: {str(e)}")
+                raise
+
+    async def _run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking client call on the Pinecone thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(func, *args, **kwargs),
+        )
+
+    async def _run_query(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking client call on the query thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._query_executor,
+            functools.partial(func, *args, **kwargs),
+        )
+
+    async def _run_with_retries(self, description: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking client call, retrying failures with backoff and full jitter
+
+        Args:
+            description: Operation name (used in logs)
+            func: Blocking callable
+
+        Returns:
+            Result of func
+        """
+        for attempt in range(settings.PINECONE_MAX_RETRIES + 1):
+            try:
+                return await self._run(func, *args, **kwargs)
+            except Exception as e:
+                if attempt == settings.PINECONE_MAX_RETRIES:
+                    raise
+
+                delay = random.uniform(0, settings.PINECONE_RETRY_BASE_DELAY * 2 ** attempt)
+                self.logger.warning(
+                    f"Pinecone {description} failed (attempt {attempt + 1}), "
+                    f"retrying in {delay:.2f}s: {str(e)}"
+                )
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    def _vector_size(vector: Dict[str, Any]) -> int:
+        """Estimate the serialized size of a vector in a request"""
+        # Floats are sent as JSON numbers of up to ~20 characters
+        return (
+            len(vector["id"])
+            + 20 * len(vector["values"])
+            + len(json.dumps(vector["metadata"], default=str))
+            + 64
+        )
+
+    def _split_batches(self, vectors: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Split vectors into batches bounded by count and request size"""
+        batches = []
+        batch: List[Dict[str, Any]] = []
+        batch_bytes = 0
+
+        for vector in vectors:
+            size = self._vector_size(vector)
+            if batch and (
+                len(batch) >= settings.PINECONE_UPSERT_BATCH_SIZE
+                or batch_bytes + size > settings.PINECONE_MAX_REQUEST_BYTES
+            ):
+                batches.append(batch)
+                batch = []
+                batch_bytes = 0
+
+            batch.append(vector)
+            batch_bytes += size
+
+        if batch:
+            batches.append(batch)
+
+        return batches
+
+    def get_dimensions(self) -> Optional[int]:
+        """All namespaces share one index, sized for EMBEDDING_MODEL"""
+        return embeddings_service.get_dimensions()
 
     def _init_index(self):
         """Initialize or create Pinecone index"""
         try:
+            # Index size follows the embedding model (and EMBEDDING_DIMENSIONS)
+            dimension = embeddings_service.get_dimensions()
+
             # Check if index exists
             existing_indexes = self.pc.list_indexes().names()
 
             if self.index_name not in existing_indexes:
-                self.logger.info(f"Creating Pinecone index: {self.index_name}")
+                self.logger.info(f"Creating Pinecone index: {self.index_name} ({dimension} dimensions)")
 
-                # Create index with OpenAI ada-002 dimensions (1536)
                 self.pc.create_index(
                     name=self.index_name,
-                    dimension=1536,  # OpenAI text-embedding-ada-002
+                    dimension=dimension,
                     metric="cosine",
                     spec=ServerlessSpec(
                         cloud="aws",
@@ -57,6 +179,13 @@ class PineconeService:
                 )
 
                 self.logger.info(f"Pinecone index created: {self.index_name}")
+            else:
+                index_dimension = self.pc.describe_index(self.index_name).dimension
+                if index_dimension != dimension:
+                    raise ValueError(
+                        f"Pinecone index {self.index_name} has {index_dimension} dimensions, "
+                        f"but {settings.EMBEDDING_MODEL} produces {dimension}"
+                    )
 
             # Connect to index
             self.index = self.pc.Index(self.index_name)
@@ -95,12 +224,13 @@ class PineconeService:
             namespace: Optional namespace for multi-tenancy
 
         Returns:
-            Dict with upsert results
+            Dict with the total upserted count and per-batch counts
         """
-        self._ensure_initialized()
         try:
             if not vectors:
-                return {"upserted_count": 0}
+                return {"upserted_count": 0, "batches": []}
+
+            await self._run(self._ensure_initialized)
 
             # Format vectors for Pinecone
             formatted_vectors = []
@@ -111,19 +241,52 @@ class PineconeService:
                     "metadata": vec.get("metadata", {}),
                 })
 
-            # Upsert to Pinecone
-            result = self.index.upsert(
-                vectors=formatted_vectors,
-                namespace=namespace or ""
+            # Upsert batches concurrently (bounded by the thread pool)
+            batches = self._split_batches(formatted_vectors)
+            results = await asyncio.gather(
+                *[
+                    self._run_with_retries(
+                        "upsert",
+                        self.index.upsert,
+                        vectors=batch,
+                        namespace=namespace or "",
+                    )
+                    for batch in batches
+                ],
+                return_exceptions=True,
             )
 
+            batch_results = []
+            errors = []
+            for i, (batch, result) in enumerate(zip(batches, results)):
+                if isinstance(result, Exception):
+                    errors.append(result)
+                    batch_results.append({
+                        "batch": i,
+                        "size": len(batch),
+                        "upserted_count": 0,
+                        "error": str(result),
+                    })
+                else:
+                    batch_results.append({
+                        "batch": i,
+                        "size": len(batch),
+                        "upserted_count": result.upserted_count,
+                    })
+
+            upserted_count = sum(batch["upserted_count"] for batch in batch_results)
+
             self.logger.info(
-                f"Upserted {result.upserted_count} vectors to Pinecone "
-                f"(namespace: {namespace or 'default'})"
+                f"Upserted {upserted_count} vectors to Pinecone in {len(batches)} batches "
+                f"(namespace: {namespace or 'default'}, failed batches: {len(errors)})"
             )
 
+            if errors:
+                raise errors[0]
+
             return {
-                "upserted_count": result.upserted_count,
+                "upserted_count": upserted_count,
+                "batches": batch_results,
             }
 
         except Exception as e:
@@ -151,16 +314,50 @@ class PineconeService:
         Returns:
             List of matches with scores and metadata
         """
-        self._ensure_initialized()
+        key = self._query_key(query_vector, top_k, namespace, filter_metadata, include_metadata)
+
+        with metrics.histogram("vector_query_seconds").time():
+            task = self._in_flight_queries.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._query(
+                    query_vector, top_k, namespace, filter_metadata, include_metadata,
+                ))
+                self._in_flight_queries[key] = task
+                task.add_done_callback(lambda _: self._in_flight_queries.pop(key, None))
+            else:
+                metrics.increment("vector_query_coalesced")
+
+            # Shielded so a cancelled caller does not cancel the shared call
+            matches = await asyncio.shield(task)
+
+        # Callers get their own list and match dicts
+        return [dict(match) for match in matches]
+
+    async def _query(
+        self,
+        query_vector: List[float],
+        top_k: int,
+        namespace: Optional[str],
+        filter_metadata: Optional[Dict[str, Any]],
+        include_metadata: bool,
+    ) -> List[Dict[str, Any]]:
+        """Run a query on the query executor"""
         try:
+            # Reads never touch the write pool, not even to initialize,
+            # so searches do not queue behind a sync's upserts
+            if not self._initialized:
+                await self._run_query(self._ensure_initialized)
+
             # Query Pinecone
-            results = self.index.query(
-                vector=query_vector,
-                top_k=top_k,
-                namespace=namespace or "",
-                filter=filter_metadata,
-                include_metadata=include_metadata,
-            )
+            with metrics.histogram("pinecone_query_seconds").time():
+                results = await self._run_query(
+                    self.index.query,
+                    vector=query_vector,
+                    top_k=top_k,
+                    namespace=namespace or "",
+                    filter=filter_metadata,
+                    include_metadata=include_metadata,
+                )
 
             # Format results
             matches = []
@@ -182,6 +379,19 @@ class PineconeService:
             self.logger.error(f"Error querying Pinecone: {str(e)}", exc_info=True)
             raise
 
+    @staticmethod
+    def _query_key(
+        query_vector: List[float],
+        top_k: int,
+        namespace: Optional[str],
+        filter_metadata: Optional[Dict[str, Any]],
+        include_metadata: bool,
+    ) -> tuple:
+        """Key identifying identical queries for coalescing"""
+        vector_hash = hashlib.sha1(array("d", query_vector).tobytes()).hexdigest()
+        filter_key = json.dumps(filter_metadata, sort_keys=True, default=str)
+        return (namespace or "", vector_hash, filter_key, top_k, include_metadata)
+
     async def delete_vectors(
         self,
         vector_ids: List[str],
@@ -197,16 +407,22 @@ class PineconeService:
         Returns:
             Dict with deletion results
         """
-        self._ensure_initialized()
         try:
             if not vector_ids:
                 return {"deleted_count": 0}
 
+            await self._run(self._ensure_initialized)
+
             # Delete from Pinecone
-            self.index.delete(
-                ids=vector_ids,
-                namespace=namespace or ""
-            )
+            await asyncio.gather(*[
+                self._run_with_retries(
+                    "delete",
+                    self.index.delete,
+                    ids=vector_ids[i:i + self.DELETE_BATCH_SIZE],
+                    namespace=namespace or "",
+                )
+                for i in range(0, len(vector_ids), self.DELETE_BATCH_SIZE)
+            ])
 
             self.logger.info(
                 f"Deleted {len(vector_ids)} vectors from Pinecone "
@@ -234,12 +450,15 @@ class PineconeService:
         Returns:
             Dict with deletion results
         """
-        self._ensure_initialized()
         try:
+            await self._run(self._ensure_initialized)
+
             # Delete by filter
-            self.index.delete(
+            await self._run_with_retries(
+                "delete",
+                self.index.delete,
                 filter=filter_metadata,
-                namespace=namespace or ""
+                namespace=namespace or "",
             )
 
             self.logger.info(
@@ -263,9 +482,9 @@ class PineconeService:
         Returns:
             Dict with index stats
         """
-        self._ensure_initialized()
         try:
-            stats = self.index.describe_index_stats()
+            await self._run(self._ensure_initialized)
+            stats = await self._run(self.index.describe_index_stats)
 
             namespace_stats = None
             if namespace and namespace in stats.namespaces:
@@ -0,0 +1,265 @@
+"""
+Search Result Cache
+Per-organization cache of search responses with near-duplicate query matching
+"""
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+import uuid
+
+import numpy as np
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class SearchResultCache:
+    """
+    Tenant-scoped cache of search responses
+
+    Entries are grouped per organization and keyed by the query embedding
+    plus the search parameters (filters, limit, min_score, projection). A
+    lookup first tries the exact embedding, then scans the org's entries with
+    the same parameters for one whose embedding has cosine similarity above
+    similarity_threshold, so near-duplicate phrasings share a result. The
+    scan is one matrix-vector product over the org's stacked embeddings,
+    rebuilt lazily after the org's entries change.
+
+    Whole responses only share entries across phrasings when they depend on
+    the embedding alone (vector mode without highlights); the search service
+    puts the query text into the parameters otherwise. Hybrid searches also
+    cache their vector matches under separate parameters, so a near-duplicate
+    query reuses those and only re-runs the lexical leg and the fusion.
+
+    Every org has a generation number that is bumped by invalidate_org when
+    a sync changes its documents. Entries remember the generation they were
+    computed at and are ignored once it moves on. With REDIS_URL the
+    generation is kept in Redis so invalidations reach every API process;
+    Redis errors bypass the cache rather than risk serving stale results.
+    Without Redis, invalidations only reach the process that ran the sync,
+    and other processes may serve stale results for up to ttl_seconds.
+    """
+
+    GENERATION_KEY_PREFIX = "search_generation:"
+
+    def __init__(
+        self,
+        max_entries_per_org: int = settings.SEARCH_RESULT_CACHE_ENTRIES_PER_ORG,
+        max_orgs: int = settings.SEARCH_RESULT_CACHE_MAX_ORGS,
+        ttl_seconds: int = settings.SEARCH_RESULT_CACHE_TTL_SECONDS,
+        similarity_threshold: float = settings.SEARCH_RESULT_CACHE_SIMILARITY,
+        redis_url: Optional[str] = None,
+    ):
+        """
+        Initialize result cache
+
+        Args:
+            max_entries_per_org: Maximum cached responses per organization
+            max_orgs: Maximum number of organizations kept in the cache
+            ttl_seconds: Lifetime of an entry
+            similarity_threshold: Minimum cosine similarity of a near-duplicate query
+            redis_url: Redis URL holding the org generations (None for local only)
+        """
+        self.logger = logger
+        self.max_entries_per_org = max_entries_per_org
+        self.max_orgs = max_orgs
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.redis_url = redis_url
+
+        # org_id -> OrderedDict[(vector hash, params) -> entry]
+        self._orgs: "OrderedDict[uuid.UUID, OrderedDict]" = OrderedDict()
+        self._generations: Dict[uuid.UUID, int] = {}
+        # org_id -> {(params, dimensions) -> (entry keys, stacked vectors)}
+        self._matrices: Dict[uuid.UUID, Dict[Tuple, Tuple[List[Tuple], np.ndarray]]] = {}
+        self._redis = None
+
+    async def lookup(
+        self,
+        org_id: uuid.UUID,
+        query_vector: List[float],
+        params: Tuple,
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
+        """
+        Look up a cached response
+
+        Args:
+            org_id: Organization ID
+            query_vector: Query embedding
+            params: Hashable search parameters (filters, limit, ...)
+
+        Returns:
+            Tuple of (cached response or None, current generation). Pass the
+            generation to store(); it is None when the cache is unavailable.
+        """
+        generation = await self._get_generation(org_id)
+        if generation is None:
+            return None, None
+
+        entries = self._orgs.get(org_id)
+        if not entries:
+            metrics.increment("search_result_cache_misses")
+            return None, generation
+
+        now = time.monotonic()
+        vector = self._normalize(query_vector)
+        key = (self._vector_hash(vector), params)
+
+        entry = entries.get(key)
+        if entry is None:
+            # Near-duplicate query: best cosine similarity above the threshold
+            keys, matrix = self._get_matrix(org_id, entries, params, len(vector))
+            if keys:
+                similarities = matrix @ vector
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.similarity_threshold:
+                    key = keys[best]
+                    entry = entries[key]
+
+        if entry is None or entry["generation"] != generation or entry["expires_at"] <= now:
+            metrics.increment("search_result_cache_misses")
+            return None, generation
+
+        entries.move_to_end(key)
+        self._orgs.move_to_end(org_id)
+        metrics.increment("search_result_cache_hits")
+
+        return entry["response"], generation
+
+    async def store(
+        self,
+        org_id: uuid.UUID,
+        query_vector: List[float],
+        params: Tuple,
+        response: Dict[str, Any],
+        generation: Optional[int],
+    ):
+        """
+        Store a response
+
+        Args:
+            org_id: Organization ID
+            query_vector: Query embedding
+            params: Hashable search parameters
+            response: Search response to cache
+            generation: Generation returned by the preceding lookup()
+        """
+        if generation is None:
+            return
+
+        vector = self._normalize(query_vector)
+        entries = self._orgs.setdefault(org_id, OrderedDict())
+        self._orgs.move_to_end(org_id)
+
+        key = (self._vector_hash(vector), params)
+        entries[key] = {
+            "vector": vector,
+            "response": response,
+            "generation": generation,
+            "expires_at": time.monotonic() + self.ttl_seconds,
+        }
+        entries.move_to_end(key)
+        self._matrices.pop(org_id, None)
+
+        while len(entries) > self.max_entries_per_org:
+            entries.popitem(last=False)
+
+        while len(self._orgs) > self.max_orgs:
+            evicted_org, _ = self._orgs.popitem(last=False)
+            self._generations.pop(evicted_org, None)
+            self._matrices.pop(evicted_org, None)
+
+    async def invalidate_org(self, org_id: uuid.UUID):
+        """
+        Invalidate all cached responses of an organization
+
+        Args:
+            org_id: Organization ID
+        """
+        self._orgs.pop(org_id, None)
+        self._matrices.pop(org_id, None)
+        self._generations[org_id] = self._generations.get(org_id, 0) + 1
+
+        client = self._get_redis()
+        if client is not None:
+            try:
+                await client.incr(f"{self.GENERATION_KEY_PREFIX}{org_id}")
+            except Exception as e:
+                self.logger.warning(f"Search result cache invalidation failed: {str(e)}")
+
+        self.logger.info(f"Invalidated search result cache for org {org_id}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            "orgs": len(self._orgs),
+            "entries": sum(len(entries) for entries in self._orgs.values()),
+            "redis_enabled": self.redis_url is not None,
+        }
+
+    async def _get_generation(self, org_id: uuid.UUID) -> Optional[int]:
+        """Get the current generation of an org (None if it cannot be read)"""
+        client = self._get_redis()
+        if client is None:
+            return self._generations.get(org_id, 0)
+
+        try:
+            value = await client.get(f"{self.GENERATION_KEY_PREFIX}{org_id}")
+        except Exception as e:
+            self.logger.warning(f"Search result cache generation lookup failed: {str(e)}")
+            return None
+
+        return int(value) if value is not None else 0
+
+    def _get_matrix(
+        self,
+        org_id: uuid.UUID,
+        entries: OrderedDict,
+        params: Tuple,
+        dimensions: int,
+    ) -> Tuple[List[Tuple], np.ndarray]:
+        """Keys and stacked vectors of an org's entries with the given params and size"""
+        matrices = self._matrices.setdefault(org_id, {})
+        matrix_key = (params, dimensions)
+
+        if matrix_key not in matrices:
+            keys = [
+                key for key, entry in entries.items()
+                if key[1] == params and len(entry["vector"]) == dimensions
+            ]
+            vectors = [entries[key]["vector"] for key in keys]
+            matrices[matrix_key] = (
+                keys,
+                np.stack(vectors) if vectors else np.empty((0, dimensions), dtype=np.float32),
+            )
+
+        return matrices[matrix_key]
+
+    def _get_redis(self):
+        """Lazily create the Redis client"""
+        if self._redis is None and self.redis_url:
+            self._redis = aioredis.from_url(self.redis_url)
+        return self._redis
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        """Scale vector to unit length so dot products are cosine similarities"""
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(vector)) or 1.0
+        return vector / norm
+
+    @staticmethod
+    def _vector_hash(vector: np.ndarray) -> str:
+        """Hash of a normalized vector"""
+        return hashlib.sha1(vector.tobytes()).hexdigest()
+
+
+# Create singleton instance
+search_result_cache = SearchResultCache(
+    redis_url=settings.REDIS_URL if settings.SEARCH_RESULT_CACHE_REDIS_ENABLED else None,
+)
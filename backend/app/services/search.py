@@ -2,17 +2,25 @@
 Semantic Search Service
 AI-powered search across all connected data sources
 """
+import asyncio
+import itertools
 import logging
+import re
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import uuid
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, func
 
+from app.core.config import settings
+from app.core.metrics import metrics
 from app.models import Document, DocumentChunk
 from app.services.embeddings import embeddings_service
-from app.services.pinecone_service import pinecone_service
+from app.services.embedding_migration import embedding_migration_service
+from app.services.lexical_search import lexical_search_service
+from app.services.vector_store import vector_store
+from app.services.result_cache import search_result_cache
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +28,18 @@ logger = logging.getLogger(__name__)
 class SearchService:
     """Service for semantic search across documents"""
 
+    # Result projections: "preview" omits full document content
+    PROJECTIONS = ("preview", "full")
+
+    # Retrieval modes
+    MODES = ("hybrid", "vector", "lexical")
+
+    # Matched chunks returned per document
+    MAX_CHUNKS_PER_RESULT = 3
+
+    # Highlighted spans returned per chunk
+    MAX_HIGHLIGHTS = 20
+
     def __init__(self):
         """Initialize search service"""
         self.logger = logger
@@ -32,9 +52,29 @@ class SearchService:
         limit: int = 10,
         source_types: Optional[List[str]] = None,
         min_score: float = 0.7,
+        projection: str = "preview",
+        highlight: bool = False,
+        mode: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
-        Perform semantic search across documents
+        Perform hybrid semantic + keyword search across documents
+
+        In "hybrid" mode vector matches (filtered by min_score) and lexical
+        matches are fused with reciprocal rank fusion; scores are then fused
+        scores normalized to 0-1. Short identifier queries (emails, ticket
+        numbers, quoted phrases) are answered from the lexical index alone
+        when it has matches, skipping the embedding call.
+
+        Responses are cached per org (see SearchResultCache). In vector mode
+        without highlights the key is the query embedding, so near-duplicate
+        phrasings share a response; in hybrid mode and with highlights the
+        normalized query text (whitespace collapsed, case-folded) is part of
+        the key, and only the vector matches of hybrid searches are shared
+        between near-duplicates. Lexical searches are not cached.
+
+        Results carry a content preview and the text of the matched chunks;
+        full document bodies are only included with projection="full" (use
+        get_document_content to fetch them lazily instead).
 
         Args:
             db: Database session
@@ -43,90 +83,224 @@ class SearchService:
             limit: Maximum number of results
             source_types: Optional filter by source types (e.g., ["salesforce", "slack"])
             min_score: Minimum similarity score (0-1)
+            projection: "preview" (default) or "full" to include document content
+            highlight: Whether to add query term spans to matched chunks
+            mode: "hybrid", "vector" or "lexical" (default: SEARCH_DEFAULT_MODE)
 
         Returns:
             Dict with search results
         """
+        if projection not in self.PROJECTIONS:
+            raise ValueError(f"Unknown projection: {projection}")
+
+        mode = mode or settings.SEARCH_DEFAULT_MODE
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+
         start_time = datetime.utcnow()
 
         self.logger.info(
             f"Searching for: '{query}' (org: {org_id}, limit: {limit}, "
-            f"sources: {source_types or 'all'})"
+            f"sources: {source_types or 'all'}, mode: {mode})"
         )
 
-        # Create query embedding
-        embedding_result = await embeddings_service.create_embedding(query)
-        query_vector = embedding_result["embedding"]
+        ranked_matches: List[Dict[str, Any]] = []
+        keyword_fast_path = False
 
-        # Build Pinecone filter
-        filter_metadata = {}
-        if source_types:
-            filter_metadata["source_type"] = {"$in": source_types}
+        # Keyword fast path: identifier lookups are answered without an embedding
+        if mode != "vector" and lexical_search_service.is_keyword_query(query):
+            lexical_matches = await lexical_search_service.search(
+                db, org_id, query, limit=limit * 2, source_types=source_types
+            )
+            if lexical_matches:
+                ranked_matches = self._fuse([lexical_matches])
+                keyword_fast_path = True
+
+        cache_generation = None
+        if not keyword_fast_path:
+            query_vector = None
+            vector_matches = None
+            if mode != "lexical":
+                # Model and namespace of the org (changed by embedding migrations)
+                org_embedding = await embedding_migration_service.get_org_embedding(db, org_id)
+
+                # Create query embedding
+                embedding_result = await embeddings_service.embed_query(
+                    query, model=org_embedding["model"]
+                )
+                query_vector = embedding_result["embedding"]
+
+                # Serve repeated and near-duplicate queries from the result cache
+                cache_params = (
+                    tuple(sorted(source_types or [])),
+                    limit,
+                    min_score,
+                    projection,
+                    mode,
+                    # Lexical matches and highlights depend on the query text
+                    # itself, not just on its embedding
+                    " ".join(query.split()).casefold() if mode != "vector" or highlight else None,
+                    org_embedding["namespace"],
+                )
+                if settings.SEARCH_RESULT_CACHE_ENABLED:
+                    cached, cache_generation = await search_result_cache.lookup(
+                        org_id, query_vector, cache_params
+                    )
+                    if cached is not None:
+                        search_time = (datetime.utcnow() - start_time).total_seconds()
+                        metrics.histogram("search_seconds").observe(search_time)
+                        return {
+                            **cached,
+                            "query": query,
+                            "search_time_seconds": search_time,
+                            "cached": True,
+                        }
+
+                    if mode == "hybrid" and cache_generation is not None:
+                        # The vector leg depends on the embedding only, so
+                        # near-duplicate phrasings share it and just the
+                        # lexical leg runs again
+                        vector_leg_params = (
+                            "vector_leg",
+                            tuple(sorted(source_types or [])),
+                            limit,
+                            min_score,
+                            org_embedding["namespace"],
+                        )
+                        cached_leg, _ = await search_result_cache.lookup(
+                            org_id, query_vector, vector_leg_params
+                        )
+                        if cached_leg is not None:
+                            vector_matches = cached_leg["matches"]
+
+            cached_vector_leg = vector_matches is not None
+            searched_matches, lexical_matches = await asyncio.gather(
+                self._vector_search(
+                    org_id, query_vector, limit * 2, source_types, None,
+                    namespace=org_embedding["namespace"],
+                )
+                if mode != "lexical" and not cached_vector_leg else self._no_matches(),
+                lexical_search_service.search(
+                    db, org_id, query, limit=limit * 2, source_types=source_types
+                )
+                if mode != "vector" else self._no_matches(),
+            )
 
-        # Search Pinecone
-        namespace = str(org_id)  # Use org_id as namespace
-        matches = await pinecone_service.query(
-            query_vector=query_vector,
-            top_k=limit * 2,  # Get more results for filtering
-            namespace=namespace,
-            filter_metadata=filter_metadata if filter_metadata else None,
-            include_metadata=True,
-        )
+            if not cached_vector_leg:
+                migration = org_embedding["migration"] if mode != "lexical" else None
+                if migration and migration["status"] == "dual_read":
+                    # Compare with the new model's results in the background (scores
+                    # of different models are not comparable, so before min_score)
+                    embedding_migration_service.schedule_dual_read(self._dual_read(
+                        org_id, migration, query, searched_matches, limit * 2, source_types
+                    ))
+                vector_matches = [match for match in searched_matches if match["score"] >= min_score]
+
+                if mode == "hybrid" and cache_generation is not None:
+                    await search_result_cache.store(
+                        org_id, query_vector, vector_leg_params,
+                        {"matches": vector_matches}, cache_generation,
+                    )
 
-        # Filter by score
-        filtered_matches = [
-            match for match in matches
-            if match["score"] >= min_score
+            if mode == "vector":
+                ranked_matches = vector_matches
+            elif mode == "lexical":
+                ranked_matches = self._fuse([lexical_matches])
+            else:
+                ranked_matches = self._fuse([vector_matches, lexical_matches])
+
+        # Group chunk hits by document (best match first)
+        document_hits: Dict[uuid.UUID, List[Dict[str, Any]]] = {}
+        for match in ranked_matches:
+            document_id = uuid.UUID(match["metadata"]["document_id"])
+            document_hits.setdefault(document_id, []).append(match)
+
+        # Backends that search in Postgres return matches with their document;
+        # only the remaining documents are loaded
+        documents: Dict[uuid.UUID, Dict[str, Any]] = {}
+        if projection != "full":
+            for document_id, hits in document_hits.items():
+                for match in hits:
+                    if "document" in match["metadata"]:
+                        documents[document_id] = match["metadata"]["document"]
+                        break
+
+        documents.update(await self._load_documents(
+            db,
+            org_id,
+            [document_id for document_id in document_hits if document_id not in documents],
+            include_content=projection == "full",
+        ))
+
+        # Keep the best documents in score order
+        selected = [
+            (documents[document_id], hits[:self.MAX_CHUNKS_PER_RESULT])
+            for document_id, hits in document_hits.items()
+            if document_id in documents
         ][:limit]
 
-        # Get full document details from database
-        results = []
-        for match in filtered_matches:
-            metadata = match["metadata"]
-            document_id = uuid.UUID(metadata["document_id"])
-
-            # Get document from database
-            result = await db.execute(
-                select(Document).where(
-                    and_(
-                        Document.id == document_id,
-                        Document.org_id == org_id,
-                        Document.is_deleted == False,
-                    )
-                )
-            )
-            document = result.scalar_one_or_none()
+        # Hydrated matches already carry the full chunk text
+        chunk_rows = await self._load_chunks(
+            db,
+            [document["id"] for document, _ in selected],
+            [
+                match["id"]
+                for _, hits in selected
+                for match in hits
+                if "document" not in match["metadata"]
+            ],
+        )
 
-            if not document:
-                continue
+        # Assemble results
+        results = []
+        for document, hits in selected:
+            matched_chunks = []
+            for match in hits:
+                chunk = chunk_rows.get(match["id"])
+                text = chunk.content if chunk else match["metadata"].get("content", "")
+                matched_chunk = {
+                    "chunk_index": chunk.chunk_index if chunk else match["metadata"].get("chunk_index", 0),
+                    "content": text,
+                    "position": chunk.position if chunk else match["metadata"].get("position"),
+                    "score": match["score"],
+                }
+                if highlight:
+                    matched_chunk["highlights"] = self._find_highlights(text, query)
+                matched_chunks.append(matched_chunk)
+
+            best_chunk = matched_chunks[0]
 
             # Format result
-            results.append({
-                "document_id": str(document.id),
-                "title": document.title,
-                "content": document.content,
+            result = {
+                "document_id": str(document["id"]),
+                "title": document["title"],
                 "content_preview": self._create_preview(
-                    document.content,
-                    metadata.get("content", ""),
+                    best_chunk["content"] or document["content_head"],
                     max_length=300
                 ),
-                "source_type": document.source_type,
-                "url": document.url,
-                "score": match["score"],
-                "chunk_index": metadata.get("chunk_index", 0),
-                "created_at": document.source_created_at or document.created_at,
-                "metadata": document.source_metadata or {},
-            })
+                "matched_chunks": matched_chunks,
+                "source_type": document["source_type"],
+                "url": document["url"],
+                "score": best_chunk["score"],
+                "chunk_index": best_chunk["chunk_index"],
+                "created_at": document["source_created_at"] or document["created_at"],
+                "metadata": document["source_metadata"] or {},
+            }
+            if projection == "full":
+                result["content"] = document["content"]
+
+            results.append(result)
 
         # Calculate search time
         search_time = (datetime.utcnow() - start_time).total_seconds()
+        metrics.histogram("search_seconds").observe(search_time)
 
         self.logger.info(
             f"Found {len(results)} results in {search_time:.2f}s "
             f"(query: '{query[:50]}...')"
         )
 
-        return {
+        response = {
             "query": query,
             "results": results,
             "total_results": len(results),
@@ -135,6 +309,286 @@ class SearchService:
                 "source_types": source_types,
                 "min_score": min_score,
             },
+            "projection": projection,
+            "mode": mode,
+            "keyword_fast_path": keyword_fast_path,
+        }
+
+        if cache_generation is not None:
+            await search_result_cache.store(
+                org_id, query_vector, cache_params, response, cache_generation
+            )
+
+        return response
+
+    async def _vector_search(
+        self,
+        org_id: uuid.UUID,
+        query_vector: List[float],
+        top_k: int,
+        source_types: Optional[List[str]],
+        min_score: Optional[float],
+        namespace: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Query the vector index
+
+        Args:
+            org_id: Organization ID
+            query_vector: Query embedding
+            top_k: Number of chunks to retrieve
+            source_types: Optional filter by source types
+            min_score: Minimum similarity score (None for all top_k matches)
+            namespace: Vector namespace (default: org ID)
+
+        Returns:
+            Matches above min_score, best first
+        """
+        # Build metadata filter
+        filter_metadata = {}
+        if source_types:
+            filter_metadata["source_type"] = {"$in": source_types}
+
+        # Search the vector store
+        matches = await vector_store.query(
+            query_vector=query_vector,
+            top_k=top_k,
+            namespace=namespace or str(org_id),
+            filter_metadata=filter_metadata if filter_metadata else None,
+            include_metadata=True,
+        )
+
+        return sorted(
+            (match for match in matches if min_score is None or match["score"] >= min_score),
+            key=lambda match: match["score"],
+            reverse=True,
+        )
+
+    async def _dual_read(
+        self,
+        org_id: uuid.UUID,
+        migration: Dict[str, Any],
+        query: str,
+        primary_matches: List[Dict[str, Any]],
+        top_k: int,
+        source_types: Optional[List[str]],
+    ):
+        """
+        Run a query against a migration's shadow namespace and record the overlap
+
+        Both sides are compared unthresholded: min_score is tuned to the
+        current model's score distribution, not the new one's.
+
+        Args:
+            org_id: Organization ID
+            migration: Active migration (from get_org_embedding)
+            query: Search query
+            primary_matches: Top vector matches of the active namespace
+            top_k: Number of chunks to retrieve
+            source_types: Optional filter by source types
+        """
+        embedding_result = await embeddings_service.embed_query(
+            query, model=migration["target_model"]
+        )
+        shadow_matches = await self._vector_search(
+            org_id,
+            embedding_result["embedding"],
+            top_k,
+            source_types,
+            None,
+            namespace=migration["namespace"],
+        )
+
+        await embedding_migration_service.record_dual_read(
+            migration["id"], primary_matches, shadow_matches
+        )
+
+    @staticmethod
+    async def _no_matches() -> List[Dict[str, Any]]:
+        """Placeholder for a retriever that is not used in the current mode"""
+        return []
+
+    def _fuse(self, ranked_lists: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Fuse ranked match lists with reciprocal rank fusion
+
+        Each match scores sum(1 / (k + rank)) over the lists it appears in;
+        scores are normalized so a match ranked first everywhere scores 1.0.
+
+        Args:
+            ranked_lists: Match lists, best first (earlier lists win on metadata)
+
+        Returns:
+            Fused matches, best first
+        """
+        k = settings.SEARCH_RRF_K
+        scores: Dict[str, float] = {}
+        matches: Dict[str, Dict[str, Any]] = {}
+
+        for ranked in ranked_lists:
+            for rank, match in enumerate(ranked, 1):
+                scores[match["id"]] = scores.get(match["id"], 0.0) + 1 / (k + rank)
+                matches.setdefault(match["id"], match)
+
+        best_score = len(ranked_lists) / (k + 1)
+
+        return [
+            {**matches[match_id], "score": score / best_score}
+            for match_id, score in sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        ]
+
+    async def _load_documents(
+        self,
+        db: AsyncSession,
+        org_id: uuid.UUID,
+        document_ids: List[uuid.UUID],
+        include_content: bool = False,
+    ) -> Dict[uuid.UUID, Any]:
+        """
+        Load matched documents in a single query
+
+        Args:
+            db: Database session
+            org_id: Organization ID
+            document_ids: IDs of matched documents
+            include_content: Whether to load the full document content
+
+        Returns:
+            Dict of document ID to dict of the columns used in results
+        """
+        if not document_ids:
+            return {}
+
+        columns = [
+            Document.id,
+            Document.title,
+            # Fallback preview when the matched chunk is unavailable
+            func.substr(Document.content, 1, 300).label("content_head"),
+            Document.source_type,
+            Document.url,
+            Document.source_created_at,
+            Document.created_at,
+            Document.source_metadata,
+        ]
+        if include_content:
+            columns.append(Document.content)
+
+        result = await db.execute(
+            select(*columns).where(
+                and_(
+                    Document.id.in_(document_ids),
+                    Document.org_id == org_id,
+                    Document.is_deleted == False,
+                )
+            )
+        )
+
+        return {row.id: dict(row._mapping) for row in result}
+
+    async def _load_chunks(
+        self,
+        db: AsyncSession,
+        document_ids: List[uuid.UUID],
+        vector_ids: List[str],
+    ) -> Dict[str, Any]:
+        """
+        Load the text of matched chunks in a single query
+
+        Args:
+            db: Database session
+            document_ids: IDs of the result documents
+            vector_ids: Vector IDs of the matched chunks
+
+        Returns:
+            Dict of vector ID to row with chunk_index, content and position
+        """
+        if not vector_ids:
+            return {}
+
+        result = await db.execute(
+            select(
+                DocumentChunk.vector_id,
+                DocumentChunk.chunk_index,
+                DocumentChunk.content,
+                DocumentChunk.position,
+            ).where(
+                and_(
+                    DocumentChunk.document_id.in_(document_ids),
+                    DocumentChunk.vector_id.in_(vector_ids),
+                )
+            )
+        )
+
+        return {row.vector_id: row for row in result}
+
+    def _find_highlights(self, text: str, query: str) -> List[List[int]]:
+        """
+        Find spans of query terms in text
+
+        Args:
+            text: Chunk text
+            query: Search query
+
+        Returns:
+            List of [start, end] character offsets
+        """
+        terms = {term for term in re.findall(r"\w+", query.lower()) if len(term) > 2}
+        if not terms:
+            return []
+
+        pattern = re.compile(
+            r"\b(?:" + "|".join(re.escape(term) for term in sorted(terms)) + r")\w*",
+            re.IGNORECASE,
+        )
+
+        return [
+            [match.start(), match.end()]
+            for match in itertools.islice(pattern.finditer(text), self.MAX_HIGHLIGHTS)
+        ]
+
+    async def get_document_content(
+        self,
+        db: AsyncSession,
+        org_id: uuid.UUID,
+        document_id: uuid.UUID,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the full content of a document (fetched lazily by clients)
+
+        Args:
+            db: Database session
+            org_id: Organization ID
+            document_id: Document ID
+
+        Returns:
+            Dict with document content, or None if not found
+        """
+        result = await db.execute(
+            select(
+                Document.id,
+                Document.title,
+                Document.content,
+                Document.source_type,
+                Document.url,
+            ).where(
+                and_(
+                    Document.id == document_id,
+                    Document.org_id == org_id,
+                    Document.is_deleted == False,
+                )
+            )
+        )
+        document = result.one_or_none()
+
+        if not document:
+            return None
+
+        return {
+            "document_id": str(document.id),
+            "title": document.title,
+            "content": document.content,
+            "source_type": document.source_type,
+            "url": document.url,
         }
 
     async def search_with_ai_summary(
@@ -182,31 +636,24 @@ class SearchService:
 
     def _create_preview(
         self,
-        full_content: str,
-        chunk_content: str,
+        text: str,
         max_length: int = 300
     ) -> str:
         """
-        Create content preview, prioritizing the matching chunk
+        Create content preview from the best matching chunk
 
         Args:
-            full_content: Full document content
-            chunk_content: Matching chunk content
+            text: Matching chunk content
             max_length: Maximum preview length
 
         Returns:
             Preview text
         """
-        # Use chunk content if available and not too long
-        if chunk_content and len(chunk_content) <= max_length:
-            return chunk_content
-
-        # Otherwise, use beginning of full content
-        if len(full_content) <= max_length:
-            return full_content
+        if len(text) <= max_length:
+            return text
 
         # Truncate and add ellipsis
-        return full_content[:max_length].rsplit(" ", 1)[0] + "..."
+        return text[:max_length].rsplit(" ", 1)[0] + "..."
 
     async def get_search_suggestions(
         self,
@@ -272,6 +719,7 @@ class SearchService:
             query=query_text,
             limit=limit + 1,  # +1 because original doc will be in results
             min_score=0.6,
+            mode="vector",
         )
 
         # Filter out the original document
@@ -0,0 +1,270 @@
+"""
+Sync Pipeline
+Bounded, staged asyncio pipeline used by the data sync service
+"""
+import asyncio
+import logging
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sentinel marking the end of the stream on a stage queue
+_STOP = object()
+
+
+class PipelineStage:
+    """
+    A named pipeline stage backed by its own pool of asyncio workers
+
+    The handler receives one item and returns the item to forward to the
+    next stage, or None when the item is finished early (e.g. skipped).
+
+    When batch_size > 1 the handler receives a list of up to batch_size items
+    that were already waiting on the queue, and must return a list of the
+    same length (None entries are finished early).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[Any]],
+        concurrency: int = 1,
+        batch_size: int = 1,
+    ):
+        """
+        Initialize pipeline stage
+
+        Args:
+            name: Stage name (used in logs)
+            handler: Async callable processing an item (or a batch of items)
+            concurrency: Number of workers for this stage
+            batch_size: Maximum number of items handed to the handler at once
+        """
+        self.name = name
+        self.handler = handler
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+
+
+class SyncPipeline:
+    """
+    Staged pipeline joined by bounded queues
+
+    The source is consumed by a single producer (the fetch stage) and every
+    other stage runs its own worker pool. Because the queues between stages
+    are bounded, a slow stage applies backpressure all the way back to the
+    source instead of letting fetched documents pile up in memory.
+
+    on_complete is called once for every item that leaves the last stage or
+    is finished early by a handler; on_error is called for every item whose
+    handler raised. Errors in the source, or a stage task dying, abort the
+    whole run.
+    """
+
+    def __init__(
+        self,
+        stages: List[PipelineStage],
+        queue_size: int = 100,
+        on_complete: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Any, Exception], None]] = None,
+    ):
+        """
+        Initialize pipeline
+
+        Args:
+            stages: Ordered list of stages
+            queue_size: Capacity of each inter-stage queue
+            on_complete: Callback for finished items
+            on_error: Callback for failed items
+        """
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.on_complete = on_complete or (lambda item: None)
+        self.on_error = on_error or (lambda item, exc: None)
+
+    async def run(self, source: AsyncIterable[Any]) -> None:
+        """
+        Run every item from source through the pipeline
+
+        Args:
+            source: Async iterable producing work items
+        """
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+
+        tasks = []
+        for i, stage in enumerate(self.stages):
+            outbox = queues[i + 1] if i + 1 < len(self.stages) else None
+            next_concurrency = self.stages[i + 1].concurrency if outbox is not None else 0
+            tasks.append(asyncio.create_task(
+                self._run_stage(stage, queues[i], outbox, next_concurrency)
+            ))
+
+        # The producer runs alongside the stages: if a stage task dies, its
+        # queue stops draining and the producer would otherwise block forever
+        tasks.append(asyncio.create_task(
+            self._produce(source, queues[0], self.stages[0].concurrency)
+        ))
+
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _produce(
+        self,
+        source: AsyncIterable[Any],
+        outbox: asyncio.Queue,
+        consumers: int,
+    ):
+        """Feed items from the source into the first stage"""
+        async for item in source:
+            await outbox.put(item)
+
+        for _ in range(consumers):
+            await outbox.put(_STOP)
+
+    async def _run_stage(
+        self,
+        stage: PipelineStage,
+        inbox: asyncio.Queue,
+        outbox: Optional[asyncio.Queue],
+        next_concurrency: int,
+    ):
+        """Run all workers of a stage, then signal the next stage to stop"""
+        await asyncio.gather(*[
+            self._worker(stage, inbox, outbox)
+            for _ in range(stage.concurrency)
+        ])
+
+        if outbox is not None:
+            for _ in range(next_concurrency):
+                await outbox.put(_STOP)
+
+    async def _worker(
+        self,
+        stage: PipelineStage,
+        inbox: asyncio.Queue,
+        outbox: Optional[asyncio.Queue],
+    ):
+        """Process items from inbox until the stop sentinel is received"""
+        stopped = False
+
+        while not stopped:
+            item = await inbox.get()
+            if item is _STOP:
+                return
+
+            batch = [item]
+            while len(batch) < stage.batch_size:
+                try:
+                    extra = inbox.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if extra is _STOP:
+                    stopped = True
+                    break
+                batch.append(extra)
+
+            try:
+                if stage.batch_size > 1:
+                    results = await stage.handler(batch)
+                else:
+                    results = [await stage.handler(batch[0])]
+            except Exception as e:
+                for failed in batch:
+                    self.on_error(failed, e)
+                continue
+
+            for original, result in zip(batch, results):
+                if result is None:
+                    self.on_complete(original)
+                elif outbox is None:
+                    self.on_complete(result)
+                else:
+                    await outbox.put(result)
+
+
+class PageCheckpoint:
+    """
+    Derives a safe resume cursor from pages completing out of order
+
+    Pages are registered in fetch order with their item count and cursor.
+    The checkpoint only moves past a page once it and every earlier page
+    have finished, and it stops advancing at the first page with a failed
+    item, so that item is fetched again by the next sync.
+
+    Failed attempts are counted per item key across syncs (see failures).
+    Once an item has failed max_attempts times it is given up on: it counts
+    as finished, so one permanently failing item cannot stop incremental
+    sync for good.
+    """
+
+    def __init__(
+        self,
+        cursor: Any = None,
+        failures: Optional[Dict[str, int]] = None,
+        max_attempts: int = 0,
+    ):
+        """
+        Initialize checkpoint
+
+        Args:
+            cursor: Cursor the current sync started from
+            failures: Failed attempts per item key, persisted by earlier syncs
+            max_attempts: Attempts before a failing item is skipped (0 = never)
+        """
+        self.cursor = cursor
+        self.failures: Dict[str, int] = dict(failures or {})
+        self.max_attempts = max_attempts
+        self.skipped: List[str] = []
+        self._pages: dict = {}
+        self._next_page = 0
+        self._blocked = False
+
+    def add_page(self, page: int, size: int, cursor: Any):
+        """Register a fetched page (pages must be numbered from 0 in order)"""
+        self._pages[page] = {"pending": size, "cursor": cursor, "failed": False}
+        self._advance()
+
+    def item_done(self, page: int, failed: bool = False, key: Optional[str] = None):
+        """
+        Mark one item of a page as finished
+
+        Args:
+            page: Page the item was fetched with
+            failed: Whether processing the item failed
+            key: Item key (e.g. external ID) for counting failed attempts
+        """
+        if key is not None:
+            if not failed:
+                self.failures.pop(key, None)
+            else:
+                self.failures[key] = self.failures.get(key, 0) + 1
+                if self.max_attempts and self.failures[key] >= self.max_attempts:
+                    logger.warning(f"Giving up on {key} after {self.failures[key]} failed attempts")
+                    del self.failures[key]
+                    self.skipped.append(key)
+                    failed = False
+
+        state = self._pages[page]
+        state["pending"] -= 1
+        state["failed"] = state["failed"] or failed
+        self._advance()
+
+    def _advance(self):
+        """Move the cursor past every leading completed page"""
+        while not self._blocked and self._pages.get(self._next_page, {}).get("pending") == 0:
+            state = self._pages.pop(self._next_page)
+            if state["failed"]:
+                self._blocked = True
+                return
+
+            if state["cursor"] is not None:
+                self.cursor = state["cursor"]
+            self._next_page += 1
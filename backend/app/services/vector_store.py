@@ -0,0 +1,35 @@
+"""
+Vector Store
+Selects the vector storage backend used by sync and search
+"""
+from app.core.config import settings
+from app.services.vector_store_base import BaseVectorStore
+
+
+def create_vector_store(backend: str = settings.VECTOR_STORE_BACKEND) -> BaseVectorStore:
+    """
+    Get the vector store for a backend name
+
+    Args:
+        backend: "pinecone", "local" or "pgvector"
+
+    Returns:
+        Vector store instance
+    """
+    if backend == "pinecone":
+        from app.services.pinecone_service import pinecone_service
+        return pinecone_service
+
+    if backend == "local":
+        from app.services.local_vector_store import local_vector_store
+        return local_vector_store
+
+    if backend == "pgvector":
+        from app.services.pgvector_store import pgvector_store
+        return pgvector_store
+
+    raise ValueError(f"Unknown vector store backend: {backend}")
+
+
+# Create singleton instance (backend selected by VECTOR_STORE_BACKEND)
+vector_store = create_vector_store()
@@ -0,0 +1,66 @@
+"""
+Vector Store Interface
+Common surface of the vector storage backends
+"""
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional
+
+
+class BaseVectorStore(ABC):
+    """
+    Base class for vector storage backends
+
+    Vectors are dicts with "id", "values" and "metadata"; namespaces
+    separate tenants (the org ID). Metadata filters use the Pinecone filter
+    syntax ($eq, $ne, $in, $nin, $gt, $gte, $lt, $lte, $exists, $and, $or).
+
+    Backends with stores_in_database keep embeddings on the document_chunks
+    rows: the sync writes them together with the chunks instead of upserting,
+    and query matches carry the hydrated document under metadata["document"].
+    """
+
+    # Embeddings are stored in document_chunks.embedding
+    stores_in_database = False
+
+    def get_dimensions(self) -> Optional[int]:
+        """Vector size every namespace must have (None if each namespace has its own)"""
+        return None
+
+    @abstractmethod
+    async def upsert_vectors(
+        self,
+        vectors: List[Dict[str, Any]],
+        namespace: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Insert or replace vectors; returns total and per-batch counts"""
+
+    @abstractmethod
+    async def query(
+        self,
+        query_vector: List[float],
+        top_k: int = 10,
+        namespace: Optional[str] = None,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Find the most similar vectors; returns matches with id, score and metadata"""
+
+    @abstractmethod
+    async def delete_vectors(
+        self,
+        vector_ids: List[str],
+        namespace: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Delete vectors by ID"""
+
+    @abstractmethod
+    async def delete_by_filter(
+        self,
+        filter_metadata: Dict[str, Any],
+        namespace: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Delete vectors matching a metadata filter"""
+
+    @abstractmethod
+    async def get_index_stats(self, namespace: Optional[str] = None) -> Dict[str, Any]:
+        """Get vector counts and dimension"""
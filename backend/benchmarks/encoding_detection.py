@@ -0,0 +1,120 @@
+"""
+Benchmark: encoding detection of text-like documents
+
+Compares, per file:
+- chardet: chardet.detect over the whole payload, then decode (the
+  previous parser path)
+- tiered: BOM, strict UTF-8, declared charset / hint, chardet on a
+  bounded sample (DocumentParserService._decode)
+
+and reports the time of each, the detected encodings and whether both
+decoded to the same text. Runs on a directory of real files with
+--corpus (e.g. an export of a data source), or on a synthetic corpus of
+common encodings.
+
+Usage (from backend/, with the usual environment configured):
+    python -m benchmarks.encoding_detection --corpus ~/corpus
+    python -m benchmarks.encoding_detection --size 5
+"""
+import argparse
+import time
+from pathlib import Path
+
+import chardet
+
+from app.services.document_parser import document_parser_service
+
+TEXT_SUFFIXES = {".txt", ".html", ".htm", ".md", ".json", ".csv"}
+
+ENGLISH = "The quarterly revenue report shows hiring plans for engineering and sales teams.\n"
+ACCENTED = "Café résumé naïve façade Größe — “quoted” 25 €\n"
+JAPANESE = "四半期の売上報告書は、各地域の採用計画を示しています。\n"
+CHINESE = "季度收入报告显示了各地区工程和销售团队的招聘计划。\n"
+
+
+def make_corpus(size_mb: float) -> list:
+    """Synthetic (name, bytes) pairs in the encodings seen in practice"""
+    lines = int(size_mb * 1024 * 1024 / len(ENGLISH))
+    english = ENGLISH * lines
+    return [
+        ("ascii.txt", english.encode("ascii")),
+        ("utf8.md", (english + ACCENTED * 100).encode("utf-8")),
+        ("utf8-bom.csv", (ACCENTED * 100 + english).encode("utf-8-sig")),
+        ("utf16.txt", (english[: len(english) // 4] + JAPANESE * 50).encode("utf-16")),
+        ("cp1252.csv", (english + ACCENTED * 100).encode("cp1252")),
+        ("cp1252-late.txt", (english + ACCENTED).encode("cp1252")),
+        ("latin1.html", (
+            '<html><head><meta charset="iso-8859-1"></head><body>'
+            + (english + "Größe façade\n").replace("\n", "<br>\n")
+            + "</body></html>"
+        ).encode("latin-1")),
+        ("shift_jis.txt", (JAPANESE * (lines // 4)).encode("shift_jis")),
+        ("gbk.txt", (CHINESE * (lines // 4)).encode("gbk")),
+    ]
+
+
+def load_corpus(directory: Path) -> list:
+    """(name, bytes) pairs of the text-like files below a directory"""
+    return [
+        (str(path.relative_to(directory)), path.read_bytes())
+        for path in sorted(directory.rglob("*"))
+        if path.is_file() and path.suffix.lower() in TEXT_SUFFIXES
+    ]
+
+
+def decode_chardet(content: bytes):
+    """Previous path: detect over the whole payload, then decode"""
+    encoding = chardet.detect(content)["encoding"] or "utf-8"
+    return content.decode(encoding, errors="ignore"), encoding
+
+
+def decode_tiered(name: str, content: bytes):
+    """Tiered detection of the parser"""
+    html = Path(name).suffix.lower() in (".html", ".htm")
+    return document_parser_service._decode(content, html=html)
+
+
+def timed(function, *args):
+    """Result and seconds of one call"""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, help="directory of real files (default: synthetic corpus)")
+    parser.add_argument("--size", type=float, default=2, help="synthetic file size in MB")
+    args = parser.parse_args()
+
+    files = load_corpus(args.corpus) if args.corpus else make_corpus(args.size)
+
+    print(f"{'file':<28}{'MB':>7}{'chardet s':>11}{'tiered s':>10}{'speedup':>9}  {'chardet':<14}{'tiered':<14}same")
+    totals = [0.0, 0.0]
+    same_count = 0
+
+    for name, content in files:
+        (old_text, old_encoding), old_seconds = timed(decode_chardet, content)
+        (new_text, new_encoding), new_seconds = timed(decode_tiered, name, content)
+        same = old_text == new_text
+        totals[0] += old_seconds
+        totals[1] += new_seconds
+        same_count += same
+
+        print(
+            f"{name[:27]:<28}"
+            f"{len(content) / 1e6:>7.2f}"
+            f"{old_seconds:>11.3f}"
+            f"{new_seconds:>10.4f}"
+            f"{old_seconds / max(new_seconds, 1e-9):>8.0f}x"
+            f"  {str(old_encoding):<14}{new_encoding:<14}{'yes' if same else 'no'}"
+        )
+
+    print(
+        f"\n{len(files)} files: chardet {totals[0]:.2f} s, tiered {totals[1]:.3f} s "
+        f"({totals[0] / max(totals[1], 1e-9):.0f}x), same text for {same_count}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: peak memory of spreadsheet parsing, full workbook vs streaming
+
+Builds XLSX files of increasing row counts and parses each in a fresh
+process, reporting the growth of peak RSS while parsing and chunking:
+- full: openpyxl full mode, all elements collected, then chunked (the
+  previous parser)
+- streaming: read-only row streaming into the chunker
+  (DocumentParserService.parse_and_chunk_sync)
+
+A PDF can be measured as well with --pdf (page-at-a-time extraction vs
+collecting all pages first).
+
+Usage (from backend/, with the usual environment configured):
+    python -m benchmarks.parsing_memory --rows 20000 100000 300000
+"""
+import argparse
+import io
+import multiprocessing
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+from openpyxl import Workbook, load_workbook
+
+from app.services.document_parser import document_parser_service
+
+
+def make_xlsx(path: Path, rows: int):
+    """Write a single-sheet workbook with a header and numbered rows"""
+    wb = Workbook(write_only=True)
+    sheet = wb.create_sheet("Data")
+    sheet.append(["id", "customer", "region", "amount", "note"])
+    for i in range(rows):
+        sheet.append([i, f"customer {i % 997}", f"region {i % 13}", i * 1.5, f"order note number {i}"])
+    wb.save(path)
+
+
+def parse_full(doc_type: str, content: bytes):
+    """Previous approach: whole object model and element list, then chunking"""
+    if doc_type == "xlsx":
+        wb = load_workbook(io.BytesIO(content), data_only=True)
+        elements = []
+        for sheet in wb.worksheets:
+            rows = (
+                (row_number, " | ".join(str(cell) for cell in row if cell is not None))
+                for row_number, row in enumerate(sheet.iter_rows(values_only=True), start=1)
+            )
+            elements.extend(document_parser_service._iter_row_elements(
+                ((row_number, line) for row_number, line in rows if line),
+                f"Sheet: {sheet.title}",
+                {"sheet": sheet.title},
+            ))
+        parsed = {"content": "\n\n".join(element["text"] for element in elements), "elements": elements}
+    else:
+        parsed = document_parser_service.parse_sync(doc_type, content)
+
+    return len(document_parser_service.chunk_document(parsed))
+
+
+def parse_streaming(doc_type: str, content: bytes):
+    """Streaming parse straight into the chunker"""
+    return len(document_parser_service.parse_and_chunk_sync(doc_type, content)["chunks"])
+
+
+def measure(mode: str, doc_type: str, path: str):
+    """Run one parse in this (fresh) process; returns (chunks, seconds, peak growth MB)"""
+    content = Path(path).read_bytes()
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    chunks = (parse_full if mode == "full" else parse_streaming)(doc_type, content)
+    elapsed = time.perf_counter() - start
+
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return chunks, elapsed, (after - before) / 1024  # ru_maxrss is in KB on Linux
+
+
+def run(mode: str, doc_type: str, path: Path):
+    """Measure in a new process so peak RSS is not shared between runs"""
+    with multiprocessing.get_context("fork").Pool(1, maxtasksperchild=1) as pool:
+        return pool.apply(measure, (mode, doc_type, str(path)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[20000, 100000, 300000])
+    parser.add_argument("--pdf", type=Path, help="also measure this PDF file")
+    args = parser.parse_args()
+
+    print(f"{'file':<22}{'MB':>7}{'mode':>11}{'chunks':>9}{'seconds':>9}{'peak +MB':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for rows in args.rows:
+            path = Path(tmp) / f"rows-{rows}.xlsx"
+            make_xlsx(path, rows)
+            files.append((f"xlsx {rows} rows", "xlsx", path))
+        if args.pdf:
+            files.append((args.pdf.name[:20], "pdf", args.pdf))
+
+        for label, doc_type, path in files:
+            size_mb = path.stat().st_size / 1e6
+            for mode in ("full", "streaming"):
+                chunks, elapsed, peak = run(mode, doc_type, path)
+                print(f"{label:<22}{size_mb:>7.1f}{mode:>11}{chunks:>9}{elapsed:>9.2f}{peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
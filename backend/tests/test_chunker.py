@@ -0,0 +1,88 @@
+"""
+Tests for content-defined chunk boundaries
+"""
+import random
+import re
+
+import pytest
+
+from app.services.chunker import ChunkerService
+from app.services.embeddings import embeddings_service
+
+
+class WordEncoder:
+    """Deterministic stand-in for a tiktoken encoding: one token per word"""
+
+    _TOKEN_RE = re.compile(r"\s*\S+|\s+")
+
+    def encode_ordinary(self, text):
+        return self._TOKEN_RE.findall(text)
+
+    def decode(self, tokens):
+        return "".join(tokens)
+
+
+@pytest.fixture
+def chunker(monkeypatch):
+    encoder = WordEncoder()
+    monkeypatch.setattr(embeddings_service, "get_encoder", lambda model=None: encoder)
+    return ChunkerService()
+
+
+def _document(paragraphs=40, seed=7):
+    words = ["revenue", "hiring", "plan", "region", "team", "budget", "quarter", "launch"]
+    rng = random.Random(seed)
+    return "\n\n".join(
+        " ".join(
+            " ".join(rng.choice(words) for _ in range(rng.randint(6, 14))).capitalize() + "."
+            for _ in range(rng.randint(2, 6))
+        )
+        for _ in range(paragraphs)
+    )
+
+
+def _hashes(chunker, text):
+    return [chunk["content_hash"] for chunk in chunker.iter_chunks(text, max_tokens=64, overlap_tokens=8)]
+
+
+def test_chunks_are_deterministic(chunker):
+    text = _document()
+    assert _hashes(chunker, text) == _hashes(chunker, text)
+
+
+def test_local_edit_keeps_other_chunk_hashes(chunker):
+    text = _document()
+    paragraphs = text.split("\n\n")
+    paragraphs[20] = paragraphs[20].replace(".", ", as agreed with finance.", 1)
+    edited = "\n\n".join(paragraphs)
+
+    before = _hashes(chunker, text)
+    after = _hashes(chunker, edited)
+
+    changed = set(after) - set(before)
+    assert changed, "the edited paragraph must produce a new chunk"
+    # Boundaries depend on nearby text only: the edit does not shift the rest
+    assert len(changed) <= 3
+    assert len(set(before) & set(after)) >= len(before) - 3
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_edit_in_running_text_resynchronizes(chunker, seed):
+    # No paragraph breaks: boundaries come from anchor sentences only
+    text = _document(seed=seed).replace("\n\n", " ")
+    position = text.index(". ", len(text) // 2)
+    edited = text[:position] + ", as agreed with finance" + text[position:]
+
+    before = _hashes(chunker, text)
+    after = _hashes(chunker, edited)
+
+    assert before[:len(before) // 3] == after[:len(before) // 3]
+    assert before[-5:] == after[-5:]
+    assert len(set(after) - set(before)) <= len(before) // 4
+
+
+def test_chunks_respect_token_budget(chunker):
+    encoder = WordEncoder()
+    for chunk in chunker.iter_chunks(_document(), max_tokens=64, overlap_tokens=8):
+        assert chunk["token_count"] <= 64
+        assert len(encoder.encode_ordinary(chunk["content"])) <= 64
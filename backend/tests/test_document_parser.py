@@ -0,0 +1,118 @@
+"""
+Tests for tiered text encoding detection
+"""
+import chardet
+import pytest
+
+import app.services.document_parser as parser_module
+from app.services.document_parser import DocumentParserService
+
+FRENCH = "Le café où nous déjeunions était fermé, mais la crème brûlée était délicieuse. " * 20
+JAPANESE = "日本語のテキストです。文字コードの判定を確認します。" * 20
+
+
+@pytest.fixture
+def parser():
+    return DocumentParserService()
+
+
+@pytest.fixture
+def detections(monkeypatch):
+    """Samples given to chardet"""
+    samples = []
+    original = chardet.detect
+
+    def detect(sample):
+        samples.append(sample)
+        return original(sample)
+
+    monkeypatch.setattr(parser_module.chardet, "detect", detect)
+    return samples
+
+
+@pytest.mark.parametrize("encoding, expected", [
+    ("utf-8-sig", "utf-8-sig"),
+    ("utf-16", "utf-16"),
+    ("utf-32", "utf-32"),
+])
+def test_byte_order_mark_decides_the_encoding(parser, detections, encoding, expected):
+    text, detected = parser._decode(FRENCH.encode(encoding), encoding_hint="shift_jis")
+
+    assert (text, detected) == (FRENCH, expected)
+    assert detections == []
+
+
+def test_valid_utf8_skips_detection(parser, detections):
+    text, encoding = parser._decode(JAPANESE.encode("utf-8"), encoding_hint="shift_jis")
+
+    assert (text, encoding) == (JAPANESE, "utf-8")
+    assert detections == []
+
+
+def test_file_paths_are_decoded_like_bytes(parser, detections, tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_bytes(JAPANESE.encode("utf-8"))
+
+    assert parser._decode(str(path)) == (JAPANESE, "utf-8")
+
+
+def test_html_meta_charset_is_used_when_it_decodes(parser, detections):
+    html = '<html><head><meta charset="windows-1251"></head><body>Привет, мир</body></html>'
+
+    text, encoding = parser._decode(html.encode("windows-1251"), html=True)
+
+    assert (text, encoding) == (html, "windows-1251")
+    assert detections == []
+
+
+def test_encoding_hint_is_used_when_it_decodes(parser, detections):
+    text, encoding = parser._decode(JAPANESE.encode("shift_jis"), encoding_hint="shift_jis")
+
+    assert (text, encoding) == (JAPANESE, "shift_jis")
+    assert detections == []
+
+
+def test_chardet_runs_on_a_sample_when_nothing_else_decodes(parser, detections, monkeypatch):
+    monkeypatch.setattr(DocumentParserService, "ENCODING_SAMPLE_SIZE", 1024)
+    content = FRENCH.encode("windows-1252") * 4
+
+    # Shift_JIS rejects these bytes, so the hint is passed over
+    text, encoding = parser._decode(content, encoding_hint="shift_jis")
+
+    assert text == FRENCH * 4
+    assert encoding.lower() in ("windows-1252", "iso-8859-1")
+    assert len(detections) == 1
+    # The first non-UTF-8 byte is near the start: the sample is the head only
+    assert detections == [content[:1024]]
+
+
+@pytest.mark.parametrize("encoding, rejects", [
+    ("utf-8", True),
+    ("shift_jis", True),
+    ("gbk", True),
+    ("euc-kr", True),
+    ("windows-1252", False),
+    ("ISO-8859-1", False),
+    ("MacCyrillic", False),
+    ("koi8-r", False),
+    ("no-such-codec", False),
+])
+def test_single_byte_codecs_do_not_reject_bytes(encoding, rejects):
+    assert DocumentParserService._rejects_bytes(encoding) is rejects
+
+
+def test_single_byte_encoding_is_not_kept_as_hint(parser):
+    parser._remember_encoding("source", "text/plain", {"metadata": {"encoding": "SHIFT_JIS"}})
+    assert parser._get_encoding_hint("source", "text/plain") == "SHIFT_JIS"
+
+    # A single-byte detection replaces the old hint with none
+    parser._remember_encoding("source", "text/plain", {"metadata": {"encoding": "Windows-1252"}})
+    assert parser._get_encoding_hint("source", "text/plain") is None
+
+
+def test_hints_are_kept_per_source_and_type(parser):
+    parser._remember_encoding("a", "text/plain", {"metadata": {"encoding": "shift_jis"}})
+
+    assert parser._get_encoding_hint("a", "text/csv") is None
+    assert parser._get_encoding_hint("b", "text/plain") is None
+    assert parser._get_encoding_hint(None, "text/plain") is None
@@ -0,0 +1,106 @@
+"""
+Tests for packing chunk texts into shared embedding requests
+"""
+import asyncio
+
+import pytest
+
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.embeddings import embeddings_service
+
+
+@pytest.fixture
+def provider_calls(monkeypatch):
+    """Texts of every provider request, in the order they were sent"""
+    sent = []
+
+    async def create_embeddings_batch(texts, model=None, batch_size=None):
+        sent.append(list(texts))
+        await asyncio.sleep(0)
+        if any(text.startswith("fail") for text in texts):
+            raise RuntimeError("provider error")
+        return [{"text": text, "embedding": [float(len(text))]} for text in texts]
+
+    monkeypatch.setattr(embeddings_service, "create_embeddings_batch", create_embeddings_batch)
+    return sent
+
+
+def _batcher(max_inputs=100, max_tokens=1000, max_wait_seconds=0.01):
+    batcher = EmbeddingBatcher(max_wait_seconds=max_wait_seconds)
+    batcher.max_batch_inputs = max_inputs
+    batcher.max_batch_tokens = max_tokens
+    return batcher
+
+
+@pytest.mark.asyncio
+async def test_batches_are_packed_up_to_the_input_limit(provider_calls):
+    batcher = _batcher(max_inputs=3)
+    texts = [f"t{i}" for i in range(7)]
+
+    await batcher.embed(texts, token_counts=[1] * 7)
+
+    assert [len(batch) for batch in provider_calls] == [3, 3, 1]
+
+
+@pytest.mark.asyncio
+async def test_batches_are_packed_up_to_the_token_limit(provider_calls):
+    batcher = _batcher(max_tokens=10)
+
+    await batcher.embed(["a", "b", "c", "d"], token_counts=[4, 4, 4, 10])
+
+    # c would exceed the budget and starts a new batch; d fills one alone
+    assert provider_calls == [["a", "b"], ["c"], ["d"]]
+
+
+@pytest.mark.asyncio
+async def test_texts_of_concurrent_callers_share_a_request(provider_calls):
+    batcher = _batcher(max_wait_seconds=0.05)
+
+    first, second = await asyncio.gather(
+        batcher.embed(["a", "b"], token_counts=[1, 1]),
+        batcher.embed(["cc"], token_counts=[1]),
+    )
+
+    assert provider_calls == [["a", "b", "cc"]]
+    assert [result["text"] for result in first] == ["a", "b"]
+    assert [result["text"] for result in second] == ["cc"]
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_is_flushed_after_max_wait(provider_calls):
+    batcher = _batcher(max_wait_seconds=0.05)
+
+    task = asyncio.create_task(batcher.embed(["a"], token_counts=[1]))
+    await asyncio.sleep(0.01)
+    assert provider_calls == []
+
+    results = await asyncio.wait_for(task, timeout=1)
+    assert provider_calls == [["a"]]
+    assert results[0]["text"] == "a"
+
+
+@pytest.mark.asyncio
+async def test_results_keep_request_order_across_batches(provider_calls):
+    batcher = _batcher(max_inputs=2)
+    texts = ["x" * length for length in range(1, 8)]
+
+    results = await batcher.embed(texts, token_counts=[1] * len(texts))
+
+    assert [result["text"] for result in results] == texts
+    assert batcher.texts_embedded == len(texts)
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_raises_for_every_caller(provider_calls):
+    batcher = _batcher(max_wait_seconds=0.05)
+
+    results = await asyncio.gather(
+        batcher.embed(["ok"], token_counts=[1]),
+        batcher.embed(["fail"], token_counts=[1]),
+        return_exceptions=True,
+    )
+
+    # Both callers' texts went out in the request that failed
+    assert provider_calls == [["ok", "fail"]]
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert batcher.requests_sent == 0
@@ -0,0 +1,53 @@
+"""
+Tests for the embedding cache's keys and local tier
+"""
+import pytest
+
+from app.services.embedding_cache import EmbeddingCache
+
+
+def test_normalization_applies_nfc_and_collapses_whitespace():
+    decomposed = "cafe\u0301  menu\n\tprices "
+    assert EmbeddingCache.normalize_text(decomposed) == "caf\u00e9 menu prices"
+    assert EmbeddingCache.make_key("m", decomposed) == EmbeddingCache.make_key("m", "caf\u00e9 menu prices")
+
+
+def test_normalization_keeps_case():
+    assert EmbeddingCache.make_key("m", "Revenue") != EmbeddingCache.make_key("m", "revenue")
+
+
+def test_keys_are_scoped_by_model():
+    assert EmbeddingCache.make_key("a", "text") != EmbeddingCache.make_key("b", "text")
+
+
+@pytest.mark.asyncio
+async def test_entries_are_looked_up_per_model():
+    cache = EmbeddingCache(max_bytes=1024)
+    await cache.set_many("a", ["hello  world"], [[1.0, 2.0]])
+
+    assert await cache.get_many("a", ["hello world", "other"]) == [[1.0, 2.0], None]
+    assert await cache.get_many("b", ["hello world"]) == [None]
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_local_tier_evicts_least_recently_used_by_bytes():
+    # Four float32 values are 16 bytes: the tier holds three vectors
+    cache = EmbeddingCache(max_bytes=48)
+    vector = [0.0, 1.0, 2.0, 3.0]
+    await cache.set_many("m", ["a", "b", "c"], [vector] * 3)
+
+    await cache.get_many("m", ["a"])  # a becomes most recently used
+    await cache.set_many("m", ["d"], [vector])
+
+    assert await cache.get_many("m", ["a", "b", "c", "d"]) == [vector, None, vector, vector]
+    assert cache.get_stats()["local_bytes"] == 48
+
+
+@pytest.mark.asyncio
+async def test_entry_larger_than_the_tier_is_not_stored():
+    cache = EmbeddingCache(max_bytes=8)
+    await cache.set_many("m", ["a"], [[1.0, 2.0, 3.0]])
+
+    assert await cache.get_many("m", ["a"]) == [None]
+    assert cache.get_stats()["local_bytes"] == 0
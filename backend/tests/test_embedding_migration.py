@@ -0,0 +1,62 @@
+"""
+Tests for starting embedding model migrations
+"""
+import uuid
+
+import pytest
+
+import app.services.embedding_migration as migration_module
+from app.core.config import settings
+from app.services.embedding_migration import embedding_migration_service
+from app.services.local_vector_store import LocalVectorStore
+
+
+class FixedSizeIndex:
+    """Vector store whose namespaces share one index of a fixed size"""
+
+    stores_in_database = False
+
+    def get_dimensions(self):
+        return 1536
+
+
+class Reached(Exception):
+    """Raised by the fake session once start_migration gets past its checks"""
+
+
+class FakeSession:
+    async def execute(self, *args, **kwargs):
+        raise Reached()
+
+
+@pytest.fixture
+def fixed_size_index(monkeypatch):
+    monkeypatch.setattr(migration_module, "vector_store", FixedSizeIndex())
+
+
+@pytest.mark.asyncio
+async def test_migration_to_a_model_of_another_size_is_rejected(fixed_size_index):
+    with pytest.raises(ValueError, match="3072-dimensional"):
+        await embedding_migration_service.start_migration(FakeSession(), uuid.uuid4(), "openai-3-large")
+
+
+@pytest.mark.asyncio
+async def test_migration_to_reduced_dimensions_matching_the_index_is_allowed(fixed_size_index, monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_DIMENSIONS", {"openai-3-large": 1536})
+
+    with pytest.raises(Reached):
+        await embedding_migration_service.start_migration(FakeSession(), uuid.uuid4(), "openai-3-large")
+
+
+@pytest.mark.asyncio
+async def test_migration_to_a_model_of_the_same_size_is_allowed(fixed_size_index):
+    with pytest.raises(Reached):
+        await embedding_migration_service.start_migration(FakeSession(), uuid.uuid4(), "openai-3-small")
+
+
+@pytest.mark.asyncio
+async def test_store_with_per_namespace_sizes_accepts_any_model(monkeypatch, tmp_path):
+    monkeypatch.setattr(migration_module, "vector_store", LocalVectorStore(path=str(tmp_path)))
+
+    with pytest.raises(Reached):
+        await embedding_migration_service.start_migration(FakeSession(), uuid.uuid4(), "openai-3-large")
@@ -0,0 +1,271 @@
+"""
+Tests for the local NumPy vector store
+"""
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services.local_vector_store import LocalVectorStore
+
+
+def _vectors(count, dimension=16, seed=0, prefix="v", **metadata):
+    rng = np.random.default_rng(seed)
+    return [
+        {"id": f"{prefix}{i}", "values": rng.standard_normal(dimension).tolist(), "metadata": {"i": i, **metadata}}
+        for i in range(count)
+    ]
+
+
+def _exact_top(vectors, query, top_k):
+    matrix = np.asarray([vector["values"] for vector in vectors], dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    scores = matrix @ (np.asarray(query, dtype=np.float32) / np.linalg.norm(query))
+    return [vectors[i]["id"] for i in np.argsort(-scores)[:top_k]]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalVectorStore(path=str(tmp_path))
+
+
+@pytest.mark.asyncio
+async def test_query_returns_nearest_vectors_by_cosine(store):
+    vectors = _vectors(50)
+    await store.upsert_vectors(vectors, namespace="org")
+
+    query = vectors[7]["values"]
+    matches = await store.query(query, top_k=5, namespace="org")
+
+    assert [match["id"] for match in matches] == _exact_top(vectors, query, 5)
+    assert matches[0]["id"] == "v7"
+    assert matches[0]["score"] == pytest.approx(1.0, abs=1e-5)
+    assert matches[0]["metadata"] == {"i": 7}
+
+
+@pytest.mark.asyncio
+async def test_upsert_overwrites_vector_and_metadata(store):
+    await store.upsert_vectors([{"id": "a", "values": [1.0, 0.0], "metadata": {"v": 1}}], namespace="org")
+    await store.upsert_vectors([{"id": "a", "values": [0.0, 1.0], "metadata": {"v": 2}}], namespace="org")
+
+    matches = await store.query([0.0, 1.0], top_k=10, namespace="org")
+
+    assert matches == [{"id": "a", "score": pytest.approx(1.0), "metadata": {"v": 2}}]
+    assert (await store.get_index_stats("org"))["namespace_stats"]["vector_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_deleted_vectors_are_not_returned_and_slots_are_reused(store):
+    vectors = _vectors(10)
+    await store.upsert_vectors(vectors, namespace="org")
+
+    assert (await store.delete_vectors(["v1", "v2", "missing"], namespace="org"))["deleted_count"] == 2
+    matches = await store.query(vectors[1]["values"], top_k=10, namespace="org")
+    assert {match["id"] for match in matches} == {f"v{i}" for i in range(10)} - {"v1", "v2"}
+
+    await store.upsert_vectors(_vectors(2, prefix="new"), namespace="org")
+    stats = (await store.get_index_stats("org"))["namespace_stats"]
+    assert stats["vector_count"] == 10
+    assert store._namespace("org").free == []
+
+
+@pytest.mark.asyncio
+async def test_delete_by_filter(store):
+    await store.upsert_vectors(_vectors(4, source_type="slack"), namespace="org")
+    await store.upsert_vectors(_vectors(3, prefix="g", source_type="google"), namespace="org")
+
+    result = await store.delete_by_filter({"source_type": "slack"}, namespace="org")
+
+    assert result["deleted_count"] == 4
+    matches = await store.query([1.0] * 16, top_k=10, namespace="org")
+    assert sorted(match["id"] for match in matches) == ["g0", "g1", "g2"]
+
+
+@pytest.mark.asyncio
+async def test_namespaces_are_isolated(store):
+    await store.upsert_vectors(_vectors(3, prefix="a"), namespace="org-a")
+    await store.upsert_vectors(_vectors(3, prefix="b"), namespace="org-b")
+    await store.delete_vectors(["a0"], namespace="org-b")
+
+    a_matches = await store.query([1.0] * 16, top_k=10, namespace="org-a")
+    b_matches = await store.query([1.0] * 16, top_k=10, namespace="org-b")
+
+    assert sorted(match["id"] for match in a_matches) == ["a0", "a1", "a2"]
+    assert sorted(match["id"] for match in b_matches) == ["b0", "b1", "b2"]
+    assert await store.query([1.0] * 16, top_k=10, namespace="org-c") == []
+
+
+@pytest.mark.asyncio
+async def test_filtered_query_only_returns_matching_vectors(store):
+    vectors = _vectors(40)
+    for vector in vectors:
+        vector["metadata"]["source_type"] = "slack" if vector["metadata"]["i"] % 4 else "google"
+    await store.upsert_vectors(vectors, namespace="org")
+
+    query = vectors[1]["values"]
+    matches = await store.query(
+        query, top_k=5, namespace="org", filter_metadata={"source_type": {"$in": ["google"]}}
+    )
+
+    google = [vector for vector in vectors if vector["metadata"]["source_type"] == "google"]
+    assert [match["id"] for match in matches] == _exact_top(google, query, 5)
+
+
+@pytest.mark.asyncio
+async def test_reopened_store_replays_the_journal(tmp_path):
+    store = LocalVectorStore(path=str(tmp_path))
+    vectors = _vectors(20)
+    await store.upsert_vectors(vectors[:10], namespace="org")
+    await store.upsert_vectors(vectors[10:], namespace="org")
+    await store.upsert_vectors([{**vectors[3], "metadata": {"i": 3, "edited": True}}], namespace="org")
+    await store.delete_vectors(["v5"], namespace="org")
+    assert (tmp_path / "org" / "meta.journal").exists()
+
+    reopened = LocalVectorStore(path=str(tmp_path))
+    matches = await reopened.query(vectors[3]["values"], top_k=20, namespace="org")
+
+    assert len(matches) == 19
+    assert "v5" not in {match["id"] for match in matches}
+    assert matches[0] == {"id": "v3", "score": pytest.approx(1.0, abs=1e-5), "metadata": {"i": 3, "edited": True}}
+
+
+@pytest.mark.asyncio
+async def test_torn_last_journal_record_is_dropped(tmp_path):
+    store = LocalVectorStore(path=str(tmp_path))
+    vectors = _vectors(5)
+    await store.upsert_vectors(vectors[:4], namespace="org")
+    await store.upsert_vectors(vectors[4:], namespace="org")
+
+    # A process crashed halfway through appending a record
+    journal = tmp_path / "org" / "meta.journal"
+    journal.write_text(journal.read_text() + '[[5,"v5",{"i"')
+
+    reopened = LocalVectorStore(path=str(tmp_path))
+    matches = await reopened.query(vectors[0]["values"], top_k=10, namespace="org")
+    assert sorted(match["id"] for match in matches) == [f"v{i}" for i in range(5)]
+
+    # Writes after recovery are not appended behind the torn line
+    await reopened.upsert_vectors(_vectors(1, prefix="w"), namespace="org")
+    again = LocalVectorStore(path=str(tmp_path))
+    assert len(await again.query(vectors[0]["values"], top_k=10, namespace="org")) == 6
+
+
+@pytest.mark.asyncio
+async def test_dimension_mismatch_is_rejected(store):
+    await store.upsert_vectors(_vectors(2, dimension=8), namespace="org")
+
+    with pytest.raises(ValueError):
+        await store.upsert_vectors(_vectors(1, dimension=4, prefix="x"), namespace="org")
+    with pytest.raises(ValueError):
+        await store.query([1.0] * 4, namespace="org")
+
+
+@pytest.mark.asyncio
+async def test_hnsw_results_match_exact_search(tmp_path, monkeypatch):
+    pytest.importorskip("hnswlib")
+    monkeypatch.setattr(settings, "LOCAL_VECTOR_STORE_HNSW", True)
+    monkeypatch.setattr(settings, "LOCAL_VECTOR_STORE_HNSW_MIN_SIZE", 100)
+    store = LocalVectorStore(path=str(tmp_path))
+    vectors = _vectors(500, dimension=32, seed=3)
+    await store.upsert_vectors(vectors, namespace="org")
+    await store.delete_vectors(["v0", "v1"], namespace="org")
+    live = vectors[2:]
+
+    recall = []
+    for query in (vector["values"] for vector in _vectors(10, dimension=32, seed=4)):
+        found = [match["id"] for match in await store.query(query, top_k=10, namespace="org")]
+        recall.append(len(set(found) & set(_exact_top(live, query, 10))) / 10)
+
+    assert store._namespace("org").hnsw is not None
+    assert np.mean(recall) >= 0.9
+
+
+def _clustered_vectors(count, dimension=256, coarse=64, seed=5):
+    """
+    Clustered vectors, like embeddings of related documents, whose leading
+    dimensions carry most of the signal (like text-embedding-3)
+    """
+    rng = np.random.default_rng(seed)
+    centers = np.random.default_rng(0).standard_normal((10, dimension))
+    values = centers[rng.integers(0, len(centers), count)] + 0.5 * rng.standard_normal((count, dimension))
+    values[:, coarse:] *= 0.5
+    return [{"id": f"v{i}", "values": row.tolist(), "metadata": {"i": i}} for i, row in enumerate(values)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "quantization, coarse_dimensions",
+    [("int8", 0), ("binary", 0), ("none", 64), ("int8", 64), ("binary", 64)],
+)
+async def test_quantized_search_is_reranked_with_float_vectors(tmp_path, quantization, coarse_dimensions):
+    store = LocalVectorStore(
+        path=str(tmp_path), quantization=quantization, coarse_dimensions=coarse_dimensions
+    )
+    vectors = _clustered_vectors(400)
+    await store.upsert_vectors(vectors, namespace="org")
+
+    recall = []
+    for query in (vector["values"] for vector in _clustered_vectors(10, seed=6)):
+        matches = await store.query(query, top_k=10, namespace="org")
+        expected = _exact_top(vectors, query, 10)
+        recall.append(len({match["id"] for match in matches} & set(expected)) / 10)
+
+        # Scores are exact cosine similarities from the float32 vectors
+        scores = [match["score"] for match in matches]
+        assert scores == sorted(scores, reverse=True)
+        reference = np.asarray(vectors[int(matches[0]["id"][1:])]["values"])
+        assert scores[0] == pytest.approx(
+            float(reference @ query / np.linalg.norm(reference) / np.linalg.norm(query)), abs=1e-5
+        )
+
+    assert np.mean(recall) >= 0.9
+
+
+@pytest.mark.asyncio
+async def test_exact_match_is_found_through_the_codes(tmp_path):
+    for quantization in ("int8", "binary"):
+        store = LocalVectorStore(path=str(tmp_path / quantization), quantization=quantization, coarse_dimensions=64)
+        vectors = _clustered_vectors(300)
+        await store.upsert_vectors(vectors, namespace="org")
+
+        for i in (0, 150, 299):
+            matches = await store.query(vectors[i]["values"], top_k=1, namespace="org")
+            assert matches[0]["id"] == f"v{i}"
+            assert matches[0]["score"] == pytest.approx(1.0, abs=1e-5)
+
+
+@pytest.mark.asyncio
+async def test_codes_are_compact_and_rebuilt_on_reopen(tmp_path):
+    vectors = _clustered_vectors(100)
+    store = LocalVectorStore(path=str(tmp_path), quantization="binary", coarse_dimensions=64)
+    await store.upsert_vectors(vectors, namespace="org")
+    await store.delete_vectors(["v0"], namespace="org")
+
+    stats = (await store.get_index_stats("org"))["namespace_stats"]
+    # 64 leading dimensions packed into 8 bytes per row
+    assert stats["coarse_dimensions"] == 64
+    assert stats["code_bytes"] == stats["capacity"] * 8
+
+    reopened = LocalVectorStore(path=str(tmp_path), quantization="binary", coarse_dimensions=64)
+    matches = await reopened.query(vectors[42]["values"], top_k=3, namespace="org")
+    assert matches[0]["id"] == "v42"
+    assert "v0" not in {match["id"] for match in await reopened.query(vectors[0]["values"], top_k=99, namespace="org")}
+
+
+@pytest.mark.asyncio
+async def test_filtered_quantized_query_only_returns_matching_vectors(tmp_path):
+    store = LocalVectorStore(path=str(tmp_path), quantization="int8")
+    vectors = _clustered_vectors(200)
+    for vector in vectors:
+        vector["metadata"]["even"] = vector["metadata"]["i"] % 2 == 0
+    await store.upsert_vectors(vectors, namespace="org")
+
+    matches = await store.query(vectors[1]["values"], top_k=20, namespace="org", filter_metadata={"even": True})
+
+    assert len(matches) == 20
+    assert all(match["metadata"]["even"] for match in matches)
+
+
+def test_unknown_quantization_is_rejected(tmp_path):
+    store = LocalVectorStore(path=str(tmp_path), quantization="int4")
+    with pytest.raises(ValueError):
+        store._namespace("org")
@@ -0,0 +1,72 @@
+"""
+Tests for parse cache revisions and keys
+"""
+from app.connectors.google import GoogleConnector
+from app.core.config import settings
+from app.services.parse_cache import parse_cache_service
+
+
+def _drive_documents(*files):
+    connector = GoogleConnector(
+        client_id="id", client_secret="secret", redirect_uri="http://localhost/callback", scopes=[]
+    )
+    return connector._drive_files_to_documents(list(files))
+
+
+def test_drive_binary_files_are_keyed_by_md5():
+    [document] = _drive_documents(
+        {"id": "f", "name": "a.pdf", "mimeType": "application/pdf", "md5Checksum": "abc", "version": "7"}
+    )
+
+    assert parse_cache_service.get_revision(document) == "md5_checksum:abc"
+
+
+def test_exported_google_docs_are_keyed_by_version():
+    [doc, sheet] = _drive_documents(
+        {"id": "d", "name": "Doc", "mimeType": "application/vnd.google-apps.document", "version": "42"},
+        {"id": "s", "name": "Sheet", "mimeType": "application/vnd.google-apps.spreadsheet", "version": "9"},
+    )
+
+    assert parse_cache_service.get_revision(doc) == "revision:v42"
+    assert parse_cache_service.get_revision(sheet) == "revision:v9"
+    assert doc["mime_type"] == "text/plain"
+
+
+def test_file_without_revision_is_not_cached():
+    [document] = _drive_documents({"id": "f", "name": "a.txt", "mimeType": "text/plain"})
+
+    assert parse_cache_service.get_revision(document) is None
+    assert parse_cache_service.get_revision({"id": "x", "metadata": {}}) is None
+
+
+def test_revision_fields_are_tried_in_order():
+    doc_data = {"etag": "e1", "metadata": {"content_hash": "h1", "md5_checksum": None}}
+
+    assert parse_cache_service.get_revision(doc_data) == "content_hash:h1"
+
+
+def test_parse_key_covers_model_and_chunking_settings(monkeypatch):
+    key = parse_cache_service.get_parse_key("openai-3-small")
+
+    assert parse_cache_service.get_parse_key("openai-3-small") == key
+    assert parse_cache_service.get_parse_key("openai-3-large") != key
+    assert parse_cache_service.get_parse_key(None) == parse_cache_service.get_parse_key(settings.EMBEDDING_MODEL)
+
+    monkeypatch.setattr(settings, "CHUNK_MAX_TOKENS", settings.CHUNK_MAX_TOKENS + 1)
+    assert parse_cache_service.get_parse_key("openai-3-small") != key
+
+
+def test_parse_key_changes_with_parser_version(monkeypatch):
+    key = parse_cache_service.get_parse_key("openai-3-small")
+    monkeypatch.setattr(type(parse_cache_service), "PARSER_VERSION", parse_cache_service.PARSER_VERSION + 1)
+
+    assert parse_cache_service.get_parse_key("openai-3-small") != key
+
+
+def test_parse_results_round_trip_through_compression():
+    parsed = {"content": "héllo " * 1000, "metadata": {"pages": 3}, "chunks": [{"index": 0, "content": "héllo"}]}
+
+    data, size = parse_cache_service._encode(parsed)
+
+    assert size > len(data)
+    assert parse_cache_service._decode(data) == parsed
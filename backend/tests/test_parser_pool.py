@@ -0,0 +1,112 @@
+"""
+Tests for the parser process pool
+"""
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services.parser_pool import ParserPool
+
+
+# Task functions run in spawned workers, so they live at module level
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return os.getpid()
+
+
+def _crash_after(seconds):
+    time.sleep(seconds)
+    os._exit(1)
+
+
+def _where():
+    return os.getpid(), threading.current_thread().name
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(settings, "PARSER_PROCESSES", 2)
+    monkeypatch.setattr(settings, "PARSER_MEMORY_LIMIT_MB", 0)
+    monkeypatch.setattr(settings, "PARSER_TIMEOUT_SECONDS", 60)
+    pool = ParserPool()
+    yield pool
+    pool.shutdown()
+
+
+async def _warm_up(pool):
+    """Start both workers (spawning takes a while) before timing anything"""
+    await asyncio.gather(pool.run(_sleep, 0.2), pool.run(_sleep, 0.2))
+
+
+@pytest.mark.asyncio
+async def test_thread_path_without_processes(monkeypatch):
+    monkeypatch.setattr(settings, "PARSER_PROCESSES", 0)
+    pool = ParserPool()
+
+    pid, thread = await pool.run(_where)
+
+    assert pid == os.getpid()
+    assert thread != threading.main_thread().name
+    assert pool._executor is None
+
+
+@pytest.mark.asyncio
+async def test_timeout_in_thread_path(monkeypatch):
+    monkeypatch.setattr(settings, "PARSER_PROCESSES", 0)
+    monkeypatch.setattr(settings, "PARSER_TIMEOUT_SECONDS", 0.1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await ParserPool().run(_sleep, 1)
+
+
+@pytest.mark.asyncio
+async def test_timeout_retires_pool_without_killing_other_tasks(pool, monkeypatch):
+    await _warm_up(pool)
+    old_executor = pool._executor
+    monkeypatch.setattr(settings, "PARSER_TIMEOUT_SECONDS", 2)
+
+    async def hung():
+        await pool.run(_sleep, 30)
+
+    async def still_running():
+        await asyncio.sleep(1)
+        # Finishes after the hung task timed out and its pool was retired
+        return await pool.run(_sleep, 1.5)
+
+    hung_result, other_result = await asyncio.gather(hung(), still_running(), return_exceptions=True)
+
+    assert isinstance(hung_result, TimeoutError)
+    assert isinstance(other_result, int)
+    # The retired pool was terminated once its last task finished
+    assert pool._retired == {}
+    assert pool._running == {}
+    assert old_executor._processes is None or not any(
+        process.is_alive() for process in old_executor._processes.values()
+    )
+
+    # New tasks run in a fresh pool
+    monkeypatch.setattr(settings, "PARSER_TIMEOUT_SECONDS", 60)
+    assert isinstance(await pool.run(_sleep, 0), int)
+    assert pool._executor is not old_executor
+
+
+@pytest.mark.asyncio
+async def test_crash_retries_the_other_running_tasks_in_isolation(pool):
+    await _warm_up(pool)
+
+    crashed, survivor = await asyncio.gather(
+        pool.run(_crash_after, 0.5),
+        pool.run(_sleep, 1.5),
+        return_exceptions=True,
+    )
+
+    # The task that crashes again on its own retry fails alone
+    assert isinstance(crashed, RuntimeError)
+    assert isinstance(survivor, int)
+    assert pool._retired == {}
+    assert isinstance(await pool.run(_sleep, 0), int)
@@ -0,0 +1,165 @@
+"""
+Tests for hybrid search ranking, keyword query detection and result caching
+"""
+import uuid
+
+import pytest
+
+import app.services.search as search_module
+from app.core.config import settings
+from app.services.lexical_search import lexical_search_service
+from app.services.result_cache import SearchResultCache
+from app.services.search import search_service
+
+
+def _matches(*ids):
+    return [{"id": match_id, "metadata": {}} for match_id in ids]
+
+
+def test_fuse_ranks_matches_found_by_both_lists_first():
+    vector = _matches("a", "b", "c")
+    lexical = _matches("c", "d")
+
+    fused = search_service._fuse([vector, lexical])
+
+    # c is in both lists; b and d tie at rank 2 and keep first-seen order
+    assert [match["id"] for match in fused] == ["c", "a", "b", "d"]
+    assert fused[0]["score"] > fused[1]["score"] > fused[2]["score"] == fused[3]["score"]
+
+
+def test_fuse_scores_are_normalized_to_first_place_everywhere():
+    fused = search_service._fuse([_matches("a", "b"), _matches("a", "b")])
+
+    assert fused[0]["id"] == "a"
+    assert fused[0]["score"] == pytest.approx(1.0)
+    k = settings.SEARCH_RRF_K
+    assert fused[1]["score"] == pytest.approx((k + 1) / (k + 2))
+
+
+def test_fuse_keeps_metadata_of_earlier_lists():
+    vector = [{"id": "a", "metadata": {"from": "vector"}}]
+    lexical = [{"id": "a", "metadata": {"from": "lexical"}}]
+
+    fused = search_service._fuse([vector, lexical])
+
+    assert fused == [{"id": "a", "metadata": {"from": "vector"}, "score": pytest.approx(1.0)}]
+
+
+@pytest.mark.parametrize("query", ["ABC-123", "#4521 status", "john@acme.com", '"exact phrase"'])
+def test_identifier_queries_take_the_keyword_path(query):
+    assert lexical_search_service.is_keyword_query(query)
+
+
+@pytest.mark.parametrize("query", ["revenue 2024", "Q3 2024 revenue", "hiring plan"])
+def test_natural_language_queries_are_embedded(query):
+    assert not lexical_search_service.is_keyword_query(query)
+
+
+DOCUMENT_ID = uuid.UUID(int=1)
+
+# Query embeddings: the first two are near-duplicates (cosine > 0.98)
+QUERY_VECTORS = {
+    "revenue plan": [1.0, 0.0, 0.0],
+    "the revenue plan": [0.999, 0.02, 0.0],
+    "hiring": [0.0, 1.0, 0.0],
+}
+
+
+@pytest.fixture
+def retrievers(monkeypatch):
+    """Fake embedding, vector and lexical retrieval; counts calls of each"""
+    calls = {"embed": 0, "vector": 0, "lexical": []}
+    match = {"id": "chunk-1", "score": 0.9, "metadata": {"document_id": str(DOCUMENT_ID), "content": "text"}}
+
+    async def embed_query(query, model=None):
+        calls["embed"] += 1
+        return {"embedding": QUERY_VECTORS[" ".join(query.split()).casefold()]}
+
+    async def get_org_embedding(db, org_id, use_cache=True):
+        return {"model": "m", "namespace": str(org_id), "migration": None}
+
+    async def vector_query(**kwargs):
+        calls["vector"] += 1
+        return [dict(match)]
+
+    async def lexical_search(db, org_id, query, limit=10, source_types=None):
+        calls["lexical"].append(query)
+        return [dict(match)]
+
+    async def load_documents(db, org_id, document_ids, include_content=False):
+        return {
+            document_id: {
+                "id": document_id, "title": "Doc", "content_head": "text", "source_type": "slack",
+                "url": None, "source_created_at": None, "created_at": None, "source_metadata": {},
+            }
+            for document_id in document_ids
+        }
+
+    async def load_chunks(db, document_ids, chunk_ids):
+        return {}
+
+    monkeypatch.setattr(search_module, "search_result_cache", SearchResultCache())
+    monkeypatch.setattr(search_module.embeddings_service, "embed_query", embed_query)
+    monkeypatch.setattr(search_module.embedding_migration_service, "get_org_embedding", get_org_embedding)
+    monkeypatch.setattr(search_module.vector_store, "query", vector_query)
+    monkeypatch.setattr(search_module.lexical_search_service, "search", lexical_search)
+    monkeypatch.setattr(search_service, "_load_documents", load_documents)
+    monkeypatch.setattr(search_service, "_load_chunks", load_chunks)
+    return calls
+
+
+async def _search(query, **kwargs):
+    return await search_service.search(None, uuid.UUID(int=2), query, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_vector_mode_shares_responses_between_near_duplicates(retrievers):
+    first = await _search("revenue plan", mode="vector")
+    second = await _search("the revenue plan", mode="vector")
+    third = await _search("hiring", mode="vector")
+
+    assert "cached" not in first
+    assert second["cached"] and second["query"] == "the revenue plan"
+    assert "cached" not in third
+    assert retrievers["vector"] == 2
+
+
+@pytest.mark.asyncio
+async def test_vector_mode_with_highlights_is_keyed_on_the_query_text(retrievers):
+    await _search("revenue plan", mode="vector", highlight=True)
+    second = await _search("the revenue plan", mode="vector", highlight=True)
+
+    assert "cached" not in second
+
+
+@pytest.mark.asyncio
+async def test_hybrid_mode_reuses_only_the_vector_leg_for_near_duplicates(retrievers):
+    await _search("revenue plan", mode="hybrid")
+    second = await _search("the revenue plan", mode="hybrid")
+
+    # The response depends on the text (lexical leg), so it is not shared...
+    assert "cached" not in second
+    assert retrievers["lexical"] == ["revenue plan", "the revenue plan"]
+    # ...but the vector search ran once
+    assert retrievers["vector"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hybrid_mode_serves_the_same_normalized_text_from_cache(retrievers):
+    await _search("Revenue  plan", mode="hybrid")
+    second = await _search("revenue plan", mode="hybrid")
+
+    assert second["cached"]
+    assert retrievers["lexical"] == ["Revenue  plan"]
+    assert retrievers["vector"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lexical_mode_is_not_cached_and_never_embeds(retrievers):
+    await _search("revenue plan", mode="lexical")
+    second = await _search("revenue plan", mode="lexical")
+
+    assert "cached" not in second
+    assert retrievers["embed"] == 0
+    assert retrievers["vector"] == 0
+    assert retrievers["lexical"] == ["revenue plan", "revenue plan"]
@@ -0,0 +1,186 @@
+"""
+Tests for the staged sync pipeline and its resume checkpoint
+"""
+import asyncio
+
+import pytest
+
+from app.services.sync_pipeline import PageCheckpoint, PipelineStage, SyncPipeline
+
+
+def test_checkpoint_advances_past_completed_pages_in_order():
+    checkpoint = PageCheckpoint("start")
+    checkpoint.add_page(0, 2, "c0")
+    checkpoint.add_page(1, 1, "c1")
+
+    # Page 1 finishing first must not move the cursor past page 0
+    checkpoint.item_done(1)
+    assert checkpoint.cursor == "start"
+
+    checkpoint.item_done(0)
+    assert checkpoint.cursor == "start"
+
+    checkpoint.item_done(0)
+    assert checkpoint.cursor == "c1"
+
+
+def test_checkpoint_keeps_cursor_of_last_safe_page():
+    checkpoint = PageCheckpoint()
+    checkpoint.add_page(0, 1, "c0")
+    checkpoint.add_page(1, 1, None)  # not a safe checkpoint
+    checkpoint.item_done(0)
+    checkpoint.item_done(1)
+    assert checkpoint.cursor == "c0"
+
+
+def test_checkpoint_blocks_at_page_with_failed_item():
+    checkpoint = PageCheckpoint("start", max_attempts=3)
+    checkpoint.add_page(0, 1, "c0")
+    checkpoint.add_page(1, 2, "c1")
+    checkpoint.add_page(2, 1, "c2")
+
+    checkpoint.item_done(0, key="a")
+    checkpoint.item_done(1, failed=True, key="b")
+    checkpoint.item_done(1, key="c")
+    checkpoint.item_done(2, key="d")
+
+    # The failed item's page is fetched again by the next sync
+    assert checkpoint.cursor == "c0"
+    assert checkpoint.failures == {"b": 1}
+
+
+def test_checkpoint_skips_item_after_max_attempts():
+    failures = {"b": 2}
+    checkpoint = PageCheckpoint("c0", failures=failures, max_attempts=3)
+    checkpoint.add_page(0, 1, "c1")
+    checkpoint.item_done(0, failed=True, key="b")
+
+    assert checkpoint.cursor == "c1"
+    assert checkpoint.skipped == ["b"]
+    assert checkpoint.failures == {}
+    # The persisted counts are not modified in place
+    assert failures == {"b": 2}
+
+
+def test_checkpoint_success_clears_failure_count():
+    checkpoint = PageCheckpoint(failures={"b": 1}, max_attempts=3)
+    checkpoint.add_page(0, 1, "c0")
+    checkpoint.item_done(0, key="b")
+
+    assert checkpoint.failures == {}
+    assert checkpoint.cursor == "c0"
+
+
+def test_checkpoint_without_attempt_limit_never_skips():
+    checkpoint = PageCheckpoint(failures={"b": 100})
+    checkpoint.add_page(0, 1, "c0")
+    checkpoint.item_done(0, failed=True, key="b")
+
+    assert checkpoint.cursor is None
+    assert checkpoint.failures == {"b": 101}
+
+
+async def _source(items):
+    for item in items:
+        yield item
+
+
+@pytest.mark.asyncio
+async def test_pipeline_stops_through_stages_of_different_concurrency():
+    completed = []
+
+    async def double(item):
+        await asyncio.sleep(0)
+        return item * 2
+
+    async def add_one(batch):
+        return [item + 1 for item in batch]
+
+    pipeline = SyncPipeline(
+        [
+            PipelineStage("double", double, concurrency=4),
+            PipelineStage("add", add_one, concurrency=1, batch_size=3),
+            PipelineStage("noop", double, concurrency=3),
+        ],
+        queue_size=2,
+        on_complete=completed.append,
+    )
+    await asyncio.wait_for(pipeline.run(_source(range(20))), timeout=5)
+
+    assert sorted(completed) == sorted((i * 2 + 1) * 2 for i in range(20))
+
+
+@pytest.mark.asyncio
+async def test_pipeline_finishes_none_results_early():
+    completed, reached_last = [], []
+
+    async def skip_odd(batch):
+        return [None if item % 2 else item for item in batch]
+
+    async def last(item):
+        reached_last.append(item)
+        return item
+
+    pipeline = SyncPipeline(
+        [PipelineStage("skip", skip_odd, batch_size=4), PipelineStage("last", last)],
+        on_complete=completed.append,
+    )
+    await asyncio.wait_for(pipeline.run(_source(range(10))), timeout=5)
+
+    assert sorted(completed) == list(range(10))
+    assert sorted(reached_last) == [0, 2, 4, 6, 8]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_sends_whole_failed_batch_to_on_error():
+    completed, errors = [], []
+    release = asyncio.Event()
+
+    async def gate(item):
+        await release.wait()
+        return item
+
+    async def fail_on_three(batch):
+        if 3 in batch:
+            raise RuntimeError("boom")
+        return batch
+
+    async def source():
+        for item in range(6):
+            yield item
+        # Everything is queued before the batching stage starts taking items
+        release.set()
+
+    pipeline = SyncPipeline(
+        [PipelineStage("gate", gate, concurrency=6), PipelineStage("batch", fail_on_three, batch_size=6)],
+        on_complete=completed.append,
+        on_error=lambda item, exc: errors.append((item, str(exc))),
+    )
+    await asyncio.wait_for(pipeline.run(source()), timeout=5)
+
+    failed = [item for item, _ in errors]
+    assert 3 in failed
+    assert all(message == "boom" for _, message in errors)
+    assert sorted(completed + failed) == list(range(6))
+    # Every item of the failing batch is reported, not just the one that failed
+    assert len(failed) > 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_dying_stage_does_not_deadlock_producer():
+    async def passthrough(item):
+        return item
+
+    def explode(item):
+        raise RuntimeError("callback failed")
+
+    pipeline = SyncPipeline(
+        [PipelineStage("first", passthrough), PipelineStage("second", passthrough)],
+        queue_size=1,
+        on_complete=explode,
+    )
+
+    # The second stage dies on its first item; with queues of size 1 the
+    # producer blocks on a full queue unless the run is torn down
+    with pytest.raises(RuntimeError, match="callback failed"):
+        await asyncio.wait_for(pipeline.run(_source(range(100))), timeout=5)